@@ -0,0 +1,101 @@
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from neo4j.graph import Graph, Node
+
+from weaver.tool_resource.cypher_executor import serialize_neo4j_value
+from weaver.util.serialization import EMBEDDING_MIN_LENGTH, dumps, orjson, serialize_record
+
+
+def build_rows(row_count: int, embedding_dim: int) -> List[Dict[str, Any]]:
+    """Build a synthetic result: half node rows (with embeddings), half primitive rows."""
+    graph = Graph()
+    rng = random.Random(42)
+    rows: List[Dict[str, Any]] = []
+    for i in range(row_count):
+        if i % 2 == 0:
+            scene = Node(
+                graph,
+                f"4:bench:{i}",
+                i,
+                ["ExperientialScene"],
+                {
+                    "scene_name": f"scene_{i}",
+                    "description": "西湖边的清晨，薄雾笼罩着断桥。" * 3,
+                    "timestamp": "2024-03-01T08:30:00Z",
+                    "embed": [rng.random() for _ in range(embedding_dim)],
+                },
+            )
+            rows.append({"s": scene, "score": rng.random()})
+        else:
+            rows.append(
+                {
+                    "scene_name": f"scene_{i}",
+                    "emotion_label": "平静",
+                    "intensity": rng.randint(1, 10),
+                    "tags": ["lake", "morning", "mist"],
+                }
+            )
+    return rows
+
+
+def strip_embeddings(value: Any) -> Any:
+    """Drop `embed` properties and embedding-sized float lists from a serialized value.
+
+    The second pass of the old serialization path, kept here as the reference.
+    """
+    if isinstance(value, dict):
+        return {
+            k: strip_embeddings(v)
+            for k, v in value.items()
+            if k != "embed" and not k.endswith(".embed")
+        }
+    if isinstance(value, list):
+        if len(value) >= EMBEDDING_MIN_LENGTH and all(isinstance(v, float) for v in value):
+            return f"<embedding of {len(value)} floats omitted>"
+        return [strip_embeddings(item) for item in value]
+    return value
+
+
+def current_serializer(rows: List[Dict[str, Any]]) -> str:
+    records = [strip_embeddings(serialize_neo4j_value(row)) for row in rows]
+    return json.dumps(records, indent=2, ensure_ascii=False, default=str)
+
+
+def fast_serializer(rows: List[Dict[str, Any]]) -> str:
+    return dumps([serialize_record(row) for row in rows])
+
+
+def bench(name: str, fn: Callable[[List[Dict[str, Any]]], str], rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = fn(rows)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"{name:<22} best {best * 1000:8.1f} ms   output {len(output) / 1024:8.1f} KiB")
+    return best
+
+
+def main():
+    """Compare the CypherExecutor serializers on a synthetic result."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--embedding-dim", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows, args.embedding_dim)
+    assert json.loads(current_serializer(rows)) == json.loads(fast_serializer(rows))
+
+    print(f"{args.rows} rows, orjson {'enabled' if orjson is not None else 'not installed'}")
+    baseline = bench("serialize_neo4j_value", current_serializer, rows, args.repeat)
+    optimized = bench("serialize_record", fast_serializer, rows, args.repeat)
+    print(f"speed-up: {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
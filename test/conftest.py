@@ -0,0 +1,12 @@
+import pytest
+
+from weaver.util.query_log import PROFILE_SAMPLE_RATE_ENV, QUERY_LOG_PATH_ENV
+
+
+@pytest.fixture(autouse=True)
+def isolated_query_log(tmp_path, monkeypatch):
+    """Keep the query log of every test in its own temporary file."""
+    path = tmp_path / "query_log.jsonl"
+    monkeypatch.setenv(QUERY_LOG_PATH_ENV, str(path))
+    monkeypatch.delenv(PROFILE_SAMPLE_RATE_ENV, raising=False)
+    return path
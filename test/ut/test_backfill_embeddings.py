@@ -0,0 +1,117 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from weaver.backfill_embeddings import backfill_embeddings
+
+
+class FakeSession:
+    """Serves stale nodes and applies written embeddings."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.writes = []
+        self.page_queries = []
+
+    def _stale(self, model):
+        return sorted(
+            (node_id, node)
+            for node_id, node in self.nodes.items()
+            if node.get("embed") is None or node.get("embed_model") != model
+        )
+
+    def run(self, query, **params):
+        result = MagicMock()
+        stale = self._stale(params["model"])
+        if "count(n)" in query:
+            result.single.return_value = {"stale": len(stale)}
+        else:
+            self.page_queries.append(query)
+            page = [
+                {"id": node_id, "description": node.get("description"), "key": node_id}
+                for node_id, node in stale
+                if node_id not in params["skipped"]
+            ][: params["limit"]]
+            result.__iter__.return_value = iter(
+                [MagicMock(data=lambda row=row: row) for row in page]
+            )
+        return result
+
+    def execute_write(self, work):
+        tx = MagicMock()
+        work(tx)
+        query, kwargs = tx.run.call_args[0][0], tx.run.call_args[1]
+        assert query.startswith("UNWIND $rows")
+        self.writes.append(len(kwargs["rows"]))
+        for row in kwargs["rows"]:
+            self.nodes[row["id"]].update(embed=row["embed"], embed_model=kwargs["model"])
+
+
+@pytest.fixture
+def driver():
+    with (
+        patch("weaver.backfill_embeddings.bump_graph_version"),
+        patch("weaver.backfill_embeddings.log_query"),
+    ):
+
+        def _driver(session):
+            mock_driver = MagicMock()
+            mock_driver.session.return_value.__enter__.return_value = session
+            return mock_driver
+
+        yield _driver
+
+
+def test_backfill_embeds_only_stale_nodes_in_batches(driver):
+    nodes = {
+        "n1": {"description": "a"},
+        "n2": {"description": "b", "embed": [0.0], "embed_model": "old"},
+        "n3": {"description": "c", "embed": [0.0], "embed_model": "new"},
+        "n4": {},
+    }
+    session = FakeSession(nodes)
+    embed_fn = MagicMock(side_effect=lambda texts: [[1.0]] * len(texts))
+
+    stats = backfill_embeddings(
+        driver(session),
+        "new",
+        labels=["Scene"],
+        batch_size=2,
+        max_nodes_per_second=0,
+        embed_fn=embed_fn,
+    )
+
+    assert (stats.total, stats.embedded, stats.failed) == (3, 3, 0)
+    # Pages are taken from the remaining stale nodes, without a cursor or a sort
+    assert len(session.page_queries) == 3
+    assert all("ORDER BY" not in query for query in session.page_queries)
+    assert session.writes == [2, 1]
+    # Nodes without a description are embedded by their primary key
+    assert embed_fn.call_args_list[-1][0][0] == ["n4"]
+    assert all(node["embed_model"] == "new" for node in nodes.values())
+
+
+def test_backfill_resumes_with_stale_nodes_and_skips_failed_batches(driver):
+    # n1 was embedded by an earlier, interrupted run
+    nodes = {
+        "n1": {"description": "a", "embed": [1.0], "embed_model": "new"},
+        "n2": {"description": "b"},
+        "n3": {"description": "c"},
+    }
+    session = FakeSession(nodes)
+    embed_fn = MagicMock(side_effect=[None, None, [[1.0]]])
+
+    stats = backfill_embeddings(
+        driver(session),
+        "new",
+        labels=["Scene"],
+        batch_size=1,
+        max_nodes_per_second=0,
+        embed_fn=embed_fn,
+    )
+
+    # n2 fails twice and is skipped for the rest of the run instead of fetched again
+    assert (stats.total, stats.embedded, stats.failed) == (2, 1, 1)
+    assert embed_fn.call_count == 3
+    assert "embed" not in nodes["n2"]
+    assert nodes["n3"]["embed_model"] == "new"
@@ -0,0 +1,28 @@
+from weaver.util.batching import batch_size_report, estimate_tokens, plan_token_batches
+
+
+def test_estimate_tokens_counts_cjk_characters_individually():
+    assert estimate_tokens("西湖的雨") == 4
+    assert estimate_tokens("a" * 40) == 10
+    assert estimate_tokens("去了West Lake，") == 2 + 3 + 1
+
+
+def test_batches_fill_budget_and_isolate_long_files():
+    sizes = [("a", 600), ("b", 500), ("c", 400), ("long", 5000), ("d", 100), ("e", 90)]
+
+    batches = plan_token_batches(sizes, token_budget=1000, max_files=3)
+
+    assert batches[0] == ["long"]
+    assert sorted(id for batch in batches for id in batch) == sorted(id for id, _ in sizes)
+    tokens = dict(sizes)
+    assert all(sum(tokens[id] for id in batch) <= 1000 for batch in batches[1:])
+    assert len(batches) == 3
+    report = batch_size_report(batches, tokens, token_budget=1000)
+    assert "3 batches, 6 files" in report
+    assert "1 single-file batches exceed the budget" in report
+
+
+def test_batches_respect_file_limit():
+    batches = plan_token_batches([(str(i), 1) for i in range(5)], token_budget=1000, max_files=2)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
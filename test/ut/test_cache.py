@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+
+from weaver.util.cache import LRUCache
+from weaver.util.graph_version import bump_graph_version, get_graph_version
+
+
+def test_lru_cache_get_put():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_ttl_expiry():
+    cache = LRUCache(max_size=2, ttl_seconds=10)
+    with patch("weaver.util.cache.time.monotonic", return_value=100.0):
+        cache.put("a", 1)
+    with patch("weaver.util.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == 1
+    with patch("weaver.util.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_graph_version_invalidation():
+    cache = LRUCache()
+    version = get_graph_version()
+    cache.put("query", "result", version=version)
+
+    assert cache.get("query", version=get_graph_version()) == "result"
+
+    new_version = bump_graph_version()
+    assert new_version == version + 1
+    assert cache.get("query", version=get_graph_version()) is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_byte_bound_evicts_least_recently_used():
+    cache = LRUCache(max_size=10, max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.put("c", "cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+    assert cache.stats()["bytes"] == 8
+
+    cache.put("a", "a")  # replacing an entry releases its old size
+    assert cache.stats()["bytes"] == 5
+
+    cache.put("huge", "x" * 11)  # larger than the whole budget, not stored
+    assert cache.get("huge") is None
+    assert len(cache) == 2
+
+
+def test_lru_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(max_size=0)
+    with pytest.raises(ValueError):
+        LRUCache(max_bytes=0)
@@ -0,0 +1,33 @@
+from weaver.util.chunking import split_datetime_marker, split_note
+
+NOTE = (
+    "清晨到了西湖，湖面起了薄雾。\n\n"
+    "中午在楼外楼吃了西湖醋鱼。\n\n"
+    "傍晚走过断桥，看雷峰夕照。\n\n"
+    "datetime(2024-10-01T18:30:00.000000Z)"
+)
+
+
+def test_marker_is_split_off_and_carried_by_every_chunk():
+    body, timestamp = split_datetime_marker(NOTE)
+
+    assert timestamp == "2024-10-01T18:30:00.000000Z"
+    assert "datetime(" not in body
+
+    chunks = split_note(NOTE, max_tokens=30)
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert len(chunks) == 2
+    assert chunks[0].text.endswith("西湖醋鱼。")
+    assert all(chunk.timestamp == timestamp for chunk in chunks)
+    assert chunks[1].with_marker().endswith("datetime(2024-10-01T18:30:00.000000Z)")
+
+
+def test_long_paragraph_is_split_at_sentence_ends():
+    paragraph = "我们沿着苏堤慢慢走。" * 10
+
+    chunks = split_note(paragraph, max_tokens=25)
+
+    assert len(chunks) == 5
+    assert all(chunk.text.endswith("。") for chunk in chunks)
+    assert chunks[0].timestamp is None
+    assert "".join(chunk.text for chunk in chunks) == paragraph
@@ -0,0 +1,168 @@
+from weaver.util.cypher import (
+    PlanBudget,
+    QueryNormalizer,
+    bound_variable_length_patterns,
+    find_plan_problems,
+    is_read_only_query,
+    parameterize_literals,
+    skip_rows_on_server,
+    strip_explain_or_profile,
+    timestamp_bounds,
+    timestamp_range_predicate,
+)
+
+
+def test_is_read_only_query():
+    assert is_read_only_query("MATCH (n:City) RETURN n.chinese_name")
+    assert is_read_only_query("MATCH (n) WHERE n.description CONTAINS 'CREATE' RETURN n")
+    assert is_read_only_query("MATCH (n) RETURN n.set, n.created_at")
+    assert is_read_only_query(
+        "CALL db.index.vector.queryNodes('city_embed_vector_index', 5, $v) YIELD node RETURN node"
+    )
+    assert not is_read_only_query("MATCH (n) SET n.name = 'x'")
+    assert not is_read_only_query("merge (c:City {chinese_name: '杭州'})")
+    assert not is_read_only_query("MATCH (n) DETACH DELETE n")
+    assert not is_read_only_query("CALL apoc.create.node(['City'], {}) YIELD node RETURN node")
+    assert not is_read_only_query("SHOW INDEXES")
+
+
+def test_strip_explain_or_profile():
+    assert strip_explain_or_profile("explain MATCH (n) RETURN n") == (
+        "EXPLAIN",
+        " MATCH (n) RETURN n",
+    )
+    assert strip_explain_or_profile("MATCH (n) RETURN n") == ("", "MATCH (n) RETURN n")
+
+
+def test_bound_variable_length_patterns():
+    query, notes = bound_variable_length_patterns(
+        "MATCH (a)-[*]-(b)-[r:NEXT*2..]->(c)-[*1..3]-(d)-[*2]-(e) RETURN '[*]'", 5
+    )
+
+    assert query == "MATCH (a)-[*..5]-(b)-[r:NEXT*2..5]->(c)-[*1..3]-(d)-[*2]-(e) RETURN '[*]'"
+    assert len(notes) == 2
+
+
+def test_find_plan_problems():
+    budget = PlanBudget(max_estimated_rows=1000, max_all_nodes_scan_rows=100)
+    cheap_plan = {
+        "operatorType": "ProduceResults@neo4j",
+        "args": {"EstimatedRows": 10.0},
+        "children": [{"operatorType": "NodeByLabelScan@neo4j", "args": {"EstimatedRows": 10.0}}],
+    }
+    expensive_plan = {
+        "operatorType": "CartesianProduct@neo4j",
+        "args": {"EstimatedRows": 25000.0},
+        "children": [
+            {"operatorType": "AllNodesScan@neo4j", "args": {"EstimatedRows": 500.0}},
+            {"operatorType": "NodeByLabelScan@neo4j", "args": {"EstimatedRows": 50.0}},
+        ],
+    }
+
+    # Two unique index seeks: a product of one row is fine
+    seek_product_plan = {
+        "operatorType": "ProduceResults@neo4j",
+        "args": {"EstimatedRows": 1.0},
+        "children": [
+            {
+                "operatorType": "CartesianProduct@neo4j",
+                "args": {"EstimatedRows": 1.0},
+                "children": [
+                    {"operatorType": "NodeUniqueIndexSeek@neo4j", "args": {"EstimatedRows": 1.0}},
+                    {"operatorType": "NodeUniqueIndexSeek@neo4j", "args": {"EstimatedRows": 1.0}},
+                ],
+            }
+        ],
+    }
+
+    assert find_plan_problems(cheap_plan, budget) == []
+    assert find_plan_problems(seek_product_plan, budget) == []
+    problems = find_plan_problems(expensive_plan, budget)
+    assert len(problems) == 3
+    assert any("CartesianProduct" in problem for problem in problems)
+    assert any("scans all nodes" in problem for problem in problems)
+    assert find_plan_problems(expensive_plan, PlanBudget(allow_cartesian_product=True)) == []
+
+
+def test_parameterize_literals():
+    query, parameters = parameterize_literals(
+        'MATCH (s:ExperientialScene)-[:NEXT*1..3]->(t {name: "it\\\'s"}) '
+        "WHERE s.scene_name = 'west_lake_morning' AND s.score > 0.5 AND s.p1 = `x 2` "
+        "RETURN s LIMIT 10 // 20 rows"
+    )
+
+    assert query == (
+        "MATCH (s:ExperientialScene)-[:NEXT*1..3]->(t {name: $lit_0}) "
+        "WHERE s.scene_name = $lit_1 AND s.score > $lit_2 AND s.p1 = `x 2` "
+        "RETURN s LIMIT $lit_3 // 20 rows"
+    )
+    assert parameters == {"lit_0": "it's", "lit_1": "west_lake_morning", "lit_2": 0.5, "lit_3": 10}
+
+
+def test_parameterize_literals_skips_schema_commands_and_avoids_clashes():
+    ddl = "CREATE VECTOR INDEX v FOR (n:City) ON n.embed OPTIONS {indexConfig: {x: 1024}}"
+    assert parameterize_literals(ddl) == (ddl, {})
+
+    query, parameters = parameterize_literals("MATCH (n) WHERE n.x = $lit_0 + 3 RETURN n")
+    assert query == "MATCH (n) WHERE n.x = $lit_0 + $_lit_0 RETURN n"
+    assert parameters == {"_lit_0": 3}
+
+
+def test_query_normalizer_counts_repeated_shapes():
+    normalizer = QueryNormalizer()
+    normalizer.normalize("MATCH (c:City {chinese_name: '杭州'}) RETURN c")
+    normalizer.normalize("MATCH (c:City {chinese_name: '苏州'}) RETURN c")
+    query, parameters = normalizer.normalize("MATCH (c:City {chinese_name: '杭州'}) RETURN c")
+
+    assert query == "MATCH (c:City {chinese_name: $lit_0}) RETURN c"
+    assert parameters == {"lit_0": "杭州"}
+    stats = normalizer.stats()
+    assert stats["queries"] == 3
+    assert stats["distinct_shapes"] == 1
+    assert stats["shape_hit_rate"] == 2 / 3
+    assert stats["normalization_cache_hit_rate"] == 1 / 3
+
+
+def test_timestamp_bounds_cover_whole_prefixes():
+    assert timestamp_bounds("2023-11", "2023-11") == ("2023-11", "2023-12")
+    assert timestamp_bounds(" 2023-11-05 08:00", None) == ("2023-11-05T08:00", None)
+    assert timestamp_bounds("", "2023-11-09") == (None, "2023-11-0:")
+
+    lower, upper = timestamp_bounds("2023-11", "2023-11-30")
+    timestamps = ["2023-10-31T23:59:59Z", "2023-11-01T00:00:00Z", "2023-11-30T23:59:59.5Z"]
+    assert [lower <= t < upper for t in timestamps] == [False, True, True]
+
+    assert timestamp_range_predicate("n", "s", None) == "n.timestamp >= $s"
+    assert timestamp_range_predicate("n", "s", "e", optional=True) == (
+        "($s IS NULL OR n.timestamp >= $s) AND ($e IS NULL OR n.timestamp < $e)"
+    )
+    assert timestamp_range_predicate("n", None, None) == "true"
+
+
+def test_parameterize_literals_keeps_path_quantifiers():
+    query, parameters = parameterize_literals(
+        "MATCH (a:City {city_name: 'hangzhou'}) ((x)-[:NEXT]->(y)){1,3} (b)-[:R]->{2,}(c) "
+        "MATCH p = (c)(()--()){ 2 }(d) WHERE a.n > 4 RETURN p, {k: 5} AS m, {} AS e"
+    )
+
+    assert query == (
+        "MATCH (a:City {city_name: $lit_0}) ((x)-[:NEXT]->(y)){1,3} (b)-[:R]->{2,}(c) "
+        "MATCH p = (c)(()--()){ 2 }(d) WHERE a.n > $lit_1 RETURN p, {k: $lit_2} AS m, {} AS e"
+    )
+    assert parameters == {"lit_0": "hangzhou", "lit_1": 4, "lit_2": 5}
+
+
+def test_skip_rows_on_server_only_rewrites_a_final_return():
+    assert skip_rows_on_server("MATCH (n) RETURN n ORDER BY n.name;", "skip") == (
+        "MATCH (n) RETURN n ORDER BY n.name\nSKIP $skip"
+    )
+    assert skip_rows_on_server(
+        "CALL { MATCH (n) RETURN n LIMIT 5 } RETURN n // 'limit' RETURN", "skip"
+    ) == ("CALL { MATCH (n) RETURN n LIMIT 5 } RETURN n // 'limit' RETURN\nSKIP $skip")
+
+    assert skip_rows_on_server("MATCH (n) RETURN n LIMIT 500", "skip") is None
+    assert skip_rows_on_server("MATCH (a) RETURN a UNION MATCH (b) RETURN b AS a", "s") is None
+    assert skip_rows_on_server("CALL db.labels()", "skip") is None
+    assert skip_rows_on_server("MATCH (n) WITH n RETURN [(n)--(m) | m] AS ms", "skip") == (
+        "MATCH (n) WITH n RETURN [(n)--(m) | m] AS ms\nSKIP $skip"
+    )
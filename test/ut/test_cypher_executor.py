@@ -1,9 +1,19 @@
 import json
 from unittest.mock import MagicMock, patch
 
+from neo4j import Query
 import pytest
 
-from weaver.tool_resource.cypher_executor import CypherExecutor, serialize_neo4j_value
+from weaver.tool_resource.cypher_executor import (
+    SKIP_ROWS_PARAMETER,
+    CypherBatchExecutor,
+    CypherExecutor,
+    decode_continuation_token,
+    encode_continuation_token,
+    serialize_neo4j_value,
+)
+from weaver.util.cache import LRUCache
+from weaver.util.graph_version import bump_graph_version, get_graph_version
 
 
 # Mock Neo4j graph elements for serialization tests
@@ -60,6 +70,9 @@ def mock_graph_db_service_for_cypher():
         patch("weaver.tool_resource.cypher_executor.Node", new=MockNode),
         patch("weaver.tool_resource.cypher_executor.Relationship", new=MockRelationship),
         patch("weaver.tool_resource.cypher_executor.Path", new=MockPath),
+        patch("weaver.util.serialization.Node", new=MockNode),
+        patch("weaver.util.serialization.Relationship", new=MockRelationship),
+        patch("weaver.util.serialization.Path", new=MockPath),
     ):
         mock_instance = MagicMock()
 
@@ -72,6 +85,28 @@ def mock_graph_db_service_for_cypher():
         mock_result = MagicMock()
         mock_session.run.return_value = mock_result
 
+        # Read queries run through execute_read: an EXPLAIN with a cheap plan, then the query
+        # itself, which is forwarded to mock_session.run so both paths can be asserted alike
+        mock_tx = MagicMock()
+        mock_explain = MagicMock()
+        mock_explain.consume.return_value.plan = {
+            "operatorType": "ProduceResults@neo4j",
+            "args": {"EstimatedRows": 1.0},
+            "children": [],
+        }
+        mock_tx.run.side_effect = (
+            lambda query, *args, **kwargs: mock_explain
+            if query.startswith("EXPLAIN")
+            else mock_session.run(query, *args, **kwargs)
+        )
+        # Writes are explained in the session itself
+        mock_session.run.side_effect = (
+            lambda query, *args, **kwargs: mock_explain
+            if isinstance(query, str) and query.startswith("EXPLAIN")
+            else mock_result
+        )
+        mock_session.execute_read.side_effect = lambda work, *args: work(mock_tx, *args)
+
         mock_service_class.return_value = mock_instance
         yield mock_instance, mock_result
 
@@ -104,7 +139,7 @@ async def test_execute_cypher_success_with_results(mock_graph_db_service_for_cyp
     assert result_json[0]["n"]["properties"]["name"] == "Test"
 
     mock_session = mock_service.get_default_graph_db.return_value.conn.session.return_value.__enter__.return_value
-    mock_session.run.assert_called_once_with(query)
+    mock_session.run.assert_called_once_with(query, {})
 
 
 @pytest.mark.asyncio
@@ -137,6 +172,324 @@ async def test_execute_cypher_db_error(mock_graph_db_service_for_cypher):
     assert f"Query: {query}" in result_str
 
 
+def _mock_session(mock_service):
+    session = mock_service.get_default_graph_db.return_value.conn.session.return_value
+    return session.__enter__.return_value
+
+
+def _mock_records(rows):
+    records = []
+    for row in rows:
+        record = MagicMock()
+        record.data.return_value = row
+        records.append(record)
+    return records
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_row_cap_and_continuation(mock_graph_db_service_for_cypher):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    executor = CypherExecutor(max_rows=2)
+    query = "MATCH (n) RETURN n.name AS name"
+    mock_db_result.__iter__.side_effect = lambda: iter(
+        _mock_records([{"name": "a"}, {"name": "b"}, {"name": "c"}])
+    )
+
+    first = json.loads(await executor.execute_cypher_query(query))
+    assert first["truncated"] is True
+    assert [r["name"] for r in first["records"]] == ["a", "b"]
+    assert "row cap" in first["reason"]
+
+    # The query itself skips the rows already returned
+    mock_session = _mock_session(mock_service)
+    mock_session.run.reset_mock()
+    mock_db_result.__iter__.side_effect = lambda: iter(_mock_records([{"name": "c"}]))
+    second = json.loads(
+        await executor.execute_cypher_query(query, continuation_token=first["continuation_token"])
+    )
+    # The remainder fits, so the plain list format is returned
+    assert second == [{"name": "c"}]
+    mock_session.run.assert_called_once_with(
+        f"{query}\nSKIP ${SKIP_ROWS_PARAMETER}", {SKIP_ROWS_PARAMETER: 2}
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_continuation_skips_rows_client_side(
+    mock_graph_db_service_for_cypher,
+):
+    _, mock_db_result = mock_graph_db_service_for_cypher
+    executor = CypherExecutor(max_rows=2)
+    # With its own LIMIT the query cannot take a SKIP, so the rows are read and dropped
+    query = "MATCH (n) RETURN n.name AS name LIMIT 3"
+    mock_db_result.__iter__.side_effect = lambda: iter(
+        _mock_records([{"name": "a"}, {"name": "b"}, {"name": "c"}])
+    )
+
+    first = json.loads(await executor.execute_cypher_query(query))
+    second = json.loads(
+        await executor.execute_cypher_query(query, continuation_token=first["continuation_token"])
+    )
+
+    assert second == [{"name": "c"}]
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_byte_budget(mock_graph_db_service_for_cypher):
+    _, mock_db_result = mock_graph_db_service_for_cypher
+    executor = CypherExecutor(max_bytes=50)
+    query = "MATCH (n) RETURN n.text AS text"
+    mock_db_result.__iter__.return_value = _mock_records([{"text": "x" * 40}, {"text": "y" * 40}])
+
+    result = json.loads(await executor.execute_cypher_query(query))
+
+    assert result["truncated"] is True
+    assert len(result["records"]) == 1
+    assert "bytes" in result["reason"]
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_strips_embeddings(mock_graph_db_service_for_cypher):
+    _, mock_db_result = mock_graph_db_service_for_cypher
+    executor = CypherExecutor()
+    node = MockNode("node1", ["TestLabel"], {"name": "Test", "embed": [0.1] * 8})
+    mock_db_result.__iter__.return_value = _mock_records([{"n": node, "n.embed": [0.1] * 8}])
+
+    result = json.loads(await executor.execute_cypher_query("MATCH (n) RETURN n, n.embed"))
+
+    assert result == [
+        {"n": {"id": "node1", "labels": ["TestLabel"], "properties": {"name": "Test"}}}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_rejects_foreign_continuation_token(mock_graph_db_service_for_cypher):
+    executor = CypherExecutor()
+    token = encode_continuation_token("MATCH (a) RETURN a", 10)
+
+    result_str = await executor.execute_cypher_query("MATCH (b) RETURN b", continuation_token=token)
+
+    assert "different query" in result_str
+
+
+def test_continuation_token_round_trip():
+    token = encode_continuation_token("MATCH (n) RETURN n", 200)
+    assert decode_continuation_token(" MATCH (n) RETURN n ", token) == 200
+    with pytest.raises(ValueError):
+        decode_continuation_token("MATCH (n) RETURN n", "not-a-token")
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_rejects_expensive_plan(mock_graph_db_service_for_cypher):
+    mock_service, _ = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherExecutor()
+    query = "MATCH (a), (b) RETURN a, b"
+    expensive_plan = {
+        "operatorType": "CartesianProduct@neo4j",
+        "args": {"EstimatedRows": 4e8},
+        "children": [
+            {"operatorType": "AllNodesScan@neo4j", "args": {"EstimatedRows": 2e4}},
+            {"operatorType": "AllNodesScan@neo4j", "args": {"EstimatedRows": 2e4}},
+        ],
+    }
+    mock_tx = MagicMock()
+    mock_tx.run.return_value.consume.return_value.plan = expensive_plan
+    mock_session.execute_read.side_effect = lambda work, *args: work(mock_tx, *args)
+
+    result_str = await executor.execute_cypher_query(query)
+
+    assert "rejected" in result_str
+    assert "CartesianProduct" in result_str
+    assert "scans all nodes" in result_str
+    # Only the EXPLAIN ran
+    mock_tx.run.assert_called_once_with(f"EXPLAIN {query}", {})
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_bounds_variable_length(mock_graph_db_service_for_cypher):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherExecutor()
+    mock_db_result.__iter__.return_value = _mock_records([{"name": "a"}])
+
+    result = json.loads(
+        await executor.execute_cypher_query("MATCH (s:City)-[*]-(n) RETURN n.name AS name")
+    )
+
+    assert result["records"] == [{"name": "a"}]
+    assert "[*..6]" in result["notes"][0]
+    mock_session.run.assert_called_once_with(
+        "MATCH (s:City)-[*..6]-(n) RETURN n.name AS name", {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_write_uses_timeout_and_bumps_version(
+    mock_graph_db_service_for_cypher,
+):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherExecutor(timeout_seconds=5.0)
+    query = "MERGE (c:City {chinese_name: '杭州'})"
+    mock_db_result.__iter__.return_value = []
+    version = get_graph_version()
+
+    result_str = await executor.execute_cypher_query(query)
+
+    assert "No data returned" in result_str
+    mock_session.execute_read.assert_not_called()
+    sent_query, parameters = mock_session.run.call_args.args
+    assert isinstance(sent_query, Query)
+    assert sent_query.text == "MERGE (c:City {chinese_name: $lit_0})"
+    assert sent_query.timeout == 5.0
+    assert parameters == {"lit_0": "杭州"}
+    assert get_graph_version() == version + 1
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_sends_literals_as_parameters(mock_graph_db_service_for_cypher):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherExecutor()
+    mock_db_result.__iter__.return_value = []
+
+    for scene_name in ("west_lake_morning", "broken_bridge_snow"):
+        await executor.execute_cypher_query(
+            f"MATCH (s:ExperientialScene) WHERE s.scene_name = '{scene_name}' RETURN s LIMIT 5"
+        )
+
+    shape = "MATCH (s:ExperientialScene) WHERE s.scene_name = $lit_0 RETURN s LIMIT $lit_1"
+    assert [c.args for c in mock_session.run.call_args_list] == [
+        (shape, {"lit_0": "west_lake_morning", "lit_1": 5}),
+        (shape, {"lit_0": "broken_bridge_snow", "lit_1": 5}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_checks_the_plan_of_writes(mock_graph_db_service_for_cypher):
+    mock_service, _ = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherExecutor()
+    query = "MATCH (a:City), (b:Season) CREATE (a)-[:X]->(b)"
+    mock_session.run.side_effect = None
+    mock_session.run.return_value.consume.return_value.plan = {
+        "operatorType": "CartesianProduct@neo4j",
+        "args": {"EstimatedRows": 4e6},
+        "children": [],
+    }
+
+    result_str = await executor.execute_cypher_query(query)
+
+    assert "rejected" in result_str
+    assert "CartesianProduct" in result_str
+    # Only the EXPLAIN ran, the write did not
+    mock_session.run.assert_called_once_with(f"EXPLAIN {query}", {})
+
+    # Schema commands have no plan to check
+    mock_session.run.reset_mock()
+    await executor.execute_cypher_query("CREATE INDEX IF NOT EXISTS FOR (n:City) ON (n.name)")
+    assert [type(c.args[0]) for c in mock_session.run.call_args_list] == [Query]
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_result_cache(mock_graph_db_service_for_cypher):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherExecutor(result_cache=LRUCache(max_bytes=1024 * 1024))
+    mock_db_result.__iter__.side_effect = lambda: iter(_mock_records([{"name": "断桥残雪"}]))
+    query = "MATCH (s:ExperientialScene {city: '杭州'}) RETURN s.scene_name AS name"
+
+    first = await executor.execute_cypher_query(query)
+    second = await executor.execute_cypher_query(query)
+    assert first == second
+    assert mock_session.execute_read.call_count == 1
+
+    # A write anywhere invalidates the cached result
+    bump_graph_version()
+    assert await executor.execute_cypher_query(query) == first
+    assert mock_session.execute_read.call_count == 2
+
+    # Writes are never served from the cache
+    await executor.execute_cypher_query("MATCH (s:ExperientialScene) SET s.seen = true")
+    await executor.execute_cypher_query("MATCH (s:ExperientialScene) SET s.seen = true")
+    assert mock_session.execute_read.call_count == 2
+    writes = [c.args[0] for c in mock_session.run.call_args_list if isinstance(c.args[0], Query)]
+    assert len(writes) == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_batch(mock_graph_db_service_for_cypher):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    executor = CypherBatchExecutor(id="test_batch_id")
+    mock_db_result.__iter__.return_value = _mock_records([{"name": "断桥残雪"}])
+    emotions_query = "MATCH (a:AffectiveResonance {scene_id: $id}) RETURN a.name AS name"
+
+    result = json.loads(
+        await executor.execute_cypher_batch(
+            [
+                {"key": "scenes", "cypher_query": "MATCH (s:ExperientialScene) RETURN s.name"},
+                {
+                    "key": "emotions",
+                    "cypher_query": emotions_query,
+                    "parameters": {"id": "scene_1"},
+                },
+                {"key": "mark", "cypher_query": "MATCH (s:ExperientialScene) SET s.seen = true"},
+                "MATCH (o:FocalObservation) RETURN o.name AS name",
+            ]
+        )
+    )
+
+    assert executor.name == "execute_cypher_batch"
+    assert list(result) == ["scenes", "emotions", "mark", "3"]
+    assert result["scenes"] == [{"name": "断桥残雪"}]  # rows come from the mocked cursor
+    assert mock_session.execute_read.call_count == 3
+    run_args = [c.args for c in mock_session.run.call_args_list]
+    writes = [args[0] for args in run_args if isinstance(args[0], Query)]
+    assert [query.text for query in writes] == [
+        "MATCH (s:ExperientialScene) SET s.seen = true"
+    ]
+    assert (emotions_query, {"id": "scene_1"}) in run_args
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_batch_validation(mock_graph_db_service_for_cypher):
+    executor = CypherBatchExecutor()
+
+    assert "No queries given" in await executor.execute_cypher_batch([])
+    assert "Too many queries" in await executor.execute_cypher_batch(
+        ["MATCH (n:City) RETURN n"] * 11
+    )
+    assert "Duplicate key" in await executor.execute_cypher_batch(
+        [{"key": "a", "cypher_query": "RETURN 1"}, {"key": "a", "cypher_query": "RETURN 2"}]
+    )
+    assert "has no cypher_query" in await executor.execute_cypher_batch([{"key": "a"}])
+
+
+@pytest.mark.asyncio
+async def test_execute_cypher_logs_and_samples_profile(
+    mock_graph_db_service_for_cypher, isolated_query_log, monkeypatch
+):
+    mock_service, mock_db_result = mock_graph_db_service_for_cypher
+    mock_session = _mock_session(mock_service)
+    monkeypatch.setenv("WEAVER_QUERY_PROFILE_SAMPLE_RATE", "1")
+    mock_db_result.__iter__.return_value = _mock_records([{"name": "杭州"}])
+    mock_db_result.consume.return_value.profile = {"dbHits": 7, "children": []}
+    executor = CypherExecutor()
+
+    await executor.execute_cypher_query("MATCH (c:City) WHERE c.rank > 3 RETURN c.name AS name")
+
+    mock_session.run.assert_called_once_with(
+        "PROFILE MATCH (c:City) WHERE c.rank > $lit_0 RETURN c.name AS name", {"lit_0": 3}
+    )
+    entry = json.loads(isolated_query_log.read_text().splitlines()[-1])
+    assert entry["source"] == "CypherExecutor"
+    assert entry["query"] == "MATCH (c:City) WHERE c.rank > $lit_0 RETURN c.name AS name"
+    assert entry["rows"] == 1
+    assert entry["db_hits"] == 7
+
+
 def test_serialize_neo4j_value():
     # Test with MockNode
     # Patch Node, Relationship, Path as used by serialize_neo4j_value
@@ -0,0 +1,53 @@
+import json
+from unittest.mock import patch
+
+from weaver.util.data_loader_v1 import MANIFEST_FILE_NAME, load_data_v1, mark_extracted
+
+
+def _fake_upload():
+    uploaded = []
+
+    def _upload(file_paths):
+        uploaded.extend(file_paths)
+        return [f"id-{path.rsplit('/', 1)[-1]}-{len(uploaded)}" for path in file_paths]
+
+    return uploaded, _upload
+
+
+def test_only_new_changed_or_unextracted_files_are_returned(tmp_path):
+    (tmp_path / "a.txt").write_text("西湖", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("灵隐寺", encoding="utf-8")
+    uploaded, upload = _fake_upload()
+
+    with patch("weaver.util.data_loader_v1.upload_file", side_effect=upload):
+        first = load_data_v1(str(tmp_path))
+        assert len(first) == 2 and len(uploaded) == 2
+
+        # b.txt was uploaded but its extraction never finished: returned without re-upload
+        mark_extracted([first[0]], str(tmp_path))
+        assert load_data_v1(str(tmp_path)) == [first[1]]
+        assert len(uploaded) == 2
+
+        mark_extracted(first, str(tmp_path))
+        assert load_data_v1(str(tmp_path)) == []
+
+        (tmp_path / "a.txt").write_text("西湖，雨后", encoding="utf-8")
+        (tmp_path / "c.txt").write_text("断桥", encoding="utf-8")
+        changed = load_data_v1(str(tmp_path))
+
+    assert [path.rsplit("/", 1)[-1] for path in uploaded[2:]] == ["a.txt", "c.txt"]
+    assert len(changed) == 2
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text(encoding="utf-8"))
+    assert manifest["b.txt"]["extracted"] is True
+    assert manifest["a.txt"]["extracted"] is False
+
+
+def test_full_run_uploads_everything(tmp_path):
+    (tmp_path / "a.txt").write_text("西湖", encoding="utf-8")
+    uploaded, upload = _fake_upload()
+
+    with patch("weaver.util.data_loader_v1.upload_file", side_effect=upload):
+        mark_extracted(load_data_v1(str(tmp_path)), str(tmp_path))
+        assert load_data_v1(str(tmp_path), incremental=False) != []
+
+    assert len(uploaded) == 2
@@ -0,0 +1,73 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from weaver.util.direct_extraction import extract_note, validate_graph_data
+
+ASSET = {"asset_name": "travel_note_a", "file_id": "a", "media_type": "text"}
+
+
+def _rel(source_label, source_key, target_label, target_key):
+    return {
+        "source_node": {"label": source_label, "key": source_key},
+        "target_node": {"label": target_label, "key": target_key},
+        "properties": {},
+    }
+
+
+def test_validation_drops_what_the_schema_does_not_allow():
+    data = {
+        "nodes": {
+            "ExperientialScene": [
+                {"scene_name": "west_lake_mist", "description": "薄雾", "mood": "calm"},
+                {"description": "no key"},
+            ],
+            "Restaurant": [{"name": "lou_wai_lou"}],
+        },
+        "relationships": {
+            "CONSTRUCTED_FROM_ASSET": [
+                _rel("ExperientialScene", "west_lake_mist", "DigitalAsset", "travel_note_a")
+            ],
+            "LOCATED_IN_CITY": [_rel("ExperientialScene", "west_lake_mist", "City", "hangzhou")],
+            "VISITED": [_rel("ExperientialScene", "west_lake_mist", "City", "hangzhou")],
+            "OCCURRED_IN_SEASON": ["west_lake_mist -> autumn", {"source_node": "west_lake_mist"}],
+        },
+    }
+
+    graph, problems = validate_graph_data(data, known_nodes={"DigitalAsset": {"travel_note_a"}})
+
+    assert graph["nodes"] == {
+        "ExperientialScene": [{"scene_name": "west_lake_mist", "description": "薄雾"}]
+    }
+    # The city was never extracted, so the edge to it cannot be created
+    assert list(graph["relationships"]) == ["CONSTRUCTED_FROM_ASSET"]
+    assert len(problems) == 7
+
+
+def test_extract_note_makes_one_call_and_reports_usage():
+    reply = json.dumps(
+        {
+            "nodes": {"City": [{"city_name": "hangzhou", "chinese_name": "杭州"}, "宁波"]},
+            "relationships": {"BELONGS_TO_PROVINCE": ["hangzhou -> zhejiang"]},
+        }
+    )
+    client = MagicMock()
+    client.chat.completions.create.return_value = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=reply))],
+        usage=SimpleNamespace(prompt_tokens=1200, completion_tokens=300),
+    )
+
+    extraction = extract_note("西湖。\n\ndatetime(2024-10-01T00:00:00Z)", ASSET, client, "m")
+
+    client.chat.completions.create.assert_called_once()
+    messages = client.chat.completions.create.call_args.kwargs["messages"]
+    assert "City(city_name*" in messages[0]["content"]
+    assert "travel_note_a" in messages[1]["content"]
+    assert extraction.graph["nodes"]["DigitalAsset"] == [ASSET]
+    assert extraction.graph["nodes"]["City"][0]["city_name"] == "hangzhou"
+    assert (extraction.prompt_tokens, extraction.completion_tokens) == (1200, 300)
+    # Malformed entries are dropped and reported, not fatal to the note
+    assert extraction.problems == [
+        "City node without city_name",
+        "BELONGS_TO_PROVINCE relationship that is not an object",
+    ]
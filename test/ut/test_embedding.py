@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock
+
+import requests
+
+from weaver.util import embedding
+from weaver.util.embedding import get_embed_vec, get_embed_vecs
+
+
+def _response(data):
+    response = MagicMock()
+    response.json.return_value = {"data": data}
+    return response
+
+
+def test_embeddings_follow_the_input_order(monkeypatch):
+    post = MagicMock(
+        return_value=_response([{"index": 1, "embedding": [2.0]}, {"index": 0, "embedding": [1.0]}])
+    )
+    monkeypatch.setattr(embedding.requests, "post", post)
+
+    assert get_embed_vecs(["a", "b"]) == [[1.0], [2.0]]
+    assert post.call_args.kwargs["json"]["input"] == ["a", "b"]
+
+
+def test_single_embedding_goes_through_the_batch_request(monkeypatch):
+    post = MagicMock(return_value=_response([{"index": 0, "embedding": [1.0]}]))
+    monkeypatch.setattr(embedding.requests, "post", post)
+
+    assert get_embed_vec("a") == [1.0]
+    assert post.call_args.kwargs["json"]["input"] == ["a"]
+
+
+def test_failed_or_incomplete_embeddings(monkeypatch):
+    post = MagicMock()
+    monkeypatch.setattr(embedding.requests, "post", post)
+
+    assert get_embed_vecs([]) == []
+    post.assert_not_called()
+
+    post.return_value = _response([{"index": 0, "embedding": [1.0]}])
+    assert get_embed_vecs(["a", "b"]) is None
+    post.return_value = _response([])
+    assert get_embed_vec("a") is None
+
+    post.side_effect = requests.exceptions.ConnectionError("down")
+    assert get_embed_vecs(["a"]) is None
+    assert get_embed_vec("a") is None
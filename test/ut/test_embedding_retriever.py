@@ -0,0 +1,267 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from weaver.tool_resource import embedding_retriever
+from weaver.tool_resource.embedding_retriever import (
+    FILTER_MAX_CANDIDATES,
+    FILTER_OVERFETCH_FACTOR,
+    BatchEmbeddingRetriever,
+    EmbeddingRetriever,
+    RetrievalFilters,
+)
+from weaver.util.cache import LRUCache
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    monkeypatch.setattr(embedding_retriever, "log_query", MagicMock())
+    retriever = EmbeddingRetriever()
+    retriever._graph_db_service = MagicMock()
+    return retriever
+
+
+def _session(retriever):
+    session = retriever._graph_db_service.get_default_graph_db.return_value.conn.session
+    return session.return_value.__enter__.return_value
+
+
+def _records(count, matching, start_score=0.99):
+    """Vector index rows, best first; the first `matching` of them pass the filters."""
+    return [
+        {
+            "node_type": "ExperientialScene",
+            "node_properties": {"scene_name": f"scene_{i}", "embed": [0.1, 0.2]}
+            if i < matching
+            else None,
+            "similarity_score": start_score - i * 0.001,
+            "matches_filters": i < matching,
+        }
+        for i in range(count)
+    ]
+
+
+def _serve(session, *pages):
+    """Make successive session.run calls return the given record pages."""
+    results = []
+    for page in pages:
+        result = MagicMock()
+        result.__iter__.return_value = iter(page)
+        results.append(result)
+    session.run.side_effect = results
+
+
+def _candidate_ks(session):
+    return [call.kwargs["parameters"]["candidate_k"] for call in session.run.call_args_list]
+
+
+def test_filters_to_cypher():
+    assert RetrievalFilters().to_cypher() == ("true", {})
+    assert not RetrievalFilters(node_label="City").has_graph_filters()
+
+    clause, params = RetrievalFilters(
+        node_label="ExperientialScene", city="杭州", asset="note_1"
+    ).to_cypher()
+
+    assert clause.startswith("$filter_label IN labels(node) AND EXISTS {")
+    assert "LOCATED_IN_CITY" in clause
+    assert "asset.file_id = $filter_asset" in clause
+    assert params == {
+        "filter_label": "ExperientialScene",
+        "filter_city": "杭州",
+        "filter_asset": "note_1",
+    }
+
+
+def test_time_filters_compare_the_timestamp_property():
+    clause, params = RetrievalFilters(start_time="2023-11", end_time="2023-11").to_cypher()
+
+    assert clause == "node.timestamp >= $filter_start AND node.timestamp < $filter_end"
+    assert params == {"filter_start": "2023-11", "filter_end": "2023-12"}
+    assert RetrievalFilters(end_time="2024").to_cypher() == (
+        "node.timestamp < $filter_end",
+        {"filter_end": "2025"},
+    )
+
+
+def test_filters_restrict_searched_labels():
+    assert RetrievalFilters(node_label="City").candidate_labels() == ["City"]
+    # Only labels that reach a scene can be filtered by city
+    labels = RetrievalFilters(city="hangzhou").candidate_labels()
+    assert "ExperientialScene" in labels
+    assert "City" not in labels
+
+
+def test_label_only_filter_does_not_overfetch(retriever):
+    session = _session(retriever)
+    # Each label has its own index, so every candidate passes a label-only filter
+    _serve(session, _records(5, matching=5))
+
+    nodes = retriever._run_vector_query(
+        "city_embed_vector_index", [0.1], 5, 0.7, RetrievalFilters(node_label="City")
+    )
+
+    assert _candidate_ks(session) == [5]
+    assert len(nodes) == 5
+    assert "embed" not in nodes[0]["properties"]
+    assert nodes[0]["_embedding"] == [0.1, 0.2]
+
+
+def test_candidate_pool_grows_until_enough_nodes_match(retriever):
+    session = _session(retriever)
+    first_k = 3 * FILTER_OVERFETCH_FACTOR
+    _serve(session, _records(first_k, matching=1), _records(first_k * 4, matching=5))
+
+    nodes = retriever._run_vector_query(
+        "experientialscene_embed_vector_index", [0.1], 3, 0.7, RetrievalFilters(city="hangzhou")
+    )
+
+    assert _candidate_ks(session) == [first_k, first_k * FILTER_OVERFETCH_FACTOR]
+    assert [node["properties"]["scene_name"] for node in nodes] == [
+        "scene_0",
+        "scene_1",
+        "scene_2",
+    ]
+
+
+def test_exhausted_index_stops_the_search(retriever):
+    session = _session(retriever)
+    # Fewer rows than requested: nothing else is above the threshold
+    _serve(session, _records(4, matching=1))
+
+    nodes = retriever._run_vector_query(
+        "experientialscene_embed_vector_index", [0.1], 3, 0.7, RetrievalFilters(season="autumn")
+    )
+
+    assert _candidate_ks(session) == [3 * FILTER_OVERFETCH_FACTOR]
+    assert len(nodes) == 1
+
+
+def test_candidate_pool_stops_at_the_cap(retriever):
+    session = _session(retriever)
+    ks = []
+    k = 10 * FILTER_OVERFETCH_FACTOR
+    while True:
+        ks.append(k)
+        if k >= FILTER_MAX_CANDIDATES:
+            break
+        k = min(k * FILTER_OVERFETCH_FACTOR, FILTER_MAX_CANDIDATES)
+    _serve(session, *(_records(k, matching=0) for k in ks))
+
+    nodes = retriever._run_vector_query(
+        "experientialscene_embed_vector_index", [0.1], 10, 0.7, RetrievalFilters(asset="a")
+    )
+
+    assert nodes == []
+    assert _candidate_ks(session) == ks
+    assert ks[-1] == FILTER_MAX_CANDIDATES
+
+
+def test_threshold_and_filters_go_into_one_query(retriever):
+    session = _session(retriever)
+    _serve(session, _records(0, matching=0))
+
+    retriever._run_vector_query(
+        "experientialscene_embed_vector_index",
+        [0.1],
+        2,
+        0.85,
+        RetrievalFilters(city="hangzhou", season="autumn"),
+    )
+
+    query = session.run.call_args.args[0]
+    params = session.run.call_args.kwargs["parameters"]
+    assert "WHERE score >= $similarity_threshold" in query
+    assert "LOCATED_IN_CITY" in query and "OCCURRED_IN_SEASON" in query
+    assert params["similarity_threshold"] == 0.85
+    assert params["filter_city"] == "hangzhou"
+    assert params["filter_season"] == "autumn"
+
+
+def _scene(name, score):
+    return {
+        "node_type": "ExperientialScene",
+        "properties": {"scene_name": name},
+        "similarity_score": score,
+    }
+
+
+@pytest.fixture
+def batch_retriever(monkeypatch):
+    monkeypatch.setattr(embedding_retriever, "log_query", MagicMock())
+    monkeypatch.setattr(embedding_retriever, "_retrieval_cache", LRUCache(max_size=8))
+    retriever = BatchEmbeddingRetriever()
+    retriever._graph_db_service = MagicMock()
+    retriever._get_graph_around_nodes = AsyncMock(return_value={"nodes": [], "edges": []})
+    return retriever
+
+
+async def test_batch_keeps_query_order_and_expands_the_union_once(batch_retriever, monkeypatch):
+    embed = MagicMock(return_value=[[1.0], [2.0]])
+    monkeypatch.setattr(embedding_retriever, "get_embed_vecs", embed)
+    hits = {
+        (1.0,): [_scene("west_lake", 0.9), _scene("broken_bridge", 0.8)],
+        (2.0,): [_scene("west_lake", 0.95)],
+    }
+
+    async def _search(vector, top_k, threshold, filters, fallback=True):
+        return [dict(node) for node in hits[tuple(vector)]]
+
+    batch_retriever._search_similar_nodes = _search
+
+    result = json.loads(
+        await batch_retriever.find_similar_nodes_batch(
+            ["西湖", " ", "断桥", "西湖"], top_k=2, use_fulltext=False
+        )
+    )
+
+    embed.assert_called_once_with(["西湖", "断桥"])
+    assert [group["query_text"] for group in result["queries"]] == ["西湖", "断桥"]
+    assert [n["properties"]["scene_name"] for n in result["queries"][0]["similar_nodes"]] == [
+        "west_lake",
+        "broken_bridge",
+    ]
+    expanded = batch_retriever._get_graph_around_nodes.call_args.args[0]
+    assert sorted(n["properties"]["scene_name"] for n in expanded) == [
+        "broken_bridge",
+        "west_lake",
+    ]
+
+
+async def test_batch_without_texts_or_embeddings(batch_retriever, monkeypatch):
+    monkeypatch.setattr(embedding_retriever, "get_embed_vecs", MagicMock(return_value=None))
+    batch_retriever._search_similar_nodes = AsyncMock()
+    batch_retriever._search_fulltext = AsyncMock(return_value=[_scene("west_lake", 1.0)])
+
+    assert await batch_retriever.find_similar_nodes_batch(["", "  "]) == (
+        "No texts given to search for."
+    )
+    failed = await batch_retriever.find_similar_nodes_batch(["西湖"], use_fulltext=False)
+    assert failed.startswith("Failed to compute embeddings")
+
+    # With full-text search the texts are still searched, without the vector indexes
+    result = json.loads(await batch_retriever.find_similar_nodes_batch(["西湖"]))
+    batch_retriever._search_similar_nodes.assert_not_called()
+    assert result["queries"][0]["similar_nodes"][0]["properties"]["scene_name"] == "west_lake"
+
+
+async def test_vector_search_fans_out_over_the_candidate_label_indexes(retriever, monkeypatch):
+    searched = []
+
+    def _run(index_name, vector, top_k, threshold, filters):
+        searched.append(index_name)
+        score = 0.9 if index_name.startswith("experientialscene") else 0.8
+        return [_scene(index_name, score)]
+
+    monkeypatch.setattr(retriever, "_run_vector_query", _run)
+
+    nodes = await retriever._search_similar_nodes([0.1], 2, 0.7, RetrievalFilters(city="杭州"))
+
+    expected = [
+        f"{label.lower()}_embed_vector_index"
+        for label in RetrievalFilters(city="杭州").candidate_labels()
+    ]
+    assert sorted(searched) == sorted(expected)
+    assert len(nodes) == 2
+    assert nodes[0]["properties"]["scene_name"] == "experientialscene_embed_vector_index"
@@ -0,0 +1,107 @@
+from weaver.util.gazetteer import (
+    MultiPatternMatcher,
+    PlaceHints,
+    canonicalize_places,
+    link_scenes_to_season,
+    pre_extract,
+    season_of,
+)
+
+
+def _rel(source_label, source_key, target_label, target_key):
+    return {
+        "source_node": {"label": source_label, "key": source_key},
+        "target_node": {"label": target_label, "key": target_key},
+        "properties": {},
+    }
+
+
+def test_matcher_prefers_leftmost_longest_match():
+    matcher = MultiPatternMatcher({"吉林": "city", "吉林省": "province", "林省": "x", "省城": "y"})
+
+    assert matcher.find("去吉林省城") == [(1, 4, "province")]
+    assert matcher.find("吉林的冬天") == [(0, 2, "city")]
+    assert matcher.find("") == []
+
+
+def test_pre_extract_finds_places_and_adds_their_provinces():
+    hints = pre_extract("从北京出发，先到杭州市，又去了浙江的宁波。", "2024-01-05T08:00:00Z")
+
+    assert hints.cities == ["beijing", "hangzhou", "ningbo"]
+    assert hints.provinces == ["zhejiang", "beijing"]
+    assert hints.seasons == ["winter"]
+
+    graph = hints.graph()
+    assert {node["city_name"] for node in graph["nodes"]["City"]} == set(hints.cities)
+    assert (
+        _rel("City", "ningbo", "Province", "zhejiang")
+        in graph["relationships"]["BELONGS_TO_PROVINCE"]
+    )
+    assert "杭州 -> `hangzhou`" in hints.prompt()
+    assert hints.known_nodes()["Province"] == {"zhejiang", "beijing"}
+
+
+def test_common_words_containing_a_place_name_are_not_places():
+    hints = pre_extract("酒店大堂铺着大理石，墙上爬满长春藤。", "2024-05-01")
+
+    assert (hints.cities, hints.provinces) == ([], [])
+    assert pre_extract("在大理买了一块大理石").cities == ["dali"]
+
+
+def test_season_prefers_words_then_months_then_the_timestamp():
+    assert season_of("十月的秋天，有点像春天", "2024-04-01T00:00:00Z") == "autumn"
+    assert season_of("七月去了海边", "2024-01-01T00:00:00Z") == "summer"
+    assert season_of("去了海边", "2024-04-01T00:00:00Z") == "spring"
+    assert season_of("去了海边") is None
+    assert pre_extract("去了海边").prompt() == ""
+
+
+def test_combined_hints_keep_first_mention_order_without_duplicates():
+    combined = PlaceHints.combine(
+        [pre_extract("杭州", "2024-10-01T00:00:00Z"), pre_extract("宁波，杭州", "2024-07-01")]
+    )
+
+    assert combined.cities == ["hangzhou", "ningbo"]
+    assert combined.provinces == ["zhejiang"]
+    assert combined.seasons == ["autumn", "summer"]
+    assert combined.season is None
+
+
+def test_canonicalize_places_renames_nodes_and_their_relationships():
+    graph = {
+        "nodes": {
+            "City": [
+                {"city_name": "hangzhou_city", "chinese_name": "杭州"},
+                {"city_name": "lin_an", "chinese_name": "临安"},
+            ],
+            "Province": [{"province_name": "zhejiang_prov", "chinese_name": "浙江省"}],
+        },
+        "relationships": {
+            "BELONGS_TO_PROVINCE": [_rel("City", "hangzhou_city", "Province", "zhejiang_prov")],
+        },
+    }
+
+    canonicalize_places(graph)
+
+    assert [node["city_name"] for node in graph["nodes"]["City"]] == ["hangzhou", "lin_an"]
+    assert graph["nodes"]["Province"][0]["province_name"] == "zhejiang"
+    assert graph["relationships"]["BELONGS_TO_PROVINCE"] == [
+        _rel("City", "hangzhou", "Province", "zhejiang")
+    ]
+
+
+def test_scenes_without_a_season_are_linked_to_the_note_season():
+    graph = {
+        "nodes": {"ExperientialScene": [{"scene_name": "west_lake"}, {"scene_name": "snow"}]},
+        "relationships": {
+            "OCCURRED_IN_SEASON": [_rel("ExperientialScene", "snow", "Season", "winter")]
+        },
+    }
+
+    link_scenes_to_season(graph, "autumn")
+
+    assert graph["relationships"]["OCCURRED_IN_SEASON"] == [
+        _rel("ExperientialScene", "snow", "Season", "winter"),
+        _rel("ExperientialScene", "west_lake", "Season", "autumn"),
+    ]
+    assert link_scenes_to_season({"nodes": {}}, "autumn") == {"nodes": {}, "relationships": {}}
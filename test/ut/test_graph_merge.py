@@ -0,0 +1,47 @@
+from weaver.util.graph_merge import merge_graph_fragments, parse_graph_fragment
+
+
+def _rel(source_key, target_key, **properties):
+    return {
+        "source_node": {"label": "ExperientialScene", "key": source_key},
+        "target_node": {"label": "City", "key": target_key},
+        "properties": properties,
+    }
+
+
+def test_parse_graph_fragment_from_json_block():
+    reply = 'Done.\n```json\n{"nodes": {"City": [{"city_name": "hangzhou"}]}}\n```'
+
+    assert parse_graph_fragment(reply) == {
+        "nodes": {"City": [{"city_name": "hangzhou"}]},
+        "relationships": {},
+    }
+    assert parse_graph_fragment("no graph here") is None
+
+
+def test_merge_deduplicates_nodes_and_relationships():
+    first = {
+        "nodes": {
+            "City": [{"city_name": "hangzhou", "chinese_name": "杭州"}],
+            "ExperientialScene": [{"scene_name": "west_lake_mist", "description": "薄雾"}],
+        },
+        "relationships": {"LOCATED_IN_CITY": [_rel("west_lake_mist", "hangzhou")]},
+    }
+    second = {
+        "nodes": {
+            "City": [{"city_name": "hangzhou", "description": "浙江省会"}, {"chinese_name": "?"}],
+            "ExperientialScene": [
+                {"scene_name": "west_lake_mist", "description": "清晨湖面起了薄雾"}
+            ],
+        },
+        "relationships": {"LOCATED_IN_CITY": [_rel("west_lake_mist", "hangzhou", weight=1)]},
+    }
+
+    merged = merge_graph_fragments([first, second])
+
+    assert merged["nodes"]["City"] == [
+        {"city_name": "hangzhou", "chinese_name": "杭州", "description": "浙江省会"}
+    ]
+    assert merged["nodes"]["ExperientialScene"][0]["description"] == "清晨湖面起了薄雾"
+    assert len(merged["relationships"]["LOCATED_IN_CITY"]) == 1
+    assert merged["relationships"]["LOCATED_IN_CITY"][0]["properties"] == {"weight": 1}
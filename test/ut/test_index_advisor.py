@@ -0,0 +1,76 @@
+from weaver.util.index_advisor import (
+    annotated_index_properties,
+    format_index_report,
+    index_report,
+    lookup_properties,
+    plan_range_indexes,
+)
+from weaver.util.schema import PREDEFINED_GRAPH_SCHEMA, generate_schema_statements
+
+
+def test_lookup_properties_from_patterns_and_where_clauses():
+    query = (
+        "MATCH (c:City {chinese_name: $lit_0})<-[:LOCATED_IN_CITY]-(s:ExperientialScene) "
+        "WHERE s.location_text = $lit_1 AND s.scene_name = 'x' "
+        "RETURN s.description ORDER BY s.timestamp"
+    )
+
+    # Primary keys and properties that are only returned or ordered by are not lookups
+    assert lookup_properties(query, PREDEFINED_GRAPH_SCHEMA) == {
+        ("City", "chinese_name"),
+        ("ExperientialScene", "location_text"),
+    }
+
+
+def test_plan_adds_frequent_logged_lookups_to_annotations():
+    frequent = {"query": "MATCH (a:DigitalAsset) WHERE a.media_type = $lit_0 RETURN a"}
+    rare = {"query": "MATCH (o:FocalObservation) WHERE o.significance = $lit_0 RETURN o"}
+
+    planned = plan_range_indexes(PREDEFINED_GRAPH_SCHEMA, [frequent] * 5 + [rare], min_lookups=5)
+
+    assert annotated_index_properties(PREDEFINED_GRAPH_SCHEMA) < planned
+    assert ("DigitalAsset", "media_type") in planned
+    assert ("FocalObservation", "significance") not in planned
+
+
+def test_schema_only_indexes_planned_properties():
+    range_indexes = {
+        (statement.labels[0], statement.properties[0])
+        for statement in generate_schema_statements(PREDEFINED_GRAPH_SCHEMA)
+        if statement.index_type == "RANGE"
+    }
+
+    assert ("ExperientialScene", "timestamp") in range_indexes
+    assert ("City", "chinese_name") in range_indexes
+    assert ("ExperientialScene", "description") not in range_indexes
+    assert ("AffectiveResonance", "trigger_description") not in range_indexes
+
+
+def test_index_report_lists_missing_and_unused_indexes():
+    existing = [
+        {
+            "name": "index_desc",
+            "type": "RANGE",
+            "entityType": "NODE",
+            "labelsOrTypes": ["ExperientialScene"],
+            "properties": ["description"],
+            "owningConstraint": None,
+            "readCount": 0,
+        },
+        {
+            "name": "constraint_scene_name",
+            "type": "RANGE",
+            "entityType": "NODE",
+            "labelsOrTypes": ["ExperientialScene"],
+            "properties": ["scene_name"],
+            "owningConstraint": "scene_unique",
+            "readCount": 12,
+        },
+    ]
+
+    report = index_report(PREDEFINED_GRAPH_SCHEMA, None, existing)
+
+    assert [item["name"] for item in report["unused"]] == ["index_desc"]
+    assert report["unused"][0]["drop"] == "DROP INDEX index_desc IF EXISTS"
+    assert len(report["missing"]) == len(report["planned"])
+    assert "DROP INDEX index_desc IF EXISTS" in format_index_report(report)
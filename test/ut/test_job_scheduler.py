@@ -0,0 +1,95 @@
+import threading
+import time
+
+from weaver.util.job_scheduler import ScheduledJob, run_bounded
+
+
+def test_jobs_complete_in_completion_order_within_concurrency_limit():
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def _job(seconds):
+        def _run():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(seconds)
+            with lock:
+                active.pop()
+            return seconds
+
+        return _run
+
+    jobs = [
+        ScheduledJob("slow", _job(0.2), weight=3),
+        ScheduledJob("fast", _job(0.01), weight=2),
+        ScheduledJob("next", _job(0.01)),
+    ]
+
+    outcomes = run_bounded(jobs, max_concurrency=2, job_timeout_seconds=None)
+
+    assert [outcome.job.name for outcome in outcomes] == ["fast", "next", "slow"]
+    assert all(outcome.status == "done" for outcome in outcomes)
+    assert outcomes[-1].result == 0.2
+    assert max(peak) == 2
+
+
+def test_failed_and_stalled_jobs_free_their_slot(capsys):
+    release = threading.Event()
+    started = []
+
+    def _stall():
+        started.append("stalled")
+        release.wait()
+        return "late"
+
+    def _fail():
+        started.append("broken")
+        raise ValueError("bad batch")
+
+    jobs = [
+        ScheduledJob("stalled", _stall),
+        ScheduledJob("broken", _fail),
+        ScheduledJob("ok", lambda: "fine"),
+    ]
+    nodes = iter(range(0, 100, 10))
+    # The stalled job exits well after its timeout, which frees its slot
+    threading.Timer(0.2, release.set).start()
+
+    outcomes = run_bounded(
+        jobs, max_concurrency=1, job_timeout_seconds=0.05, node_counter=lambda: next(nodes)
+    )
+
+    assert [(outcome.job.name, outcome.status) for outcome in outcomes] == [
+        ("stalled", "timeout"),
+        ("broken", "failed"),
+        ("ok", "done"),
+    ]
+    assert outcomes[0].result is None  # the late result is dropped
+    assert outcomes[1].seconds < 0.2
+    assert isinstance(outcomes[1].error, ValueError)
+    progress = capsys.readouterr().out
+    assert "3/3 files" in progress and "nodes/s" in progress
+    assert "1 timed out jobs still holding a slot" in progress
+
+
+def test_timed_out_jobs_count_against_the_bound():
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def _slow():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.1)
+        with lock:
+            active.pop()
+
+    jobs = [ScheduledJob(f"job {i}", _slow) for i in range(6)]
+
+    outcomes = run_bounded(jobs, max_concurrency=2, job_timeout_seconds=0.02)
+
+    assert [outcome.status for outcome in outcomes] == ["timeout"] * 6
+    assert max(peak) == 2
@@ -0,0 +1,129 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from weaver.tool_resource.memory_query import (
+    ANCHORS_CONTRIBUTED_TO_QUERY,
+    EMOTIONS_TRIGGERED_BY_QUERY,
+    LINKED_ASSETS_QUERY,
+    SCENES_IN_CITY_QUERY,
+    SCENES_IN_TIME_RANGE_QUERY,
+    AnchorLookup,
+    AssetLookup,
+    EmotionLookup,
+    ObservationLookup,
+    SceneLookup,
+)
+from weaver.util.cache import LRUCache
+from weaver.util.cypher import is_read_only_query
+
+
+@pytest.fixture
+def mock_tx():
+    with patch("weaver.tool_resource.cypher_executor.GraphDbService") as mock_service_class:
+        mock_session = MagicMock()
+        mock_graph_db = mock_service_class.return_value.get_default_graph_db.return_value
+        mock_graph_db.conn.session.return_value.__enter__.return_value = mock_session
+
+        tx = MagicMock()
+        mock_session.execute_read.side_effect = lambda work, *args: work(tx, *args)
+        yield tx
+
+
+def _return_rows(tx, rows):
+    records = []
+    for row in rows:
+        record = MagicMock()
+        record.data.return_value = row
+        records.append(record)
+    result = MagicMock()
+    result.__iter__.return_value = iter(records)
+    tx.run.return_value = result
+
+
+@pytest.mark.asyncio
+async def test_find_scenes_by_city_and_time(mock_tx):
+    rows = [{"scene": {"scene_name": "west_lake_dawn"}, "city": "hangzhou"}]
+    _return_rows(mock_tx, rows)
+
+    output = await SceneLookup().find_scenes(city=" Hangzhou ", start_time="2023-11")
+
+    assert json.loads(output) == rows
+    mock_tx.run.assert_called_once_with(
+        SCENES_IN_CITY_QUERY,
+        {
+            "start_time": "2023-11",
+            "end_time": None,
+            "city": "Hangzhou",
+            "city_name": "hangzhou",
+            "limit": 50,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_scenes_by_time_only_and_validation(mock_tx):
+    _return_rows(mock_tx, [])
+    tool = SceneLookup()
+
+    output = await tool.find_scenes(end_time="2024", limit=5000)
+
+    assert output.startswith("No matching records found")
+    query, parameters = mock_tx.run.call_args[0]
+    assert query == SCENES_IN_TIME_RANGE_QUERY
+    assert parameters["limit"] == 200  # clamped to the row cap
+    # The whole of 2024 is included; the open start still compares on the timestamp index
+    assert parameters["start_time"] == ""
+    assert parameters["end_time"] == "2025"
+    assert "scene.timestamp >= $start_time AND scene.timestamp < $end_time" in query
+    assert "toString" not in query
+    assert "Give a city" in await tool.find_scenes()
+
+
+@pytest.mark.asyncio
+async def test_element_lookups_accept_a_single_name(mock_tx):
+    _return_rows(mock_tx, [{"element": "west_lake_dawn", "element_label": "ExperientialScene"}])
+
+    await EmotionLookup().find_emotions_triggered_by("west_lake_dawn")
+
+    mock_tx.run.assert_called_once_with(
+        EMOTIONS_TRIGGERED_BY_QUERY, {"element_names": ["west_lake_dawn"], "limit": 50}
+    )
+    assert "at least one" in await ObservationLookup().find_observations_of_scenes([])
+
+
+def test_prepared_queries_are_read_only_and_start_from_primary_keys():
+    for query in (EMOTIONS_TRIGGERED_BY_QUERY, LINKED_ASSETS_QUERY, ANCHORS_CONTRIBUTED_TO_QUERY):
+        assert is_read_only_query(query)
+        assert "embed" not in query
+    for primary_key in ("scene_name", "observation_name", "resonance_name", "interaction_name"):
+        assert f"{{{primary_key}: element_name}}" in LINKED_ASSETS_QUERY
+    for rel_type in (
+        "CONSTRUCTED_FROM_ASSET",
+        "IDENTIFIED_IN_ASSET",
+        "EXTRACTED_FROM_ASSET",
+        "DOCUMENTED_BY_ASSET",
+    ):
+        assert f"[:{rel_type}]" in LINKED_ASSETS_QUERY
+
+
+@pytest.mark.asyncio
+async def test_lookup_results_are_cached(mock_tx):
+    _return_rows(mock_tx, [{"element": "west_lake_dawn", "anchor": {"anchor_name": "calm"}}])
+    tool = AnchorLookup(result_cache=LRUCache(max_size=8))
+
+    first = await tool.find_anchors_contributed_to(["west_lake_dawn"])
+    second = await tool.find_anchors_contributed_to(["west_lake_dawn"])
+
+    assert first == second
+    assert mock_tx.run.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_error_is_reported(mock_tx):
+    mock_tx.run.side_effect = Exception("connection lost")
+
+    output = await AssetLookup().find_linked_assets(["west_lake_dawn"])
+
+    assert "Error running AssetLookup lookup: connection lost" in output
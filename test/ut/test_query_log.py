@@ -0,0 +1,129 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from weaver.util import query_log
+from weaver.util.query_log import (
+    QUERY_LOG_PATH_ENV,
+    format_report,
+    load_query_log,
+    log_query,
+    main,
+    profile_db_hits,
+    query_log_path,
+    query_shape_id,
+    summarize_query_log,
+)
+
+
+def _summary(db_hits=None, **counters):
+    profile = None
+    if db_hits is not None:
+        profile = {"dbHits": db_hits, "children": [{"dbHits": 1, "children": []}]}
+    return SimpleNamespace(
+        counters=SimpleNamespace(**counters),
+        result_available_after=2,
+        result_consumed_after=3,
+        profile=profile,
+    )
+
+
+def test_log_query_writes_jsonl(isolated_query_log):
+    log_query(
+        "GraphImporter",
+        "MERGE (n:City {city_name: $city_name})\n  SET n.description = $description",
+        time.perf_counter(),
+        summary=_summary(nodes_created=1, properties_set=2, labels_added=0),
+    )
+    log_query("CypherExecutor", "MATCH (n) RETURN n", time.perf_counter(), error="timed out")
+
+    entries = load_query_log(isolated_query_log)
+    assert len(entries) == 2
+    assert entries[0]["source"] == "GraphImporter"
+    assert entries[0]["query"] == (
+        "MERGE (n:City {city_name: $city_name}) SET n.description = $description"
+    )
+    assert entries[0]["counters"] == {"nodes_created": 1, "properties_set": 2}
+    assert entries[0]["server_ms"] == 5
+    assert "db_hits" not in entries[0]
+    assert entries[1]["error"] == "timed out"
+
+
+def test_log_query_is_off_by_default(isolated_query_log, monkeypatch):
+    for configured in ("off", ""):
+        monkeypatch.setenv(QUERY_LOG_PATH_ENV, configured)
+        log_query("CypherExecutor", "MATCH (n) RETURN n", time.perf_counter())
+    monkeypatch.delenv(QUERY_LOG_PATH_ENV)
+    log_query("CypherExecutor", "MATCH (n) RETURN n", time.perf_counter())
+
+    assert query_log_path() is None
+    assert not isolated_query_log.exists()
+
+
+def test_log_query_rotates_a_full_log(isolated_query_log, monkeypatch):
+    monkeypatch.setattr(query_log, "QUERY_LOG_MAX_BYTES", 300)
+    for i in range(6):
+        log_query("CypherExecutor", f"MATCH (n) RETURN n LIMIT {i}", time.perf_counter())
+
+    rotated = isolated_query_log.with_name(isolated_query_log.name + ".1")
+    assert rotated.exists()
+    assert isolated_query_log.stat().st_size <= 300 + 200
+    entries = load_query_log(rotated) + load_query_log(isolated_query_log)
+    assert entries[-1]["query"] == "MATCH (n) RETURN n LIMIT 5"
+
+
+def test_profile_db_hits():
+    assert profile_db_hits(None) is None
+    assert profile_db_hits(_summary(db_hits=41).profile) == 42
+
+
+def _entry(query, wall_ms, rows=0, source="CypherExecutor", **extra):
+    return {
+        "shape": query_shape_id(query),
+        "query": query,
+        "source": source,
+        "wall_ms": wall_ms,
+        "rows": rows,
+        **extra,
+    }
+
+
+def test_summarize_query_log_ranks_offenders():
+    slow = "MATCH (a), (b) RETURN a, b"
+    fast = "MATCH (c:City) RETURN c"
+    entries = [
+        _entry(slow, 900.0, rows=10, db_hits=5000),
+        _entry(slow, 300.0, error="timed out"),
+        _entry(fast, 5.0, rows=3, source="EmbeddingRetriever"),
+        _entry(fast, 7.0, rows=3),
+        _entry(fast, 6.0, rows=3),
+    ]
+
+    by_time = summarize_query_log(entries)
+    assert [shape["query"] for shape in by_time] == [slow, fast]
+    assert by_time[0]["count"] == 2
+    assert by_time[0]["max_ms"] == 900.0
+    assert by_time[0]["mean_ms"] == 600.0
+    assert by_time[0]["db_hits"] == 5000
+    assert by_time[0]["errors"] == 1
+    assert by_time[1]["sources"] == ["CypherExecutor", "EmbeddingRetriever"]
+
+    assert summarize_query_log(entries, sort_by="count")[0]["query"] == fast
+    with pytest.raises(ValueError):
+        summarize_query_log(entries, sort_by="unknown")
+
+    report = format_report(by_time, top=1)
+    assert slow in report
+    assert fast not in report
+
+
+def test_report_command(isolated_query_log, capsys):
+    log_query("CypherExecutor", "MATCH (c:City) RETURN c", time.perf_counter(), rows=3)
+
+    main(["report", "--path", str(isolated_query_log), "--sort", "rows"])
+
+    output = capsys.readouterr().out
+    assert "MATCH (c:City) RETURN c" in output
+    assert json.loads(isolated_query_log.read_text().splitlines()[0])["rows"] == 3
@@ -0,0 +1,52 @@
+import pytest
+
+from weaver.util.ranking import RRF_K, maximal_marginal_relevance, reciprocal_rank_fusion
+
+
+def test_reciprocal_rank_fusion_prefers_items_in_both_lists():
+    vector_ranking = ["leifeng_pagoda", "broken_bridge", "su_causeway"]
+    fulltext_ranking = ["louwailou_dinner", "leifeng_pagoda"]
+
+    fused = reciprocal_rank_fusion([vector_ranking, fulltext_ranking])
+    keys = [key for key, _ in fused]
+
+    assert keys[0] == "leifeng_pagoda"
+    assert set(keys) == {"leifeng_pagoda", "broken_bridge", "su_causeway", "louwailou_dinner"}
+    assert fused[0][1] == pytest.approx(1 / (RRF_K + 1) + 1 / (RRF_K + 2))
+
+
+def test_reciprocal_rank_fusion_single_list_keeps_order():
+    fused = reciprocal_rank_fusion([["a", "b", "c"]])
+
+    assert [key for key, _ in fused] == ["a", "b", "c"]
+
+
+def test_reciprocal_rank_fusion_empty():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_maximal_marginal_relevance_skips_near_duplicates():
+    query = [1.0, 0.0, 0.0]
+    candidates = [
+        [0.9, 0.1, 0.0],  # most relevant
+        [0.9, 0.11, 0.0],  # near-duplicate of the first
+        [0.7, 0.0, 0.7],  # less relevant but different
+    ]
+
+    assert maximal_marginal_relevance(query, candidates, k=2, lambda_mult=0.5) == [0, 2]
+
+
+def test_maximal_marginal_relevance_lambda_one_is_pure_relevance():
+    query = [1.0, 0.0]
+    candidates = [[0.0, 1.0], [1.0, 0.1], [1.0, 0.0]]
+
+    assert maximal_marginal_relevance(query, candidates, k=3, lambda_mult=1.0) == [2, 1, 0]
+
+
+def test_maximal_marginal_relevance_edge_cases():
+    assert maximal_marginal_relevance([1.0], [], k=3) == []
+    assert maximal_marginal_relevance([1.0], [[1.0]], k=0) == []
+    assert maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0]], k=5) == [0]
+    with pytest.raises(ValueError):
+        maximal_marginal_relevance([1.0], [[1.0]], k=1, lambda_mult=1.5)
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from weaver.util import runtime
+
+
+@pytest.fixture(autouse=True)
+def fresh_runtime():
+    runtime.reset_runtime()
+    yield
+    runtime.reset_runtime()
+
+
+def test_runtime_is_built_once_across_threads():
+    service = MagicMock()
+
+    def slow_load():
+        time.sleep(0.05)
+        return service
+
+    with (
+        patch.object(runtime, "_initialize_chat2graph") as initialize,
+        patch.object(runtime, "_load_agentic_service", side_effect=slow_load) as load,
+    ):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            services = list(pool.map(lambda _: runtime.get_agentic_service(), range(16)))
+
+        runtime.new_session("s1")
+
+    assert all(s is service for s in services)
+    initialize.assert_called_once()
+    load.assert_called_once()
+    service.session.assert_called_once_with("s1")
+
+
+def test_reset_runtime_rebuilds_on_next_use():
+    with (
+        patch.object(runtime, "_initialize_chat2graph") as initialize,
+        patch.object(runtime, "_load_agentic_service", side_effect=[MagicMock(), MagicMock()]),
+    ):
+        first = runtime.get_agentic_service()
+        runtime.reset_runtime()
+        second = runtime.get_agentic_service()
+
+    assert first is not second
+    assert initialize.call_count == 2
@@ -0,0 +1,193 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from weaver.util import schema
+from weaver.util.embedding import EmbeddingSettings
+from weaver.util.schema import (
+    PREDEFINED_GRAPH_SCHEMA,
+    generate_schema_statements,
+    import_graph_schema,
+    schema_fingerprint,
+    wait_for_indexes_online,
+)
+
+
+class FakeSession:
+    """Answers the bootstrap's SHOW and fingerprint queries and records the rest."""
+
+    def __init__(
+        self,
+        stored_fingerprint=None,
+        constraints=(),
+        indexes=(),
+        index_states=(),
+        vector_options=(),
+        version="5.20.0",
+    ):
+        self.stored_fingerprint = stored_fingerprint
+        self.constraints = list(constraints)
+        self.indexes = list(indexes)
+        self.index_states = list(index_states)
+        self.vector_options = list(vector_options)
+        self.version = version
+        self.executed = []
+
+    def run(self, query, parameters=None, **kwargs):
+        result = MagicMock()
+        if query.startswith("MATCH (m:WeaverSchemaFingerprint"):
+            fingerprint = self.stored_fingerprint
+            result.single.return_value = {"fingerprint": fingerprint} if fingerprint else None
+        elif query.startswith("CALL dbms.components()"):
+            result.single.return_value = {"version": self.version}
+        elif query.startswith("SHOW INDEXES YIELD name, type, options"):
+            result.__iter__.return_value = iter(self.vector_options)
+        elif query.startswith("SHOW CONSTRAINTS"):
+            result.__iter__.return_value = iter(self.constraints)
+        elif query.startswith("SHOW INDEXES YIELD name"):
+            result.__iter__.return_value = iter(self.index_states)
+        elif query.startswith("SHOW INDEXES"):
+            result.__iter__.return_value = iter(self.indexes)
+        else:
+            self.executed.append(query)
+        return result
+
+
+@pytest.fixture
+def fake_db():
+    with patch("weaver.util.schema.GraphDbService") as mock_service_class:
+        service = mock_service_class.instance
+
+        def _use(session):
+            graph_db = service.get_default_graph_db.return_value
+            graph_db.conn.session.return_value.__enter__.return_value = session
+            return service
+
+        schema._bootstrapped_fingerprint = None
+        yield _use
+        schema._bootstrapped_fingerprint = None
+
+
+def _listing(statement):
+    return {
+        "type": statement.index_type,
+        "entityType": statement.entity_type,
+        "labelsOrTypes": list(statement.labels),
+        "properties": list(statement.properties),
+    }
+
+
+def test_statements_are_idempotent():
+    statements = generate_schema_statements(PREDEFINED_GRAPH_SCHEMA)
+
+    assert all("IF NOT EXISTS" in statement.command for statement in statements)
+    assert len({statement.key() for statement in statements}) == len(statements)
+
+
+def test_bootstrap_runs_only_missing_statements_and_stores_fingerprint(fake_db):
+    statements = generate_schema_statements(PREDEFINED_GRAPH_SCHEMA)
+    existing, missing = statements[:-2], statements[-2:]
+    session = FakeSession(
+        constraints=[_listing(s) for s in existing if s.kind == "CONSTRAINT"],
+        indexes=[_listing(s) for s in existing if s.kind == "INDEX"],
+        # An index the schema does not own neither holds up nor fails the bootstrap
+        index_states=[
+            {"name": "legacy_idx", "type": "RANGE", "state": "FAILED", "populationPercent": 0.0}
+        ],
+    )
+    service = fake_db(session)
+
+    import_graph_schema()
+
+    assert session.executed[:-1] == [statement.command for statement in missing]
+    assert session.executed[-1].startswith("MERGE (m:WeaverSchemaFingerprint")
+
+    # A second call in the same process does not touch the database at all
+    service.get_default_graph_db.reset_mock()
+    import_graph_schema()
+    service.get_default_graph_db.assert_not_called()
+
+
+def test_bootstrap_skips_when_database_has_fingerprint(fake_db):
+    fingerprint, indexed_properties, settings = schema._predefined_schema_plan()
+    assert fingerprint == schema_fingerprint(PREDEFINED_GRAPH_SCHEMA, indexed_properties, settings)
+    session = FakeSession(stored_fingerprint=fingerprint)
+    fake_db(session)
+
+    import_graph_schema()
+
+    assert session.executed == []
+
+
+def test_wait_for_indexes_online_reports_failures():
+    failed = FakeSession(
+        index_states=[
+            {"name": "scene_vec", "type": "VECTOR", "state": "FAILED", "populationPercent": 3.0}
+        ]
+    )
+    with pytest.raises(RuntimeError, match="scene_vec"):
+        wait_for_indexes_online(failed, ["scene_vec"])
+    wait_for_indexes_online(failed, ["city_vec"])
+
+    populating = FakeSession(
+        index_states=[
+            {
+                "name": "scene_vec",
+                "type": "VECTOR",
+                "state": "POPULATING",
+                "populationPercent": 40.0,
+            }
+        ]
+    )
+    with pytest.raises(TimeoutError, match="scene_vec"):
+        wait_for_indexes_online(populating, ["scene_vec"], timeout_seconds=0)
+
+
+def test_vector_index_options_follow_embedding_settings():
+    settings = EmbeddingSettings(dimensions=768, similarity_function="euclidean", hnsw_m=32)
+
+    old_server = generate_schema_statements(PREDEFINED_GRAPH_SCHEMA, None, settings, (5, 15))
+    new_server = generate_schema_statements(PREDEFINED_GRAPH_SCHEMA, None, settings, (5, 20))
+    old_vector = next(s for s in old_server if s.index_type == "VECTOR")
+    new_vector = next(s for s in new_server if s.index_type == "VECTOR")
+
+    assert "`vector.dimensions`: 768" in old_vector.command
+    assert "`vector.similarity_function`: 'euclidean'" in old_vector.command
+    assert "hnsw" not in old_vector.command
+    assert "`vector.hnsw.m`: 32" in new_vector.command
+    assert "`vector.quantization.enabled`: true" in new_vector.command
+
+
+def test_bootstrap_rebuilds_vector_index_with_changed_config(fake_db, monkeypatch):
+    monkeypatch.setenv("WEAVER_VECTOR_HNSW_M", "32")
+    monkeypatch.setattr(schema, "_predefined_plan", None)
+    statements = generate_schema_statements(
+        PREDEFINED_GRAPH_SCHEMA, None, EmbeddingSettings.from_env(), (5, 20, 0)
+    )
+    scene_index = "experientialscene_embed_vector_index"
+    session = FakeSession(
+        constraints=[_listing(s) for s in statements if s.kind == "CONSTRAINT"],
+        indexes=[_listing(s) for s in statements if s.kind == "INDEX"],
+        vector_options=[
+            {
+                "name": scene_index,
+                "type": "VECTOR",
+                "options": {
+                    "indexConfig": {
+                        "vector.dimensions": 1024,
+                        "vector.similarity_function": "COSINE",
+                        "vector.hnsw.m": 16,
+                    }
+                },
+            }
+        ],
+    )
+    fake_db(session)
+
+    import_graph_schema()
+    monkeypatch.setattr(schema, "_predefined_plan", None)
+
+    assert session.executed[0] == f"DROP INDEX {scene_index} IF EXISTS"
+    assert session.executed[1].startswith(f"CREATE VECTOR INDEX {scene_index} IF NOT EXISTS")
+    assert "`vector.hnsw.m`: 32" in session.executed[1]
+    assert session.executed[2].startswith("MERGE (m:WeaverSchemaFingerprint")
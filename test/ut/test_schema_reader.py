@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+import pytest
+
+from weaver.tool_resource import schema_reader
+from weaver.tool_resource.schema_reader import GraphSchemaReader, render_schema_summary
+from weaver.util.schema import PREDEFINED_GRAPH_SCHEMA
+
+
+@pytest.fixture
+def mock_graph_db_service():
+    with patch("weaver.tool_resource.schema_reader.GraphDbService") as mock_service_class:
+        service = mock_service_class.instance
+        service.get_schema_metadata.return_value = PREDEFINED_GRAPH_SCHEMA
+        schema_reader._schema_cache.clear()
+        yield service
+        schema_reader._schema_cache.clear()
+
+
+def test_compact_summary_leaves_out_descriptions_and_embeddings():
+    summary = render_schema_summary(PREDEFINED_GRAPH_SCHEMA)
+
+    assert "  City(city_name*: STRING, chinese_name: STRING, description: STRING)" in summary
+    assert "  (ExperientialScene)-[:LOCATED_IN_CITY {id*: STRING}]->(City)" in summary.splitlines()
+    assert "embed" not in summary
+    assert "杭州" not in summary
+
+
+def test_verbose_summary_includes_descriptions():
+    summary = render_schema_summary(PREDEFINED_GRAPH_SCHEMA, verbose=True)
+
+    assert "杭州" in summary
+    assert "Connects a City to its Province." in summary
+
+
+@pytest.mark.asyncio
+async def test_rendering_is_cached_until_schema_version_changes(mock_graph_db_service):
+    reader = GraphSchemaReader()
+
+    first = await reader.read_graph_schema()
+    second = await reader.read_graph_schema()
+    assert first == second
+    assert mock_graph_db_service.get_schema_metadata.call_count == 1
+
+    await reader.read_graph_schema(verbose=True)
+    assert mock_graph_db_service.get_schema_metadata.call_count == 2
+
+    with patch("weaver.tool_resource.schema_reader.get_schema_version", return_value=99):
+        await reader.read_graph_schema()
+    assert mock_graph_db_service.get_schema_metadata.call_count == 3
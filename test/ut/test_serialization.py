@@ -0,0 +1,77 @@
+import json
+from unittest.mock import patch
+
+from neo4j.graph import Graph, Node, Path
+from neo4j.time import Date
+
+from weaver.util.serialization import dumps, serialize_record, serialize_value
+
+
+def _graph_elements():
+    graph = Graph()
+    city = Node(graph, "4:c:1", 1, ["City"], {"chinese_name": "杭州", "embed": [0.1] * 1024})
+    season = Node(graph, "4:c:2", 2, ["Season"], {"chinese_name": "春"})
+    relationship = graph.relationship_type("IN_SEASON")(graph, "5:c:1", 1, {"weight": 1.0})
+    relationship._start_node = city
+    relationship._end_node = season
+    return city, season, relationship
+
+
+def test_serialize_value_graph_elements():
+    city, season, relationship = _graph_elements()
+
+    assert serialize_value(city) == {
+        "id": "4:c:1",
+        "labels": ["City"],
+        "properties": {"chinese_name": "杭州"},
+    }
+    assert serialize_value(relationship) == {
+        "id": "5:c:1",
+        "type": "IN_SEASON",
+        "start_node_id": "4:c:1",
+        "end_node_id": "4:c:2",
+        "properties": {"weight": 1.0},
+    }
+    path = serialize_value(Path(city, relationship))
+    assert [node["id"] for node in path["nodes"]] == ["4:c:1", "4:c:2"]
+    assert path["relationships"][0]["type"] == "IN_SEASON"
+
+
+def test_serialize_value_relationship_without_end_nodes():
+    graph = Graph()
+    relationship = graph.relationship_type("IN_SEASON")(graph, "5:c:2", 2, {})
+
+    serialized = serialize_value(relationship)
+
+    assert serialized["start_node_id"] is None
+    assert serialized["end_node_id"] is None
+
+
+def test_serialize_value_nested_and_embeddings():
+    city, season, _ = _graph_elements()
+    value = {"cities": [city, season], "n.embed": [0.5] * 1024, "vector": (0.5,) * 512, "n": 3}
+
+    assert serialize_value(value) == {
+        "cities": [serialize_value(city), serialize_value(season)],
+        "vector": "<embedding of 512 floats omitted>",
+        "n": 3,
+    }
+
+
+def test_serialize_record_primitive_fast_path():
+    record = {"name": "断桥残雪", "visits": 3, "rating": 4.5, "seen": True, "note": None}
+    assert serialize_record(record) is record
+
+    tags = ["lake", "snow"]
+    assert serialize_record({"tags": tags})["tags"] is tags
+    assert serialize_record({"name": "x", "embed": 1}) == {"name": "x"}
+
+
+def test_dumps_compact_and_fallback():
+    value = {"name": "杭州", "date": Date(2024, 3, 1), "rows": [1, 2]}
+
+    assert json.loads(dumps(value)) == {"name": "杭州", "date": "2024-03-01", "rows": [1, 2]}
+    assert "\n" not in dumps(value)
+    assert "\n  " in dumps(value, compact=False)
+    with patch("weaver.util.serialization.orjson", None):
+        assert dumps(value) == '{"name":"杭州","date":"2024-03-01","rows":[1,2]}'
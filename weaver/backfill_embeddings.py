@@ -0,0 +1,196 @@
+import argparse
+from dataclasses import dataclass
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from weaver.util.embedding import (
+    EMBED_MODEL_PROPERTY,
+    current_embedding_model,
+    embedding_text,
+    get_embed_vecs,
+)
+from weaver.util.graph_version import bump_graph_version
+from weaver.util.query_log import log_query
+from weaver.util.schema import get_node_labels_with_property, get_primary_key
+
+# Texts sent to the embedding API per request, and rows written per transaction
+EMBED_BATCH_SIZE = 32
+WRITE_CHUNK_SIZE = 128
+
+# Default cap on nodes embedded per second, leaving model quota to live traffic
+MAX_NODES_PER_SECOND = 20.0
+
+
+@dataclass
+class BackfillStats:
+    """Progress of a backfill run."""
+
+    total: int = 0
+    embedded: int = 0
+    failed: int = 0
+    started_at: float = 0.0
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started_at
+        return self.embedded / elapsed if elapsed > 0 else 0.0
+
+
+def _stale_predicate() -> str:
+    return (
+        f"(n.embed IS NULL OR n.{EMBED_MODEL_PROPERTY} IS NULL "
+        f"OR n.{EMBED_MODEL_PROPERTY} <> $model)"
+    )
+
+
+def count_stale_nodes(session: Any, label: str, model: str) -> int:
+    """Count the nodes of a label without an embedding from the given model."""
+    record = session.run(
+        f"MATCH (n:{label}) WHERE {_stale_predicate()} RETURN count(n) AS stale", model=model
+    ).single()
+    return record["stale"] if record else 0
+
+
+def fetch_stale_page(
+    session: Any, label: str, model: str, limit: int, skipped: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Fetch up to `limit` stale nodes, leaving out the elementIds in `skipped`.
+
+    Written nodes are no longer stale, so every call returns the next nodes without a cursor
+    or a sort; the query stops at the first `limit` matches.
+    """
+    primary_key = get_primary_key(label)
+    result = session.run(
+        f"MATCH (n:{label}) WHERE {_stale_predicate()} AND NOT elementId(n) IN $skipped "
+        f"RETURN elementId(n) AS id, n.description AS description, n.{primary_key} AS key "
+        "LIMIT $limit",
+        model=model,
+        skipped=skipped or [],
+        limit=limit,
+    )
+    return [record.data() for record in result]
+
+
+def write_embeddings(session: Any, rows: List[Dict[str, Any]], model: str) -> None:
+    """Write embeddings back in transactions of at most WRITE_CHUNK_SIZE rows."""
+    query = (
+        "UNWIND $rows AS row MATCH (n) WHERE elementId(n) = row.id "
+        f"SET n.embed = row.embed, n.{EMBED_MODEL_PROPERTY} = $model"
+    )
+    for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+        chunk = rows[start : start + WRITE_CHUNK_SIZE]
+        started_at = time.perf_counter()
+        summary = session.execute_write(
+            lambda tx, chunk=chunk: tx.run(query, rows=chunk, model=model).consume()
+        )
+        log_query("EmbeddingBackfill", query, started_at, summary=summary)
+
+
+def backfill_embeddings(
+    driver: Any,
+    model: str,
+    labels: Optional[List[str]] = None,
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_nodes_per_second: float = MAX_NODES_PER_SECOND,
+    embed_fn: Callable[[List[str]], Optional[List[List[float]]]] = get_embed_vecs,
+) -> BackfillStats:
+    """Embed every node whose embedding is missing or from another model.
+
+    Each page is taken from the nodes that are still stale, so an interrupted run simply
+    continues with the nodes it had not reached. Batches that fail to embed twice are
+    skipped for the rest of the run and counted; run again to retry them.
+
+    Args:
+        driver (Any): Neo4j driver.
+        model (str): Embedding model the vectors must come from.
+        labels (Optional[List[str]]): Labels to backfill; defaults to every label with an
+            embed property in the schema.
+        batch_size (int): Nodes embedded per request.
+        max_nodes_per_second (float): Rate cap; 0 disables it.
+        embed_fn (Callable): Batch embedding function, get_embed_vecs by default.
+
+    Returns:
+        BackfillStats: Counts of embedded and failed nodes.
+    """
+    labels = labels or get_node_labels_with_property("embed")
+    stats = BackfillStats(started_at=time.perf_counter())
+
+    with driver.session() as session:
+        for label in labels:
+            stats.total += count_stale_nodes(session, label, model)
+        print(f"{stats.total} nodes need an embedding from {model}")
+
+        for label in labels:
+            skipped: List[str] = []
+            while True:
+                batch_started_at = time.perf_counter()
+                page = fetch_stale_page(session, label, model, batch_size, skipped)
+                if not page:
+                    break
+
+                texts = [embedding_text(row, row["key"]) for row in page]
+                vectors = embed_fn(texts)
+                if vectors is None or len(vectors) != len(page):
+                    # One retry absorbs transient API errors; the batch is skipped after that
+                    vectors = embed_fn(texts)
+                if vectors is None or len(vectors) != len(page):
+                    stats.failed += len(page)
+                    skipped.extend(row["id"] for row in page)
+                else:
+                    write_embeddings(
+                        session,
+                        [
+                            {"id": row["id"], "embed": vector}
+                            for row, vector in zip(page, vectors, strict=True)
+                        ],
+                        model,
+                    )
+                    stats.embedded += len(page)
+                    bump_graph_version()
+
+                print(
+                    f"[{label}] {stats.embedded + stats.failed}/{stats.total} nodes, "
+                    f"{stats.failed} failed, {stats.rate():.1f} nodes/s"
+                )
+
+                if max_nodes_per_second > 0:
+                    min_duration = len(page) / max_nodes_per_second
+                    elapsed = time.perf_counter() - batch_started_at
+                    if elapsed < min_duration:
+                        time.sleep(min_duration - elapsed)
+
+    if stats.failed:
+        print(f"{stats.failed} nodes could not be embedded; run again to retry them.")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Embed nodes with a missing or outdated embedding, e.g. after switching models."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--labels", nargs="*", default=None, help="labels to backfill")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument(
+        "--max-nodes-per-second",
+        type=float,
+        default=MAX_NODES_PER_SECOND,
+        help="rate cap, 0 for none",
+    )
+    args = parser.parse_args(argv)
+
+    from chat2graph.core.service.graph_db_service import GraphDbService
+
+    from weaver.util.init_chat2graph import init_chat2graph
+
+    init_chat2graph()
+    graph_db = GraphDbService.instance.get_default_graph_db()
+    stats = backfill_embeddings(
+        graph_db.conn,
+        current_embedding_model(),
+        labels=args.labels,
+        batch_size=args.batch_size,
+        max_nodes_per_second=args.max_nodes_per_second,
+    )
+    print(f"Done: {stats.embedded} nodes embedded, {stats.failed} failed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+from pathlib import Path
+from statistics import mean, median
+from typing import Dict, List, Optional
+
+from chat2graph.core.service.graph_db_service import GraphDbService
+
+from weaver.build_memory import _batch_job, extract_directly
+from weaver.util.file import upload_file
+from weaver.util.graph_version import bump_graph_version
+from weaver.util.job_scheduler import JobOutcome, run_bounded
+from weaver.util.runtime import get_agentic_service
+from weaver.util.schema import SCHEMA_FINGERPRINT_LABEL, import_graph_schema
+
+
+def _row(mode: str, seconds: List[float], files: int, tokens: Optional[List[int]]) -> str:
+    if not seconds:
+        return f"{mode:<8} {0:>3}/{files:<3} {'-':>8} {'-':>8} {'-':>8} {'-':>12}"
+    token_text = f"{mean(tokens):>12.0f}" if tokens else f"{'n/a':>12}"
+    return (
+        f"{mode:<8} {len(seconds):>3}/{files:<3} {mean(seconds):>8.1f} "
+        f"{median(seconds):>8.1f} {max(seconds):>8.1f} {token_text}"
+    )
+
+
+def clear_graph() -> None:
+    """Delete every node and relationship except the schema fingerprint."""
+    graph_db = GraphDbService.instance.get_default_graph_db()
+    with graph_db.conn.session() as session:
+        session.run(
+            f"MATCH (n) WHERE NOT n:{SCHEMA_FINGERPRINT_LABEL} "
+            "CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS"
+        ).consume()
+    bump_graph_version()
+
+
+def benchmark_agent(file_ids: List[str], args: argparse.Namespace) -> List[float]:
+    """Time the agent expert on one file per job; returns seconds per completed file."""
+    mas = get_agentic_service()
+    seconds: Dict[str, float] = {}
+
+    def _collect(outcome: JobOutcome) -> None:
+        if outcome.status == "done":
+            seconds[outcome.job.name] = outcome.seconds
+
+    jobs = [_batch_job(mas, file_id, [file_id]) for file_id in file_ids]
+    run_bounded(
+        jobs,
+        max_concurrency=args.concurrency,
+        job_timeout_seconds=args.job_timeout or None,
+        on_complete=_collect,
+    )
+    return list(seconds.values())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compare time and tokens per file of the agent and the direct extraction modes.
+
+    Both modes import into the configured graph database, which is cleared before each
+    mode so that every mode starts from an empty graph rather than from the nodes and
+    relationships the previous one MERGEd: point it at a scratch database. The agent
+    mode's token use is not reported by the SDK and is shown as n/a.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the extraction modes per file.")
+    parser.add_argument("--folder", default=None, help="folder of *.txt notes")
+    parser.add_argument("--limit", type=int, default=5, help="files to extract per mode")
+    parser.add_argument(
+        "--modes", nargs="+", choices=["direct", "agent"], default=["direct", "agent"]
+    )
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--job-timeout", type=float, default=1800.0)
+    args = parser.parse_args(argv)
+
+    get_agentic_service()
+    # Upload only the sampled notes, and leave the folder's ingestion manifest alone so the
+    # next incremental build_memory run is not affected
+    note_paths = sorted(Path(args.folder or "asset/text_data_v1").glob("*.txt"))[: args.limit]
+    file_ids = upload_file([str(path) for path in note_paths])
+    import_graph_schema()
+
+    rows = [f"{'mode':<8} {'ok':>7} {'mean s':>8} {'p50 s':>8} {'max s':>8} {'tokens/file':>12}"]
+    for mode in args.modes:
+        clear_graph()
+        if mode == "direct":
+            extractions = extract_directly(file_ids, args).values()
+            rows.append(
+                _row(
+                    mode,
+                    [e.seconds + e.import_seconds for e in extractions],
+                    len(file_ids),
+                    [e.prompt_tokens + e.completion_tokens for e in extractions],
+                )
+            )
+        else:
+            rows.append(_row(mode, benchmark_agent(file_ids, args), len(file_ids), None))
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
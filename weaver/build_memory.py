@@ -1,75 +1,357 @@
-from typing import List
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
 from chat2graph.core.model.message import FileMessage, HybridMessage, TextMessage
-from chat2graph.core.sdk.agentic_service import AgenticService
-from chat2graph.core.sdk.wrapper.job_wrapper import JobWrapper
 
-from weaver.util.data_loader_v1 import load_data_v1
-from weaver.util.init_chat2graph import init_chat2graph
+from weaver.tool_resource.graph_importer import GraphImporter, imported_node_count
+from weaver.util.batching import (
+    DEFAULT_MAX_FILES_PER_BATCH,
+    DEFAULT_TOKEN_BUDGET,
+    batch_size_report,
+    estimate_tokens,
+    plan_token_batches,
+)
+from weaver.util.chunking import (
+    DEFAULT_CHUNK_TOKENS,
+    NoteChunk,
+    split_datetime_marker,
+    split_note,
+)
+from weaver.util.data_loader_v1 import load_data_v1, mark_extracted
+from weaver.util.direct_extraction import DirectExtraction, extract_note
+from weaver.util.file import get_file_content
+from weaver.util.gazetteer import (
+    PlaceHints,
+    canonicalize_places,
+    link_scenes_to_season,
+    pre_extract,
+)
+from weaver.util.graph_merge import merge_graph_fragments, parse_graph_fragment
+from weaver.util.job_scheduler import (
+    DEFAULT_JOB_TIMEOUT_SECONDS,
+    DEFAULT_MAX_CONCURRENCY,
+    JobOutcome,
+    ScheduledJob,
+    run_bounded,
+)
+from weaver.util.runtime import get_agentic_service
 from weaver.util.schema import import_graph_schema
 
 
-def main():
-    """Main function for batch processing travel data."""
-    init_chat2graph()
-    mas = AgenticService.load("weaver.yml")
+def _result_text(service_message) -> str:
+    if isinstance(service_message, TextMessage):
+        return service_message.get_payload()
+    if isinstance(service_message, HybridMessage):
+        return service_message.get_instruction_message().get_payload()
+    return ""
 
-    file_ids = load_data_v1()
 
-    import_graph_schema()
+def _batch_job(
+    mas, name: str, file_ids_batch: List[str], places: Optional[PlaceHints] = None
+) -> ScheduledJob:
+    session_id = str(uuid4())
 
-    jobs: List[JobWrapper] = []
+    # set the user message
+    payload = """
+        你好，请你帮我处理一下我的旅游数据。
+        请分析这些文件中的旅行信息，提取关键的地点、时间、活动和情感，
+        然后为每次旅行生成富有情感的回忆叙述，并建立相应的知识图谱连接。
+        """
+    if places and places.prompt():
+        payload += f"\n{places.prompt()}\n"
+    user_message = TextMessage(
+        payload=payload,
+        assigned_expert_name="Memory Integration And Graph Expert",
+        session_id=session_id,
+    )
+    file_messages: List[FileMessage] = []
+    for file_id in file_ids_batch:
+        file_message = FileMessage(file_id=file_id, session_id=session_id)
+        file_messages.append(file_message)
 
-    # Process files in batches
-    batch_size = 20
-    for i in range(0, len(file_ids), batch_size):
-        file_ids_batch = file_ids[i : i + batch_size]
-        session_id = str(uuid4())
+    hybrid_message = HybridMessage(
+        instruction_message=user_message,
+        attached_messages=file_messages,
+    )
 
-        # set the user message
-        user_message = TextMessage(
-            payload="""
-            你好，请你帮我处理一下我的旅游数据。
-            请分析这些文件中的旅行信息，提取关键的地点、时间、活动和情感，
-            然后为每次旅行生成富有情感的回忆叙述，并建立相应的知识图谱连接。
-            """,
-            assigned_expert_name="Memory Integration And Graph Expert",
-            session_id=session_id,
-        )
-        file_messages: List[FileMessage] = []
-        for file_id in file_ids_batch:
-            file_message = FileMessage(file_id=file_id, session_id=session_id)
-            file_messages.append(file_message)
+    # the job is submitted only when the scheduler has a free slot
+    return ScheduledJob(
+        name=name,
+        run=lambda: mas.session().submit(hybrid_message).wait(),
+        weight=len(file_ids_batch),
+    )
 
-        hybrid_message = HybridMessage(
-            instruction_message=user_message,
-            attached_messages=file_messages,
+
+def _chunk_job(
+    mas, name: str, chunk: NoteChunk, asset_name: str, places: PlaceHints
+) -> ScheduledJob:
+    user_message = TextMessage(
+        payload=f"""
+请从下面这段旅行日记片段中提取记忆元素，输出节点与关系的 JSON。
+这篇日记对应的 DigitalAsset 节点的 asset_name 是 `{asset_name}`。
+
+{chunk.with_marker()}
+
+{places.prompt()}
+""",
+        assigned_expert_name="Memory Chunk Extraction Expert",
+        session_id=str(uuid4()),
+    )
+    return ScheduledJob(name=name, run=lambda: mas.session().submit(user_message).wait())
+
+
+def _asset_node(file_id: str, body: str, timestamp: Optional[str]) -> Dict[str, Any]:
+    return {
+        "asset_name": f"travel_note_{file_id.replace('-', '_')}",
+        "description": body[:200],
+        "file_id": file_id,
+        "media_type": "text",
+        "timestamp": timestamp,
+    }
+
+
+def extract_in_chunks(mas, file_ids: List[str], args: argparse.Namespace) -> List[str]:
+    """Extract notes paragraph chunk by chunk, in parallel, and import the merged graph once.
+
+    Every chunk is extracted by its own job into a graph fragment. The fragments of notes
+    whose chunks all succeeded are merged, deduplicating nodes by primary key and
+    relationships by their ends, and imported in a single GraphImporter call together with
+    the gazetteer's City, Province and Season nodes; notes with a failed chunk are left for
+    the next run.
+
+    Returns:
+        List[str]: The IDs of the imported files.
+    """
+    jobs: List[ScheduledJob] = []
+    chunk_file: Dict[str, str] = {}
+    assets: Dict[str, Dict[str, Any]] = {}
+    places: Dict[str, PlaceHints] = {}
+    for file_id in file_ids:
+        content = get_file_content(file_id)
+        body, timestamp = split_datetime_marker(content)
+        assets[file_id] = _asset_node(file_id, body, timestamp)
+        places[file_id] = pre_extract(body, timestamp)
+        for chunk in split_note(content, args.chunk_tokens):
+            name = f"{file_id} chunk {chunk.index + 1}"
+            chunk_file[name] = file_id
+            jobs.append(
+                _chunk_job(mas, name, chunk, assets[file_id]["asset_name"], places[file_id])
+            )
+
+    print(f"Scheduling {len(jobs)} chunk jobs for {len(file_ids)} files...")
+    fragments: Dict[str, List[Dict[str, Any]]] = {file_id: [] for file_id in file_ids}
+    failed_files = set()
+
+    def _collect(outcome: JobOutcome) -> None:
+        file_id = chunk_file[outcome.job.name]
+        fragment = None
+        if outcome.status == "done":
+            fragment = parse_graph_fragment(_result_text(outcome.result))
+        if fragment is None:
+            print(f"{outcome.job.name}: no graph data ({outcome.status})")
+            failed_files.add(file_id)
+        else:
+            canonicalize_places(fragment)
+            fragments[file_id].append(link_scenes_to_season(fragment, places[file_id].season))
+
+    run_bounded(
+        jobs,
+        max_concurrency=args.concurrency,
+        job_timeout_seconds=args.job_timeout or None,
+        on_complete=_collect,
+    )
+
+    imported = [file_id for file_id in file_ids if file_id not in failed_files]
+    if not imported:
+        return []
+    merged = merge_graph_fragments(
+        [{"nodes": {"DigitalAsset": [assets[file_id] for file_id in imported]}}]
+        + [places[file_id].graph() for file_id in imported]
+        + [fragment for file_id in imported for fragment in fragments[file_id]]
+    )
+    result = asyncio.run(GraphImporter().import_graph(merged))
+    # The summary lines, without the per-node listing
+    print(result.split("\n\n", 1)[0])
+    if result.startswith("Error"):
+        return []
+    return imported
+
+
+def _import_note(file_id: str) -> DirectExtraction:
+    content = get_file_content(file_id)
+    body, timestamp = split_datetime_marker(content)
+    extraction = extract_note(
+        content, _asset_node(file_id, body, timestamp), places=pre_extract(body, timestamp)
+    )
+    if "ExperientialScene" not in extraction.graph["nodes"]:
+        # Leave the file unextracted rather than import its asset alone
+        raise RuntimeError(f"nothing extracted: {'; '.join(extraction.problems)}")
+    started_at = time.perf_counter()
+    result = asyncio.run(GraphImporter().import_graph(extraction.graph))
+    extraction.import_seconds = time.perf_counter() - started_at
+    if result.startswith("Error"):
+        raise RuntimeError(result.split("\n", 1)[0])
+    return extraction
+
+
+def extract_directly(file_ids: List[str], args: argparse.Namespace) -> Dict[str, DirectExtraction]:
+    """Extract every note with one LLM call and write its validated graph with GraphImporter.
+
+    Returns:
+        Dict[str, DirectExtraction]: The extraction of every imported file, by file ID.
+    """
+    extractions: Dict[str, DirectExtraction] = {}
+
+    def _collect(outcome: JobOutcome) -> None:
+        if outcome.status != "done":
+            print(f"{outcome.job.name}: {outcome.status} {outcome.error or ''}")
+            return
+        extraction: DirectExtraction = outcome.result
+        extractions[outcome.job.name] = extraction
+        print(
+            f"{outcome.job.name}: {outcome.seconds:.1f}s, "
+            f"{extraction.prompt_tokens}+{extraction.completion_tokens} tokens, "
+            f"{len(extraction.problems)} parts dropped by validation"
         )
 
-        # submit the job
-        jobs.append(mas.session().submit(hybrid_message))
+    jobs = [
+        ScheduledJob(name=file_id, run=lambda file_id=file_id: _import_note(file_id))
+        for file_id in file_ids
+    ]
+    run_bounded(
+        jobs,
+        max_concurrency=args.concurrency,
+        job_timeout_seconds=args.job_timeout or None,
+        node_counter=imported_node_count,
+        on_complete=_collect,
+    )
+    return extractions
 
-    print(f"Submitted {len(jobs)} batch jobs for processing...")
 
-    for i, job in enumerate(jobs):
-        print(f"Waiting for batch {i + 1}/{len(jobs)}...")
-        service_message = job.wait()
+def main(argv: Optional[List[str]] = None):
+    """Main function for batch processing travel data."""
+    parser = argparse.ArgumentParser(description="Extract travel notes into the memory graph.")
+    parser.add_argument("--folder", default=None, help="folder of *.txt notes")
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        help="estimated tokens of the files attached to one agent job",
+    )
+    parser.add_argument(
+        "--max-files", type=int, default=DEFAULT_MAX_FILES_PER_BATCH, help="files per agent job"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="agent jobs running at once",
+    )
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=DEFAULT_JOB_TIMEOUT_SECONDS,
+        help="seconds before a job is reported as stalled, 0 for no limit",
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="extract every file, not only new or changed ones"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--direct",
+        action="store_true",
+        help="extract each file with a single LLM call instead of the agent expert",
+    )
+    mode.add_argument(
+        "--chunked",
+        action="store_true",
+        help="extract paragraph chunks in parallel and import the merged graph once",
+    )
+    parser.add_argument(
+        "--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS, help="estimated tokens per chunk"
+    )
+    args = parser.parse_args(argv)
 
-        # print the result
-        if isinstance(service_message, TextMessage):
-            print(f"Batch {i + 1} Result:\n{service_message.get_payload()}")
-        elif isinstance(service_message, HybridMessage):
-            text_message = service_message.get_instruction_message()
-            print(f"Batch {i + 1} Result:\n{text_message.get_payload()}")
+    mas = get_agentic_service()
+
+    file_ids = load_data_v1(args.folder, incremental=not args.full)
+    if not file_ids:
+        print("Nothing new to extract.")
+        return
+
+    import_graph_schema()
 
+    if args.direct:
+        imported = list(extract_directly(file_ids, args))
+        mark_extracted(imported, args.folder)
+        print(f"{len(imported)}/{len(file_ids)} files imported")
+        return
+
+    if args.chunked:
+        imported = extract_in_chunks(mas, file_ids, args)
+        mark_extracted(imported, args.folder)
+        print(f"{len(imported)}/{len(file_ids)} files imported")
+        return
+
+    # Process files in batches
+    jobs: List[ScheduledJob] = []
+    # Size batches by estimated tokens, so that long notes don't overflow the context and
+    # short ones share a job
+    contents = {file_id: get_file_content(file_id) for file_id in file_ids}
+    tokens = {file_id: estimate_tokens(content) for file_id, content in contents.items()}
+    batches = plan_token_batches(list(tokens.items()), args.token_budget, args.max_files)
+    print(batch_size_report(batches, tokens, args.token_budget))
+
+    # Write the places the gazetteer recognises up front, so that every batch links its
+    # scenes to the same canonical City, Province and Season nodes
+    places = {
+        file_id: pre_extract(*split_datetime_marker(content))
+        for file_id, content in contents.items()
+    }
+    place_graph = PlaceHints.combine(places.values()).graph()
+    if place_graph["nodes"]:
+        print(asyncio.run(GraphImporter().import_graph(place_graph)).split("\n\n", 1)[0])
+
+    batch_file_ids: Dict[str, List[str]] = {}
+    for batch in batches:
+        name = f"batch {len(jobs) + 1}"
+        batch_file_ids[name] = batch
+        batch_places = PlaceHints.combine(places[file_id] for file_id in batch)
+        jobs.append(_batch_job(mas, name, batch, batch_places))
+
+    print(f"Scheduling {len(jobs)} batch jobs, {args.concurrency} at a time...")
+
+    def _print_outcome(outcome: JobOutcome) -> None:
+        if outcome.status == "done":
+            # Failed and stalled batches stay in the manifest as not extracted for the next run
+            mark_extracted(batch_file_ids[outcome.job.name], args.folder)
+            print(f"{outcome.job.name} Result ({outcome.seconds:.0f}s):")
+            print(_result_text(outcome.result))
+        elif outcome.status == "failed":
+            print(f"{outcome.job.name} failed after {outcome.seconds:.0f}s: {outcome.error}")
+        else:
+            print(f"{outcome.job.name} timed out after {outcome.seconds:.0f}s")
         print("-" * 80)
 
+    outcomes = run_bounded(
+        jobs,
+        max_concurrency=args.concurrency,
+        job_timeout_seconds=args.job_timeout or None,
+        node_counter=imported_node_count,
+        on_complete=_print_outcome,
+    )
+
+    unfinished = [outcome.job.name for outcome in outcomes if outcome.status != "done"]
+    if unfinished:
+        print(f"Not completed: {', '.join(unfinished)}")
+
 
 def process_single_memory(trip_data: dict, file_ids: List[str]) -> str:
     """Process a single memory for API usage."""
-    init_chat2graph()
-    mas = AgenticService.load("weaver.yml")
+    mas = get_agentic_service()
     import_graph_schema()
 
     result: str = ""
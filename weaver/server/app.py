@@ -6,7 +6,7 @@ from flask_cors import CORS
 from weaver.server.routes.chat_route import chat_bp
 from weaver.server.routes.file_route import file_bp
 from weaver.server.routes.memory_route import memory_bp
-from weaver.util.init_chat2graph import init_chat2graph
+from weaver.util.runtime import get_agentic_service
 
 
 def create_app() -> Flask:
@@ -42,8 +42,8 @@ def create_app() -> Flask:
     CORS(file_bp, resources=blueprint_resource_config)
     # --- END CORS MODIFICATION ---
 
-    # Initialize chat2graph
-    init_chat2graph()
+    # Initialize chat2graph and load weaver.yml once, before the first request
+    get_agentic_service()
 
     # Register blueprints
     app.register_blueprint(memory_bp, url_prefix="/api")
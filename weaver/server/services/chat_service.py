@@ -2,10 +2,10 @@ from typing import Any, Dict, List
 from uuid import uuid4
 
 from chat2graph.core.model.message import HybridMessage, TextMessage
-from chat2graph.core.sdk.agentic_service import AgenticService
 from chat2graph.core.sdk.wrapper.job_wrapper import JobWrapper
 
 from weaver.server.services.memory_service import MemoryService
+from weaver.util.runtime import get_agentic_service
 from weaver.weave_memory import meave_memory
 
 
@@ -13,7 +13,8 @@ class ChatService:
     """对话服务 - 对应HTML页面的各种对话功能"""
 
     def __init__(self):
-        self.mas = AgenticService.load("weaver.yml")
+        # 复用进程内共享的 AgenticService，避免每次请求重新解析 weaver.yml
+        self.mas = get_agentic_service()
         self.job_dict: Dict[str, JobWrapper] = {}
         self.memory_service = MemoryService()
 
@@ -2,9 +2,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from chat2graph.core.sdk.agentic_service import AgenticService
-
 from weaver.build_memory import process_single_memory
+from weaver.util.runtime import get_agentic_service
 from weaver.util.schema import import_graph_schema
 
 
@@ -12,7 +11,8 @@ class MemoryService:
     """记忆处理服务 - 对应HTML页面的各种记忆功能"""
 
     def __init__(self):
-        self.mas = AgenticService.load("weaver.yml")
+        # 复用进程内共享的 AgenticService，避免每次请求重新解析 weaver.yml
+        self.mas = get_agentic_service()
 
         # 内存存储 (生产环境应使用数据库)
         self._memories: Dict[str, Dict[str, Any]] = {}
@@ -1,12 +1,88 @@
+import asyncio
+import base64
+from contextlib import nullcontext
+import hashlib
 import json
+import os
+import threading
+import time
 import traceback  # Added for error reporting
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from chat2graph.core.service.graph_db_service import GraphDbService  # Added import
 from chat2graph.core.toolkit.tool import Tool
+from neo4j import Query, unit_of_work
 from neo4j.graph import Node, Path, Relationship  # For result processing
 
+from weaver.util.cache import LRUCache
+from weaver.util.cypher import (
+    PlanBudget,
+    QueryNormalizer,
+    bound_variable_length_patterns,
+    find_plan_problems,
+    is_read_only_query,
+    is_schema_or_admin_command,
+    skip_rows_on_server,
+    strip_explain_or_profile,
+)
+from weaver.util.graph_version import bump_graph_version, get_graph_version
+from weaver.util.query_log import log_query, should_profile
+from weaver.util.serialization import dumps, serialize_record
+
+# Per-call bounds on what a query may pull into memory and into the model context
+MAX_RESULT_ROWS = 200
+MAX_RESULT_BYTES = 64 * 1024
+
+# Server-side transaction timeout for every query
+QUERY_TIMEOUT_SECONDS = 30.0
+
+# Upper bound given to unbounded variable-length patterns such as [*]
+MAX_VAR_LENGTH_HOPS = 6
+
+# Parameter of the SKIP that continues a truncated read on the server
+SKIP_ROWS_PARAMETER = "continuation_skip"
+
+# Shared by all executors so that repeated query shapes are counted across agents
+_query_normalizer = QueryNormalizer()
+
+# A batch call may hold at most this many queries; they share the output budget evenly,
+# but every query gets at least MIN_BATCH_QUERY_BYTES
+MAX_BATCH_QUERIES = 10
+MIN_BATCH_QUERY_BYTES = 2 * 1024
+
+# (key, cypher_query, parameters) of a query in a batch
+_BatchJob = Tuple[str, str, Optional[Dict[str, Any]]]
+
+# Opt-in cache of read query results shared by all executors, bounded by the total size of
+# the cached outputs in bytes (e.g. 33554432); unset or 0 leaves it disabled
+RESULT_CACHE_BYTES_ENV = "WEAVER_CYPHER_RESULT_CACHE_BYTES"
+RESULT_CACHE_MAX_ENTRIES = 4096
+_result_cache: Optional[LRUCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def query_shape_stats() -> Dict[str, Any]:
+    """Return how often parameterized query shapes repeated, i.e. could reuse a cached plan."""
+    return _query_normalizer.stats()
+
+
+def _shared_result_cache() -> Optional[LRUCache]:
+    """Return the process-wide read result cache, or None if it is not enabled."""
+    global _result_cache
+    max_bytes = int(os.environ.get(RESULT_CACHE_BYTES_ENV) or 0)
+    if max_bytes <= 0:
+        return None
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = LRUCache(max_size=RESULT_CACHE_MAX_ENTRIES, max_bytes=max_bytes)
+        return _result_cache
+
+
+def result_cache_stats() -> Dict[str, Any]:
+    """Return the read result cache statistics, empty if the cache is not enabled."""
+    return _result_cache.stats() if _result_cache is not None else {}
+
 
 def serialize_neo4j_value(value: Any) -> Any:
     """Recursively serialize Neo4j specific types to JSON-compatible format."""
@@ -32,42 +108,233 @@ def serialize_neo4j_value(value: Any) -> Any:
     return value
 
 
+def _query_digest(cypher_query: str) -> str:
+    # Whitespace-insensitive, so a token also fits a cached result of a reformatted query
+    normalized = " ".join(cypher_query.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_continuation_token(cypher_query: str, offset: int) -> str:
+    """Encode the position after the last returned row of a truncated query result."""
+    payload = json.dumps({"query": _query_digest(cypher_query), "offset": offset})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_continuation_token(cypher_query: str, continuation_token: str) -> int:
+    """Decode a continuation token into the number of rows to skip.
+
+    Raises:
+        ValueError: If the token is malformed or was issued for a different query.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(continuation_token.encode("ascii")))
+        offset = int(payload["offset"])
+        digest = payload["query"]
+    except Exception as e:
+        raise ValueError(f"Malformed continuation token: {continuation_token}") from e
+    if digest != _query_digest(cypher_query) or offset < 0:
+        raise ValueError("The continuation token was issued for a different query.")
+    return offset
+
+
 class CypherExecutor(Tool):
     """Tool for executing Cypher queries against the graph database."""
 
-    def __init__(self, id: Optional[str] = None):
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        max_rows: int = MAX_RESULT_ROWS,
+        max_bytes: int = MAX_RESULT_BYTES,
+        timeout_seconds: float = QUERY_TIMEOUT_SECONDS,
+        plan_budget: Optional[PlanBudget] = None,
+        result_cache: Optional[LRUCache] = None,
+    ):
         super().__init__(
             id=id or str(uuid4()),
             name=self.execute_cypher_query.__name__,
             description=self.execute_cypher_query.__doc__ or "",
             function=self.execute_cypher_query,
         )
+        self._configure(max_rows, max_bytes, timeout_seconds, plan_budget, result_cache)
+
+    def _configure(
+        self,
+        max_rows: int,
+        max_bytes: int,
+        timeout_seconds: float,
+        plan_budget: Optional[PlanBudget],
+        result_cache: Optional[LRUCache],
+    ) -> None:
         self._graph_db_service = GraphDbService()  # Initialize service
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._timeout_seconds = timeout_seconds
+        self._plan_budget = plan_budget or PlanBudget()
+        # Read results are cached only when enabled through the environment or passed in
+        self._result_cache = result_cache if result_cache is not None else _shared_result_cache()
 
-    async def execute_cypher_query(self, cypher_query: str) -> str:
+    async def execute_cypher_query(
+        self,
+        cypher_query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        continuation_token: Optional[str] = None,
+    ) -> str:
         """Executes a given Cypher query against the graph database and returns the results. The version of the
         Neo4j driver used is 5.0.0 +.
 
+        Read-only queries run in a read transaction. Every query except schema commands is
+        checked against its estimated plan first; a query whose plan is too expensive
+        (cartesian products, scans over all nodes, huge row estimates) is rejected with
+        advice on how to rewrite it. Unbounded variable-length patterns such as [*] are
+        limited to a few hops. String and number literals are sent as parameters. Every
+        query has a timeout.
+
+        Results are streamed and capped in rows and size, and `embed` vectors are always left
+        out. If the output says it was truncated, either narrow the query (add LIMIT, return
+        only the properties you need) or call again with the same query and the returned
+        continuation_token to get the next rows. Continuing runs the query again and skips the
+        rows already returned, so a narrower query is usually cheaper.
+
         Args:
             cypher_query (str): The Cypher statement to execute.
+            parameters (Optional[Dict[str, Any]]): Values for $name placeholders in the query.
+                Default: None
+            continuation_token (Optional[str]): Token from a truncated result of the same query,
+                to continue after the rows already returned. Default: None
 
         Returns:
             str: A string representation (json) of the query results, or an error/success message.
         """
+        return self._execute(cypher_query, parameters, continuation_token)
+
+    def _execute(
+        self,
+        cypher_query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        continuation_token: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        session: Optional[Any] = None,
+    ) -> str:
+        """Run one query and render its output, reusing the given session if there is one."""
+        max_bytes = max_bytes or self._max_bytes
+        started_at = time.perf_counter()
+        logged_query = cypher_query
         try:
-            graph_db = self._graph_db_service.get_default_graph_db()
-            # Assuming graph_db.conn is a Neo4j Driver instance
-            with graph_db.conn.session() as session:
-                result = session.run(cypher_query)
-                records = [record.data() for record in result]  # Get data from records
+            skip_rows = (
+                decode_continuation_token(cypher_query, continuation_token)
+                if continuation_token
+                else 0
+            )
+
+            read_only = is_read_only_query(cypher_query)
+            if skip_rows and not read_only:
+                # Continuing would run the write a second time
+                return (
+                    "Continuation tokens only apply to read-only queries; the write was not "
+                    f"run again.\nQuery: {cypher_query}\n"
+                )
 
-                # Serialize Neo4j specific types in records for JSON compatibility
-                serialized_records = [serialize_neo4j_value(record) for record in records]
+            notes: List[str] = []
+            if read_only:
+                bounded_query, notes = bound_variable_length_patterns(
+                    cypher_query, MAX_VAR_LENGTH_HOPS
+                )
+                query_to_run, literal_parameters = _query_normalizer.normalize(bounded_query)
+            else:
+                query_to_run, literal_parameters = _query_normalizer.normalize(cypher_query)
+            query_parameters = {**literal_parameters, **(parameters or {})}
+            # Rows already returned are skipped by the query where it allows a SKIP, so
+            # that they are not streamed again; otherwise they are read and dropped here
+            stream_skip_rows = skip_rows
+            if skip_rows:
+                skipping_query = skip_rows_on_server(query_to_run, SKIP_ROWS_PARAMETER)
+                if skipping_query is not None:
+                    query_to_run = skipping_query
+                    query_parameters[SKIP_ROWS_PARAMETER] = skip_rows
+                    stream_skip_rows = 0
+            logged_query = query_to_run
 
-            if not serialized_records:
-                return f"Cypher query executed successfully. No data returned.\nQuery: {cypher_query}\n"
-            return json.dumps(serialized_records, indent=2, ensure_ascii=False)
+            cache_key = None
+            graph_version = get_graph_version()
+            if read_only and self._result_cache is not None:
+                cache_key = (
+                    query_to_run,
+                    json.dumps(query_parameters, sort_keys=True, ensure_ascii=False, default=str),
+                    skip_rows,
+                    self._max_rows,
+                    max_bytes,
+                )
+                cached_output = self._result_cache.get(cache_key, version=graph_version)
+                if cached_output is not None:
+                    return cached_output
+
+            if session is None:
+                graph_db = self._graph_db_service.get_default_graph_db()
+                # Assuming graph_db.conn is a Neo4j Driver instance
+                session_scope = graph_db.conn.session()
+            else:
+                session_scope = nullcontext(session)
+            started_at = time.perf_counter()
+            with session_scope as active_session:
+                if read_only:
+                    read_work = unit_of_work(timeout=self._timeout_seconds)(self._run_read)
+                    problems, serialized_records, truncation_reason, summary = (
+                        active_session.execute_read(
+                            read_work,
+                            query_to_run,
+                            query_parameters,
+                            stream_skip_rows,
+                            max_bytes,
+                            should_profile(),
+                        )
+                    )
+                else:
+                    # Writes are checked too: MATCH (a), (b) CREATE ... is a cartesian product
+                    problems = (
+                        []
+                        if is_schema_or_admin_command(query_to_run)
+                        else self._plan_problems(active_session, query_to_run, query_parameters)
+                    )
+                    if not problems:
+                        result = active_session.run(
+                            Query(query_to_run, timeout=self._timeout_seconds), query_parameters
+                        )
+                        serialized_records, truncation_reason = self._collect_records(
+                            result, skip_rows, max_bytes
+                        )
+                        summary = result.consume()
+                        bump_graph_version()
+                if problems:
+                    log_query(
+                        type(self).__name__,
+                        query_to_run,
+                        started_at,
+                        error="rejected by the plan-cost guard",
+                    )
+                    return self._format_rejection(cypher_query, problems)
+            log_query(
+                type(self).__name__,
+                query_to_run,
+                started_at,
+                rows=len(serialized_records),
+                summary=summary,
+            )
+
+            output = self._format_output(
+                cypher_query, serialized_records, truncation_reason, notes, read_only, skip_rows
+            )
+            if cache_key is not None:
+                self._result_cache.put(cache_key, output, version=graph_version)
+            return output
         except Exception as e:
+            log_query(type(self).__name__, logged_query, started_at, error=str(e))
+            if "TransactionTimedOut" in str(getattr(e, "code", "")):
+                return (
+                    f"Cypher query timed out after {self._timeout_seconds} seconds and was "
+                    "aborted. Narrow the MATCH with labels and WHERE conditions, shorten "
+                    "variable-length patterns or add LIMIT, then try again.\n"
+                    f"Query: {cypher_query}\n"
+                )
             tb_str = traceback.format_exc()
             error_message = (
                 f"Error executing Cypher query: {str(e)}\n"
@@ -76,3 +343,227 @@ class CypherExecutor(Tool):
             )
             print(error_message)  # Log for server-side debugging
             return error_message
+
+    def _format_output(
+        self,
+        cypher_query: str,
+        serialized_records: List[Dict[str, Any]],
+        truncation_reason: str,
+        notes: List[str],
+        read_only: bool,
+        skip_rows: int,
+    ) -> str:
+        """Render the records, with truncation details and notes when there are any."""
+        if truncation_reason:
+            next_offset = skip_rows + len(serialized_records)
+            truncated_output: Dict[str, Any] = {
+                "records": serialized_records,
+                "truncated": True,
+                "reason": truncation_reason,
+                "notes": notes,
+            }
+            if read_only:
+                truncated_output["continuation_token"] = encode_continuation_token(
+                    cypher_query, next_offset
+                )
+                truncated_output["hint"] = (
+                    "More rows are available. Narrow the query (LIMIT, fewer returned "
+                    "properties) or call again with the same query and this "
+                    "continuation_token."
+                )
+            return dumps(truncated_output)
+        if not serialized_records:
+            return (
+                "Cypher query executed successfully. No data returned.\n"
+                f"Query: {cypher_query}\n" + "".join(f"Note: {note}\n" for note in notes)
+            )
+        if notes:
+            return dumps({"records": serialized_records, "truncated": False, "notes": notes})
+        return dumps(serialized_records)
+
+    def _run_read(
+        self,
+        tx: Any,
+        cypher_query: str,
+        parameters: Dict[str, Any],
+        skip_rows: int,
+        max_bytes: int,
+        profile: bool = False,
+    ) -> "tuple[List[str], List[Dict[str, Any]], str, Any]":
+        """Check the estimated plan of a read query, then stream its records.
+
+        With profile set, the query runs under PROFILE so that its summary carries db hits.
+
+        Returns:
+            The plan problems (the query is not run if there are any), the serialized records,
+            the truncation reason and the result summary.
+        """
+        problems = self._plan_problems(tx, cypher_query, parameters)
+        if problems:
+            return problems, [], "", None
+
+        prefix, _ = strip_explain_or_profile(cypher_query)
+        if profile and not prefix:
+            cypher_query = f"PROFILE {cypher_query}"
+        result = tx.run(cypher_query, parameters)
+        records, truncation_reason = self._collect_records(result, skip_rows, max_bytes)
+        return [], records, truncation_reason, result.consume()
+
+    def _plan_problems(
+        self, runner: Any, cypher_query: str, parameters: Dict[str, Any]
+    ) -> List[str]:
+        """EXPLAIN a query in a session or transaction and check the plan against the budget."""
+        prefix, body = strip_explain_or_profile(cypher_query)
+        if prefix == "EXPLAIN":
+            return []
+        plan = runner.run(f"EXPLAIN {body}", parameters).consume().plan
+        return find_plan_problems(plan or {}, self._plan_budget)
+
+    def _format_rejection(self, cypher_query: str, problems: List[str]) -> str:
+        """Explain to the agent why a query was not run and how to fix it."""
+        return (
+            "Cypher query rejected before execution because its estimated plan exceeds the "
+            "query budget. Rewrite the query and try again:\n"
+            + "".join(f"- {problem}\n" for problem in problems)
+            + f"Query: {cypher_query}\n"
+        )
+
+    def _collect_records(
+        self, result: Any, skip_rows: int, max_bytes: int
+    ) -> "tuple[List[Dict[str, Any]], str]":
+        """Stream records from the cursor until the row cap or the byte budget is reached.
+
+        Returns:
+            The serialized records, and the reason the result was truncated ("" if complete).
+        """
+        records: List[Dict[str, Any]] = []
+        used_bytes = 0
+        for row_index, record in enumerate(result):
+            if row_index < skip_rows:
+                continue
+            if len(records) >= self._max_rows:
+                return records, f"row cap of {self._max_rows} rows reached"
+
+            # Serialize Neo4j specific types in records for JSON compatibility
+            serialized = serialize_record(record.data())
+            record_bytes = len(dumps(serialized))
+            # Always return at least one row so that continuation makes progress
+            if records and used_bytes + record_bytes > max_bytes:
+                return records, f"output budget of {max_bytes} bytes reached"
+
+            records.append(serialized)
+            used_bytes += record_bytes
+        return records, ""
+
+
+class CypherBatchExecutor(CypherExecutor):
+    """Tool for executing several Cypher queries in a single tool call."""
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        max_rows: int = MAX_RESULT_ROWS,
+        max_bytes: int = MAX_RESULT_BYTES,
+        timeout_seconds: float = QUERY_TIMEOUT_SECONDS,
+        plan_budget: Optional[PlanBudget] = None,
+        result_cache: Optional[LRUCache] = None,
+    ):
+        Tool.__init__(
+            self,
+            id=id or str(uuid4()),
+            name=self.execute_cypher_batch.__name__,
+            description=self.execute_cypher_batch.__doc__ or "",
+            function=self.execute_cypher_batch,
+        )
+        self._configure(max_rows, max_bytes, timeout_seconds, plan_budget, result_cache)
+
+    async def execute_cypher_batch(self, queries: List[Dict[str, Any]]) -> str:
+        """Executes several Cypher queries in one call and returns their results by key.
+
+        Prefer it over several execute_cypher_query calls when a few lookups are needed at
+        once, e.g. the scenes of a city, their observations and their emotions. Read-only
+        queries run concurrently. A write query runs on its own, in list order, so queries
+        listed after it see its changes. The results share one output budget, split evenly
+        between the queries; each result has the same format as execute_cypher_query.
+
+        Args:
+            queries (List[Dict[str, Any]]): At most 10 queries, each an object with
+                "cypher_query" (str), optional "parameters" (object with the values for
+                $name placeholders) and optional "key" (str naming the result, defaults to
+                the position of the query in the list).
+
+        Returns:
+            str: A JSON object mapping every key to its result, or an error message.
+        """
+        try:
+            if not queries:
+                return "No queries given. Pass a list of objects with a cypher_query field."
+            if len(queries) > MAX_BATCH_QUERIES:
+                return (
+                    f"Too many queries in one batch: {len(queries)}, at most {MAX_BATCH_QUERIES} "
+                    "are allowed. Split them over several calls."
+                )
+
+            jobs: List[_BatchJob] = []
+            for index, item in enumerate(queries):
+                if isinstance(item, str):
+                    item = {"cypher_query": item}
+                if not isinstance(item, dict) or not item.get("cypher_query"):
+                    return f"Query {index} in the batch has no cypher_query: {item}"
+                key = str(item.get("key", index))
+                if any(key == job_key for job_key, _, _ in jobs):
+                    return f"Duplicate key in the batch: {key}. Give every query its own key."
+                jobs.append((key, item["cypher_query"], item.get("parameters") or None))
+
+            max_bytes = max(self._max_bytes // len(jobs), MIN_BATCH_QUERY_BYTES)
+            results: Dict[str, str] = {}
+            pending_reads: List[_BatchJob] = []
+
+            graph_db = self._graph_db_service.get_default_graph_db()
+            with graph_db.conn.session() as session:
+                for job in jobs:
+                    if is_read_only_query(job[1]):
+                        pending_reads.append(job)
+                        continue
+                    # Reads listed before a write finish before it starts
+                    await self._run_reads(pending_reads, max_bytes, results)
+                    pending_reads = []
+                    key, cypher_query, parameters = job
+                    results[key] = self._execute(
+                        cypher_query, parameters, max_bytes=max_bytes, session=session
+                    )
+                await self._run_reads(pending_reads, max_bytes, results)
+
+            return dumps({key: self._parse_output(results[key]) for key, _, _ in jobs})
+        except Exception as e:
+            tb_str = traceback.format_exc()
+            error_message = (
+                f"Error executing Cypher batch: {str(e)}\nQueries: {queries}\nTraceback:\n{tb_str}"
+            )
+            print(error_message)  # Log for server-side debugging
+            return error_message
+
+    async def _run_reads(
+        self,
+        reads: List[_BatchJob],
+        max_bytes: int,
+        results: Dict[str, str],
+    ) -> None:
+        """Run read queries concurrently, each in its own session from the driver pool."""
+        outputs = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._execute, cypher_query, parameters, None, max_bytes)
+                for _, cypher_query, parameters in reads
+            )
+        )
+        for (key, _, _), output in zip(reads, outputs, strict=True):
+            results[key] = output
+
+    def _parse_output(self, output: str) -> Any:
+        """Embed JSON results as JSON and keep messages as text."""
+        if output.startswith(("[", "{")):
+            try:
+                return json.loads(output)
+            except json.JSONDecodeError:
+                pass
+        return output
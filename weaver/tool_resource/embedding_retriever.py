@@ -1,5 +1,9 @@
+import asyncio
+from dataclasses import astuple, dataclass
 import json
-from typing import Any, Dict, List, Optional
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from chat2graph.core.dal.dao.dao_factory import DaoFactory
@@ -8,7 +12,194 @@ from chat2graph.core.service.graph_db_service import GraphDbService
 from chat2graph.core.service.service_factory import ServiceFactory
 from chat2graph.core.toolkit.tool import Tool
 
-from weaver.util.embedding import get_embed_vec
+from weaver.util.cache import LRUCache
+from weaver.util.cypher import timestamp_bounds, timestamp_range_predicate
+from weaver.util.embedding import get_embed_vec, get_embed_vecs
+from weaver.util.graph_version import get_graph_version
+from weaver.util.query_log import log_query
+from weaver.util.ranking import maximal_marginal_relevance, reciprocal_rank_fusion
+from weaver.util.schema import (
+    FULLTEXT_INDEX_NAME,
+    get_node_labels_with_property,
+    get_primary_key,
+)
+
+RETRIEVAL_CACHE_MAX_SIZE = 256
+RETRIEVAL_CACHE_TTL_SECONDS = 600.0
+
+# Filtered searches over-fetch candidates from the index and grow the candidate pool
+# by this factor until enough matches are found or the cap is reached
+FILTER_OVERFETCH_FACTOR = 4
+FILTER_MAX_CANDIDATES = 256
+
+# Diversity re-ranking picks top_k nodes out of top_k * MMR_CANDIDATE_FACTOR candidates
+MMR_CANDIDATE_FACTOR = 3
+
+# Labels that reach an ExperientialScene (and through it a city, season or asset) in at most
+# two OBSERVED_IN / OCCURRED_DURING / TRIGGERED_BY hops
+_SCENE_LINKED_LABELS = [
+    "ExperientialScene",
+    "FocalObservation",
+    "InteractionPoint",
+    "AffectiveResonance",
+]
+_TO_SCENE_PATH = (
+    "(node)-[:OBSERVED_IN|OCCURRED_DURING|TRIGGERED_BY*0..2]->(scene:ExperientialScene)"
+)
+_TO_ASSET_PATH = (
+    "(node)-[:OBSERVED_IN|OCCURRED_DURING|TRIGGERED_BY*0..2]->()"
+    "-[:CONSTRUCTED_FROM_ASSET|IDENTIFIED_IN_ASSET|EXTRACTED_FROM_ASSET|DOCUMENTED_BY_ASSET]->"
+    "(asset:DigitalAsset)"
+)
+
+# Shared by all retriever instances, since the experts each get their own tool instance
+_retrieval_cache = LRUCache(
+    max_size=RETRIEVAL_CACHE_MAX_SIZE, ttl_seconds=RETRIEVAL_CACHE_TTL_SECONDS
+)
+
+
+@dataclass(frozen=True)
+class RetrievalFilters:
+    """Structured filters applied to the retrieved nodes.
+
+    Attributes:
+        node_label: Only return nodes with this label.
+        city: City the node's scene is LOCATED_IN_CITY, by city_name or Chinese name.
+        season: Season the node's scene OCCURRED_IN_SEASON, by season_name or Chinese name.
+        start_time: Inclusive lower bound of the node timestamp, an ISO 8601 prefix.
+        end_time: Inclusive upper bound of the node timestamp, an ISO 8601 prefix.
+        asset: DigitalAsset the node was derived from, by asset_name or file_id.
+    """
+
+    node_label: Optional[str] = None
+    city: Optional[str] = None
+    season: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    asset: Optional[str] = None
+
+    def has_graph_filters(self) -> bool:
+        """Whether any filter beyond the label must be checked against the graph."""
+        return any((self.city, self.season, self.start_time, self.end_time, self.asset))
+
+    def candidate_labels(self) -> List[str]:
+        """Labels that can satisfy the filters; their vector indexes are the only ones searched."""
+        labels = get_node_labels_with_property("embed")
+        if self.node_label:
+            labels = [label for label in labels if label == self.node_label]
+        if self.city or self.season or self.asset:
+            labels = [label for label in labels if label in _SCENE_LINKED_LABELS]
+        if self.start_time or self.end_time:
+            timestamped_labels = get_node_labels_with_property("timestamp")
+            labels = [label for label in labels if label in timestamped_labels]
+        return labels
+
+    def to_cypher(self) -> Tuple[str, Dict[str, Any]]:
+        """Build a Cypher predicate on the variable `node` and its parameters ("true" if empty)."""
+        conditions: List[str] = []
+        params: Dict[str, Any] = {}
+
+        if self.node_label:
+            conditions.append("$filter_label IN labels(node)")
+            params["filter_label"] = self.node_label
+        if self.city:
+            conditions.append(
+                f"EXISTS {{ MATCH {_TO_SCENE_PATH}-[:LOCATED_IN_CITY]->(city:City) "
+                "WHERE toLower(city.city_name) = toLower($filter_city) "
+                "OR city.chinese_name STARTS WITH $filter_city }"
+            )
+            params["filter_city"] = self.city
+        if self.season:
+            conditions.append(
+                f"EXISTS {{ MATCH {_TO_SCENE_PATH}-[:OCCURRED_IN_SEASON]->(season:Season) "
+                "WHERE toLower(season.season_name) = toLower($filter_season) "
+                "OR season.chinese_name STARTS WITH $filter_season }"
+            )
+            params["filter_season"] = self.season
+        lower, upper = timestamp_bounds(self.start_time, self.end_time)
+        if lower or upper:
+            conditions.append(
+                timestamp_range_predicate(
+                    "node", "filter_start" if lower else None, "filter_end" if upper else None
+                )
+            )
+            params.update(
+                {
+                    name: bound
+                    for name, bound in (("filter_start", lower), ("filter_end", upper))
+                    if bound
+                }
+            )
+        if self.asset:
+            conditions.append(
+                f"EXISTS {{ MATCH {_TO_ASSET_PATH} "
+                "WHERE asset.asset_name = $filter_asset OR asset.file_id = $filter_asset }"
+            )
+            params["filter_asset"] = self.asset
+
+        return (" AND ".join(conditions) if conditions else "true"), params
+
+
+def _normalize_query_text(text: str) -> str:
+    """Normalize query text so trivially different spellings share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def _node_identity(node_data: Dict[str, Any]) -> Any:
+    """Identify a retrieved node by its label and primary key value."""
+    node_type = node_data["node_type"]
+    properties = node_data["properties"]
+    primary_value = properties.get(get_primary_key(node_type))
+    if primary_value is None:
+        return (node_type, json.dumps(properties, sort_keys=True, default=str))
+    return (node_type, primary_value)
+
+
+def _escape_lucene(text: str) -> str:
+    """Escape Lucene query syntax so free text can be passed to a full-text index."""
+    return re.sub(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)', r"\\\1", text)
+
+
+def _fuse_rankings(
+    vector_nodes: List[Dict[str, Any]], text_nodes: List[Dict[str, Any]], top_k: int
+) -> List[Dict[str, Any]]:
+    """Merge vector and full-text hits with reciprocal rank fusion, keeping both raw scores."""
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for node_data in vector_nodes + text_nodes:
+        merged.setdefault(_node_identity(node_data), {}).update(node_data)
+
+    fused = reciprocal_rank_fusion(
+        [
+            [_node_identity(node_data) for node_data in vector_nodes],
+            [_node_identity(node_data) for node_data in text_nodes],
+        ]
+    )
+    return [{**merged[key], "fusion_score": score} for key, score in fused[:top_k]]
+
+
+def _diversify(
+    nodes: List[Dict[str, Any]], query_vector: List[float], top_k: int, diversity_lambda: float
+) -> List[Dict[str, Any]]:
+    """Re-rank candidates with maximal marginal relevance over their fetched embeddings.
+
+    Candidates without a comparable embedding keep their relative order after the
+    re-ranked ones.
+    """
+    with_vectors: List[Dict[str, Any]] = []
+    without_vectors: List[Dict[str, Any]] = []
+    for node_data in nodes:
+        embedding = node_data.get("_embedding")
+        if embedding and len(embedding) == len(query_vector):
+            with_vectors.append(node_data)
+        else:
+            without_vectors.append(node_data)
+    selected = maximal_marginal_relevance(
+        query_vector,
+        [node_data["_embedding"] for node_data in with_vectors],
+        top_k,
+        diversity_lambda,
+    )
+    return ([with_vectors[i] for i in selected] + without_vectors)[:top_k]
 
 
 class EmbeddingRetriever(Tool):
@@ -24,119 +215,497 @@ class EmbeddingRetriever(Tool):
         self._graph_db_service = GraphDbService()
 
     async def find_similar_nodes(
-        self, text_content: str, top_k: int = 5, similarity_threshold: float = 0.7
+        self,
+        text_content: str,
+        top_k: int = 5,
+        similarity_threshold: float = 0.7,
+        node_label: Optional[str] = None,
+        city: Optional[str] = None,
+        season: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        asset: Optional[str] = None,
+        use_fulltext: bool = True,
+        diversity_lambda: Optional[float] = None,
     ) -> str:
         """Computes embedding for text and finds similar nodes in the graph database using vector similarity.
 
+        The vector search runs concurrently with a full-text search over the nodes' text
+        properties, and both rankings are merged with reciprocal rank fusion, so exact names
+        such as '雷峰塔' are found even when their embeddings match poorly. Results are cached
+        until the graph is modified, so repeating a lookup is cheap.
+
         Args:
             text_content (str): The text content to embed and search for similar nodes.
                                Example: '京都的岚山竹林'
             top_k (int): Number of top similar nodes to return. Default: 5
             similarity_threshold (float): Minimum similarity score (0-1). Default: 0.7
+            node_label (Optional[str]): Only search nodes with this label,
+                               e.g. 'ExperientialScene'. Default: None (all labels)
+            city (Optional[str]): Only nodes whose scene is located in this city,
+                               e.g. 'hangzhou' or '杭州'. Default: None
+            season (Optional[str]): Only nodes whose scene occurred in this season,
+                               e.g. 'autumn' or '秋'. Default: None
+            start_time (Optional[str]): Only nodes with a timestamp at or after this ISO 8601
+                               date or prefix, e.g. '2023-11'. Default: None
+            end_time (Optional[str]): Only nodes with a timestamp at or before this ISO 8601
+                               date or prefix, e.g. '2023-11-30'. Default: None
+            asset (Optional[str]): Only nodes derived from this DigitalAsset,
+                               by asset_name or file_id. Default: None
+            use_fulltext (bool): Also run the full-text search and fuse the rankings. Default: True
+            diversity_lambda (Optional[float]): Re-rank with maximal marginal relevance to skip
+                               near-duplicate nodes; 1.0 keeps pure relevance, lower values favor
+                               diversity, e.g. 0.5. Default: None (no re-ranking)
 
         Returns:
             str: JSON string containing similar nodes and their connections,
                  or an error message if computation/search fails.
         """
+        filters = RetrievalFilters(node_label, city, season, start_time, end_time, asset)
+        cache_key = (
+            _normalize_query_text(text_content),
+            top_k,
+            similarity_threshold,
+            astuple(filters),
+            use_fulltext,
+            diversity_lambda,
+        )
+        graph_version = get_graph_version()
+        cached_result = _retrieval_cache.get(cache_key, version=graph_version)
+        if cached_result is not None:
+            return cached_result
+
         try:
             # Step 1: Compute embedding for input text
             embedding_vector = get_embed_vec(text_content)
 
-            if embedding_vector is None:
+            # Without an embedding, the full-text search alone can still answer
+            if embedding_vector is None and not use_fulltext:
                 return f"Failed to compute embedding for text: {text_content}"
 
-            # Step 2: Perform vector similarity search in Neo4j
-            similar_nodes = await self._search_similar_nodes(
-                embedding_vector, top_k, similarity_threshold
+            # Step 2: Perform vector (and full-text) similarity search in Neo4j
+            similar_nodes = await self._hybrid_search(
+                text_content,
+                embedding_vector,
+                top_k,
+                similarity_threshold,
+                filters,
+                use_fulltext,
+                diversity_lambda,
             )
 
             if not similar_nodes:
-                return f"No similar nodes found for text: '{text_content}' with threshold {similarity_threshold}"
+                no_result = (
+                    f"No similar nodes found for text: '{text_content}' "
+                    f"with threshold {similarity_threshold}"
+                )
+                _retrieval_cache.put(cache_key, no_result, version=graph_version)
+                return no_result
 
             # Step 3: Get graph structure around similar nodes
             graph_data = await self._get_graph_around_nodes(similar_nodes)
 
             result = {
                 "query_text": text_content,
-                "query_embedding_dimension": len(embedding_vector),
+                "query_embedding_dimension": len(embedding_vector) if embedding_vector else 0,
                 "similar_nodes": similar_nodes,
                 "graph_structure": graph_data,
-                "search_params": {"top_k": top_k, "similarity_threshold": similarity_threshold},
+                "search_params": {
+                    "top_k": top_k,
+                    "similarity_threshold": similarity_threshold,
+                    "filters": {
+                        key: value for key, value in vars(filters).items() if value is not None
+                    },
+                    "use_fulltext": use_fulltext,
+                    "diversity_lambda": diversity_lambda,
+                },
             }
 
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            result_str = json.dumps(result, ensure_ascii=False, indent=2)
+            _retrieval_cache.put(cache_key, result_str, version=graph_version)
+            return result_str
 
         except Exception as e:
             error_message = f"Error finding similar nodes for text '{text_content}': {str(e)}"
             print(error_message)
             return error_message
 
-    async def _search_similar_nodes(
-        self, embedding_vector: List[float], top_k: int, similarity_threshold: float
+    async def find_similar_nodes_batch(
+        self,
+        texts: List[str],
+        top_k: int = 5,
+        similarity_threshold: float = 0.7,
+        node_label: Optional[str] = None,
+        city: Optional[str] = None,
+        season: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        asset: Optional[str] = None,
+        use_fulltext: bool = True,
+        diversity_lambda: Optional[float] = None,
+    ) -> str:
+        """Finds similar nodes for several texts in one call, e.g. scenes, emotions and cities.
+
+        All texts are embedded in a single request and searched concurrently. The graph
+        structure around the union of all hits is expanded once and shared by the groups.
+
+        Args:
+            texts (List[str]): The text contents to search for.
+                               Example: ['西湖断桥', '雷峰塔夕照', '宁静']
+            top_k (int): Number of top similar nodes to return per text. Default: 5
+            similarity_threshold (float): Minimum similarity score (0-1). Default: 0.7
+            node_label (Optional[str]): Only search nodes with this label,
+                               e.g. 'ExperientialScene'. Default: None (all labels)
+            city (Optional[str]): Only nodes whose scene is located in this city,
+                               e.g. 'hangzhou' or '杭州'. Default: None
+            season (Optional[str]): Only nodes whose scene occurred in this season,
+                               e.g. 'autumn' or '秋'. Default: None
+            start_time (Optional[str]): Only nodes with a timestamp at or after this ISO 8601
+                               date or prefix, e.g. '2023-11'. Default: None
+            end_time (Optional[str]): Only nodes with a timestamp at or before this ISO 8601
+                               date or prefix, e.g. '2023-11-30'. Default: None
+            asset (Optional[str]): Only nodes derived from this DigitalAsset,
+                               by asset_name or file_id. Default: None
+            use_fulltext (bool): Also run full-text searches and fuse the rankings. Default: True
+            diversity_lambda (Optional[float]): Re-rank each group with maximal marginal
+                               relevance to skip near-duplicate nodes; 1.0 keeps pure relevance,
+                               lower values favor diversity, e.g. 0.5. Default: None
+
+        Returns:
+            str: JSON string with the similar nodes grouped per query text and the shared
+                 graph structure around them, or an error message if computation/search fails.
+        """
+        # Drop duplicate texts but keep the order the caller asked for
+        unique_texts = list(dict.fromkeys(text for text in texts if text and text.strip()))
+        if not unique_texts:
+            return "No texts given to search for."
+
+        filters = RetrievalFilters(node_label, city, season, start_time, end_time, asset)
+        cache_key = (
+            tuple(_normalize_query_text(text) for text in unique_texts),
+            top_k,
+            similarity_threshold,
+            astuple(filters),
+            use_fulltext,
+            diversity_lambda,
+        )
+        graph_version = get_graph_version()
+        cached_result = _retrieval_cache.get(cache_key, version=graph_version)
+        if cached_result is not None:
+            return cached_result
+
+        try:
+            # Step 1: Compute embeddings for all texts in one request
+            embedding_vectors = get_embed_vecs(unique_texts)
+
+            if embedding_vectors is None:
+                if not use_fulltext:
+                    return f"Failed to compute embeddings for texts: {unique_texts}"
+                embedding_vectors = [None] * len(unique_texts)
+
+            # Step 2: Run the similarity searches concurrently
+            grouped_nodes = await asyncio.gather(
+                *(
+                    self._hybrid_search(
+                        text,
+                        embedding_vector,
+                        top_k,
+                        similarity_threshold,
+                        filters,
+                        use_fulltext,
+                        diversity_lambda,
+                    )
+                    for text, embedding_vector in zip(unique_texts, embedding_vectors, strict=True)
+                )
+            )
+
+            # Step 3: Expand the union of all hits once
+            union_nodes: Dict[Any, Dict[str, Any]] = {}
+            for similar_nodes in grouped_nodes:
+                for node_data in similar_nodes:
+                    union_nodes.setdefault(_node_identity(node_data), node_data)
+            graph_data = await self._get_graph_around_nodes(list(union_nodes.values()))
+
+            result = {
+                "queries": [
+                    {"query_text": text, "similar_nodes": similar_nodes}
+                    for text, similar_nodes in zip(unique_texts, grouped_nodes, strict=True)
+                ],
+                "graph_structure": graph_data,
+                "search_params": {
+                    "top_k": top_k,
+                    "similarity_threshold": similarity_threshold,
+                    "filters": {
+                        key: value for key, value in vars(filters).items() if value is not None
+                    },
+                    "use_fulltext": use_fulltext,
+                    "diversity_lambda": diversity_lambda,
+                },
+            }
+
+            result_str = json.dumps(result, ensure_ascii=False, indent=2)
+            _retrieval_cache.put(cache_key, result_str, version=graph_version)
+            return result_str
+
+        except Exception as e:
+            error_message = f"Error finding similar nodes for texts {unique_texts}: {str(e)}"
+            print(error_message)
+            return error_message
+
+    async def _hybrid_search(
+        self,
+        query_text: str,
+        embedding_vector: Optional[List[float]],
+        top_k: int,
+        similarity_threshold: float,
+        filters: RetrievalFilters,
+        use_fulltext: bool,
+        diversity_lambda: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
-        """Search for nodes with similar embeddings using vector index."""
-        # Use vector similarity search with cosine similarity
-        cypher_query = """
-        CALL db.index.vector.queryNodes('*_embed_vector_index', $top_k, $embedding_vector)
+        """Run the vector and full-text searches concurrently and fuse their rankings."""
+        # Diversity re-ranking needs a larger candidate pool and the query embedding
+        diversify = diversity_lambda is not None and embedding_vector is not None
+        candidate_k = top_k * MMR_CANDIDATE_FACTOR if diversify else top_k
+
+        if not use_fulltext:
+            if embedding_vector is None:
+                return []
+            nodes = await self._search_similar_nodes(
+                embedding_vector, candidate_k, similarity_threshold, filters
+            )
+        else:
+
+            async def no_vector_hits() -> List[Dict[str, Any]]:
+                return []
+
+            # The full-text search replaces the unranked property fallback here
+            vector_search = (
+                self._search_similar_nodes(
+                    embedding_vector, candidate_k, similarity_threshold, filters, fallback=False
+                )
+                if embedding_vector is not None
+                else no_vector_hits()
+            )
+            vector_nodes, text_nodes = await asyncio.gather(
+                vector_search, self._search_fulltext(query_text, candidate_k, filters)
+            )
+            nodes = _fuse_rankings(vector_nodes, text_nodes, candidate_k)
+
+        if diversify:
+            nodes = _diversify(nodes, embedding_vector, top_k, diversity_lambda)
+
+        # The embeddings were only kept for the re-ranking; never return them
+        for node_data in nodes:
+            node_data.pop("_embedding", None)
+        return nodes[:top_k]
+
+    async def _search_fulltext(
+        self, query_text: str, top_k: int, filters: RetrievalFilters
+    ) -> List[Dict[str, Any]]:
+        """Search the shared full-text index for nodes whose text properties match the query."""
+        try:
+            return await asyncio.to_thread(self._run_fulltext_query, query_text, top_k, filters)
+        except Exception as e:
+            print(f"Error in full-text search: {e}")
+            return []
+
+    def _run_fulltext_query(
+        self, query_text: str, top_k: int, filters: RetrievalFilters
+    ) -> List[Dict[str, Any]]:
+        """Query the full-text index and return the matching nodes without their embeddings."""
+        filter_clause, filter_params = filters.to_cypher()
+        cypher_query = f"""
+        CALL db.index.fulltext.queryNodes($index_name, $query_text, {{limit: $limit}})
         YIELD node, score
-        WHERE score >= $similarity_threshold
-        RETURN 
+        WHERE {filter_clause}
+        RETURN
             labels(node)[0] as node_type,
             properties(node) as node_properties,
-            score as similarity_score
-        ORDER BY score DESC
+            score as text_score
+        LIMIT $top_k
         """
 
+        # Over-fetch when filtering, since the index spans all labels and all scenes
+        is_filtered = filters.node_label is not None or filters.has_graph_filters()
         params = {
-            "embedding_vector": embedding_vector,
+            "index_name": FULLTEXT_INDEX_NAME,
+            "query_text": _escape_lucene(query_text),
+            "limit": min(top_k * FILTER_OVERFETCH_FACTOR, FILTER_MAX_CANDIDATES)
+            if is_filtered
+            else top_k,
             "top_k": top_k,
-            "similarity_threshold": similarity_threshold,
+            **filter_params,
         }
 
+        graph_db = self._graph_db_service.get_default_graph_db()
+        with graph_db.conn.session() as session:
+            started_at = time.perf_counter()
+            result = session.run(cypher_query, parameters=params)
+
+            text_nodes = []
+            for record in result:
+                properties = dict(record["node_properties"])
+                text_nodes.append(
+                    {
+                        "node_type": record["node_type"],
+                        "properties": properties,
+                        "text_score": record["text_score"],
+                        # Kept aside for diversity re-ranking, removed before returning
+                        "_embedding": properties.pop("embed", None),
+                    }
+                )
+            log_query(
+                "EmbeddingRetriever",
+                cypher_query,
+                started_at,
+                rows=len(text_nodes),
+                summary=result.consume(),
+            )
+
+            return text_nodes
+
+    async def _search_similar_nodes(
+        self,
+        embedding_vector: List[float],
+        top_k: int,
+        similarity_threshold: float,
+        filters: RetrievalFilters,
+        fallback: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Search for nodes with similar embeddings using vector index."""
+        # Each label has its own vector index, named as in generate_schema_cypher_commands.
+        # Only the indexes of labels that can satisfy the filters are searched.
+        index_names = [
+            f"{label.lower()}_embed_vector_index" for label in filters.candidate_labels()
+        ]
+        if not index_names:
+            return []
+
         try:
-            graph_db = self._graph_db_service.get_default_graph_db()
-            with graph_db.conn.session() as session:
+            # Run the blocking driver calls in threads so that the indexes are searched concurrently
+            grouped_nodes = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self._run_vector_query,
+                        index_name,
+                        embedding_vector,
+                        top_k,
+                        similarity_threshold,
+                        filters,
+                    )
+                    for index_name in index_names
+                )
+            )
+            similar_nodes = [node_data for nodes in grouped_nodes for node_data in nodes]
+            similar_nodes.sort(key=lambda node_data: node_data["similarity_score"], reverse=True)
+            return similar_nodes[:top_k]
+        except Exception as e:
+            print(f"Error in vector similarity search: {e}")
+            if not fallback:
+                return []
+            # Fallback to property-based search if vector search fails
+            return await self._fallback_property_search(embedding_vector, top_k, filters)
+
+    def _run_vector_query(
+        self,
+        index_name: str,
+        embedding_vector: List[float],
+        top_k: int,
+        similarity_threshold: float,
+        filters: RetrievalFilters,
+    ) -> List[Dict[str, Any]]:
+        """Query a vector index and return the matching nodes without their embeddings.
+
+        Graph filters are applied after the index lookup, so the candidate pool starts at
+        top_k * FILTER_OVERFETCH_FACTOR and grows until top_k nodes pass the filters, the
+        index runs out of candidates above the threshold, or FILTER_MAX_CANDIDATES is reached.
+        """
+        filter_clause, filter_params = filters.to_cypher()
+        # Properties are only shipped for candidates that pass the filters
+        cypher_query = f"""
+        CALL db.index.vector.queryNodes($index_name, $candidate_k, $embedding_vector)
+        YIELD node, score
+        WHERE score >= $similarity_threshold
+        WITH node, score, ({filter_clause}) as matches_filters
+        RETURN 
+            labels(node)[0] as node_type,
+            CASE WHEN matches_filters THEN properties(node) END as node_properties,
+            score as similarity_score,
+            matches_filters
+        ORDER BY score DESC
+        """
+
+        candidate_k = (
+            min(top_k * FILTER_OVERFETCH_FACTOR, FILTER_MAX_CANDIDATES)
+            if filters.has_graph_filters()
+            else top_k
+        )
+        graph_db = self._graph_db_service.get_default_graph_db()
+        with graph_db.conn.session() as session:
+            while True:
+                params = {
+                    "index_name": index_name,
+                    "embedding_vector": embedding_vector,
+                    "candidate_k": candidate_k,
+                    "similarity_threshold": similarity_threshold,
+                    **filter_params,
+                }
+                started_at = time.perf_counter()
                 result = session.run(cypher_query, parameters=params)
+                records = list(result)
+                log_query(
+                    "EmbeddingRetriever",
+                    cypher_query,
+                    started_at,
+                    rows=len(records),
+                    summary=result.consume(),
+                )
 
                 similar_nodes = []
-                for record in result:
+                for record in records:
+                    if not record["matches_filters"]:
+                        continue
                     properties = dict(record["node_properties"])
-                    # Filter out embed vector from properties
-                    properties.pop("embed", None)
 
                     node_data = {
                         "node_type": record["node_type"],
                         "properties": properties,
                         "similarity_score": record["similarity_score"],
+                        # Filter out embed vector from properties, kept aside for re-ranking
+                        "_embedding": properties.pop("embed", None),
                     }
                     similar_nodes.append(node_data)
 
-                return similar_nodes
-
-        except Exception as e:
-            print(f"Error in vector similarity search: {e}")
-            # Fallback to property-based search if vector search fails
-            return await self._fallback_property_search(embedding_vector, top_k)
+                index_exhausted = len(records) < candidate_k
+                if (
+                    len(similar_nodes) >= top_k
+                    or index_exhausted
+                    or candidate_k >= FILTER_MAX_CANDIDATES
+                ):
+                    return similar_nodes[:top_k]
+                candidate_k = min(candidate_k * FILTER_OVERFETCH_FACTOR, FILTER_MAX_CANDIDATES)
 
     async def _fallback_property_search(
-        self, embedding_vector: List[float], top_k: int
+        self, embedding_vector: List[float], top_k: int, filters: RetrievalFilters
     ) -> List[Dict[str, Any]]:
         """Fallback search using node properties when vector search is unavailable."""
-        cypher_query = """
-        MATCH (n)
-        WHERE n.embed IS NOT NULL
+        filter_clause, filter_params = filters.to_cypher()
+        cypher_query = f"""
+        MATCH (node)
+        WHERE node.embed IS NOT NULL AND {filter_clause}
         RETURN 
-            labels(n)[0] as node_type,
-            properties(n) as node_properties,
+            labels(node)[0] as node_type,
+            properties(node) as node_properties,
             0.5 as similarity_score
         LIMIT $top_k
         """
 
-        params = {"top_k": top_k}
+        params = {"top_k": top_k, **filter_params}
 
         try:
             graph_db = self._graph_db_service.get_default_graph_db()
             with graph_db.conn.session() as session:
+                started_at = time.perf_counter()
                 result = session.run(cypher_query, parameters=params)
 
                 nodes = []
@@ -151,6 +720,13 @@ class EmbeddingRetriever(Tool):
                         "similarity_score": record["similarity_score"],
                     }
                     nodes.append(node_data)
+                log_query(
+                    "EmbeddingRetriever",
+                    cypher_query,
+                    started_at,
+                    rows=len(nodes),
+                    summary=result.consume(),
+                )
 
                 return nodes
 
@@ -214,8 +790,16 @@ class EmbeddingRetriever(Tool):
         try:
             graph_db = self._graph_db_service.get_default_graph_db()
             with graph_db.conn.session() as session:
+                started_at = time.perf_counter()
                 result = session.run(cypher_query, parameters=params)
                 record = result.single()
+                log_query(
+                    "EmbeddingRetriever",
+                    cypher_query,
+                    started_at,
+                    rows=1 if record else 0,
+                    summary=result.consume(),
+                )
 
                 if record:
                     # Filter out embed vectors from node properties
@@ -241,6 +825,20 @@ class EmbeddingRetriever(Tool):
             return {"nodes": [], "relationships": []}
 
 
+class BatchEmbeddingRetriever(EmbeddingRetriever):
+    """Tool for retrieving similar nodes for several texts in a single tool call."""
+
+    def __init__(self, id: Optional[str] = None):
+        Tool.__init__(
+            self,
+            id=id or str(uuid4()),
+            name=self.find_similar_nodes_batch.__name__,
+            description=self.find_similar_nodes_batch.__doc__ or "",
+            function=self.find_similar_nodes_batch,
+        )
+        self._graph_db_service = GraphDbService()
+
+
 DaoFactory.initialize(DbSession())
 ServiceFactory.initialize()
 
@@ -1,4 +1,6 @@
 import json
+import threading
+import time
 import traceback
 from typing import Any, Dict, Optional
 from uuid import uuid4
@@ -6,7 +8,29 @@ from uuid import uuid4
 from chat2graph.core.service.graph_db_service import GraphDbService
 from chat2graph.core.toolkit.tool import Tool
 
-from weaver.util.embedding import get_embed_vec
+from weaver.util.embedding import (
+    EMBED_MODEL_PROPERTY,
+    current_embedding_model,
+    embedding_text,
+    get_embed_vec,
+)
+from weaver.util.graph_version import bump_graph_version
+from weaver.util.query_log import log_query
+
+# Nodes written by GraphImporter in this process, for the ingestion progress rate
+_imported_nodes_lock = threading.Lock()
+_imported_node_count = 0
+
+
+def imported_node_count() -> int:
+    """Return how many nodes GraphImporter has created or updated in this process."""
+    return _imported_node_count
+
+
+def _record_imported_nodes(count: int) -> None:
+    global _imported_node_count
+    with _imported_nodes_lock:
+        _imported_node_count += count
 
 
 class GraphImporter(Tool):
@@ -220,7 +244,9 @@ class GraphImporter(Tool):
                                 node[primary_key] = primary_value
 
                         cypher = self._generate_node_cypher(node_label, node)
-                        session.run(cypher, node)
+                        started_at = time.perf_counter()
+                        summary = session.run(cypher, node).consume()
+                        log_query("GraphImporter", cypher, started_at, summary=summary)
                         created_nodes += 1
                         imported_nodes.append(f"{node_label}({primary_key}: {primary_value})")
 
@@ -230,7 +256,9 @@ class GraphImporter(Tool):
                     for relationship in rel_list:
                         cypher = self._generate_relationship_cypher(rel_type, relationship)
                         if cypher:  # Only execute if cypher was generated successfully
-                            session.run(cypher, relationship)
+                            started_at = time.perf_counter()
+                            summary = session.run(cypher, relationship).consume()
+                            log_query("GraphImporter", cypher, started_at, summary=summary)
                             created_relationships += 1
 
                             source = relationship.get("source_node", {})
@@ -244,6 +272,10 @@ class GraphImporter(Tool):
                                 f"{source_label}({source_key})-[:{rel_type}]->{target_label}({target_key})"
                             )
 
+            # Invalidate cached retrieval results computed against the old graph
+            bump_graph_version()
+            _record_imported_nodes(created_nodes)
+
             # Build detailed response
             result_parts = [
                 "Graph data imported successfully!",
@@ -266,6 +298,9 @@ class GraphImporter(Tool):
             return "\n".join(result_parts)
 
         except Exception as e:
+            # A failed import may still have written part of the data
+            bump_graph_version()
+            _record_imported_nodes(created_nodes)
             tb_str = traceback.format_exc()
             error_message = (
                 f"Error importing graph data: {str(e)}\n"
@@ -289,7 +324,7 @@ class GraphImporter(Tool):
                     primary_key = fallback_key
                     primary_value = node_data[fallback_key]
                     break
-            
+
             # If still no primary key, generate one
             if not primary_value:
                 primary_key = "id"
@@ -298,10 +333,12 @@ class GraphImporter(Tool):
 
         # Generate embedding vector for the node
         # Use description if available, otherwise use the primary value as text
-        text_for_embedding = node_data.get("description") or str(primary_value)
+        text_for_embedding = embedding_text(node_data, primary_value)
         embed_vector = get_embed_vec(text_for_embedding)
         if embed_vector:
             node_data["embed"] = embed_vector
+            # Tag the vector with its model so that backfill_embeddings can find stale ones
+            node_data[EMBED_MODEL_PROPERTY] = current_embedding_model()
 
         # Build property string - always SET all properties to overwrite existing ones
         property_assignments = []
@@ -315,7 +352,7 @@ class GraphImporter(Tool):
     def _generate_relationship_cypher(
         self, rel_type: str, rel_data: Dict[str, Any]
     ) -> Optional[str]:
-        """Generate CREATE cypher for a relationship."""
+        """Generate MERGE cypher for a relationship."""
         source = rel_data.get("source_node", {})
         target = rel_data.get("target_node", {})
         properties = rel_data.get("properties", {})
@@ -349,12 +386,14 @@ class GraphImporter(Tool):
                 else:
                     prop_items.append(f"{key}: {value}")
             if prop_items:
-                rel_props = f" {{{', '.join(prop_items)}}}"
+                rel_props = f" SET r += {{{', '.join(prop_items)}}}"
 
+        # MERGE rather than CREATE: canonical City/Province/Season nodes are linked again by
+        # every note that mentions them, and re-imports must not duplicate edges
         return (
             f"MATCH (s:{source_label} {{{source_primary_key}: '{source_key}'}}) "
             f"MATCH (t:{target_label} {{{target_primary_key}: '{target_key}'}}) "
-            f"CREATE (s)-[r:{rel_type}{rel_props}]->(t)"
+            f"MERGE (s)-[r:{rel_type}]->(t){rel_props}"
         )
 
     def _get_primary_key_for_label(self, label: str) -> str:
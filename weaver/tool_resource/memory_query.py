@@ -0,0 +1,373 @@
+import json
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from chat2graph.core.toolkit.tool import Tool
+from neo4j import unit_of_work
+
+from weaver.tool_resource.cypher_executor import (
+    MAX_RESULT_BYTES,
+    MAX_RESULT_ROWS,
+    QUERY_TIMEOUT_SECONDS,
+    CypherExecutor,
+)
+from weaver.util.cache import LRUCache
+from weaver.util.cypher import TIMESTAMP_MAX, timestamp_bounds, timestamp_range_predicate
+from weaver.util.graph_version import get_graph_version
+from weaver.util.query_log import log_query
+from weaver.util.schema import PREDEFINED_GRAPH_SCHEMA
+from weaver.util.serialization import dumps
+
+# Number of rows a lookup returns unless the agent asks for another limit
+DEFAULT_LOOKUP_LIMIT = 50
+
+
+def _projection(variable: str, node_label: str) -> str:
+    """Return a map projection of a node's schema properties, without its embedding."""
+    properties = PREDEFINED_GRAPH_SCHEMA["nodes"][node_label]["properties"]
+    fields = ", ".join(f".{prop['name']}" for prop in properties if prop["name"] != "embed")
+    return f"{variable} {{{fields}}}"
+
+
+def _linked_elements_query(rel_type: str, target: str, target_label: str) -> str:
+    """Build the query that follows rel_type from elements given by their primary keys.
+
+    Every source label of the relationship gets its own UNION branch that starts with a
+    lookup on the label's unique primary key, so each branch is a constraint index seek
+    instead of a scan over all nodes.
+    """
+    rel_def = PREDEFINED_GRAPH_SCHEMA["relationships"][rel_type]
+    branches = []
+    for source_label in rel_def["source_vertex_labels"]:
+        primary_key = PREDEFINED_GRAPH_SCHEMA["nodes"][source_label]["primary_key"]
+        branches.append(
+            "WITH element_name "
+            f"MATCH (element:{source_label} {{{primary_key}: element_name}})"
+            f"-[:{rel_type}]->({target}:{target_label}) "
+            f"RETURN '{source_label}' AS element_label, {target}"
+        )
+    return (
+        "UNWIND $element_names AS element_name "
+        "CALL { " + " UNION ".join(branches) + " } "
+        f"RETURN element_name AS element, element_label, {_projection(target, target_label)} "
+        f"ORDER BY element, {target}.timestamp "
+        "LIMIT $limit"
+    )
+
+
+def _assets_query() -> str:
+    """Build the query for the DigitalAssets of elements, over every *_ASSET relationship."""
+    branches = []
+    for rel_type, rel_def in PREDEFINED_GRAPH_SCHEMA["relationships"].items():
+        if rel_def["target_vertex_labels"] != ["DigitalAsset"]:
+            continue
+        for source_label in rel_def["source_vertex_labels"]:
+            primary_key = PREDEFINED_GRAPH_SCHEMA["nodes"][source_label]["primary_key"]
+            branches.append(
+                "WITH element_name "
+                f"MATCH (element:{source_label} {{{primary_key}: element_name}})"
+                f"-[:{rel_type}]->(asset:DigitalAsset) "
+                f"RETURN '{source_label}' AS element_label, '{rel_type}' AS link, asset"
+            )
+    return (
+        "UNWIND $element_names AS element_name "
+        "CALL { " + " UNION ".join(branches) + " } "
+        "RETURN element_name AS element, element_label, link, "
+        f"{_projection('asset', 'DigitalAsset')} "
+        "ORDER BY element, asset.timestamp "
+        "LIMIT $limit"
+    )
+
+
+# The prepared lookups. Their texts never change, so the server plans each one once and
+# answers every later call from its plan cache.
+SCENES_IN_CITY_QUERY = (
+    "MATCH (city:City) WHERE city.city_name = $city_name OR city.chinese_name = $city "
+    "MATCH (scene:ExperientialScene)-[:LOCATED_IN_CITY]->(city) "
+    f"WHERE {timestamp_range_predicate('scene', 'start_time', 'end_time', optional=True)} "
+    f"RETURN {_projection('scene', 'ExperientialScene')}, city.city_name AS city "
+    "ORDER BY scene.timestamp "
+    "LIMIT $limit"
+)
+SCENES_IN_TIME_RANGE_QUERY = (
+    # Both bounds are always given, so the planner can seek the timestamp range index
+    "MATCH (scene:ExperientialScene) "
+    f"WHERE {timestamp_range_predicate('scene', 'start_time', 'end_time')} "
+    "OPTIONAL MATCH (scene)-[:LOCATED_IN_CITY]->(city:City) "
+    f"RETURN {_projection('scene', 'ExperientialScene')}, city.city_name AS city "
+    "ORDER BY scene.timestamp "
+    "LIMIT $limit"
+)
+OBSERVATIONS_OF_SCENES_QUERY = (
+    "MATCH (scene:ExperientialScene) WHERE scene.scene_name IN $scene_names "
+    "MATCH (observation:FocalObservation)-[:OBSERVED_IN]->(scene) "
+    f"RETURN scene.scene_name AS scene, {_projection('observation', 'FocalObservation')} "
+    "ORDER BY scene, observation.timestamp "
+    "LIMIT $limit"
+)
+EMOTIONS_TRIGGERED_BY_QUERY = (
+    # TRIGGERED_BY points from the emotion to its trigger, so the branches start at the trigger
+    "UNWIND $element_names AS element_name "
+    "CALL { "
+    + " UNION ".join(
+        "WITH element_name "
+        f"MATCH (resonance:AffectiveResonance)-[:TRIGGERED_BY]->"
+        f"(element:{label} {{{PREDEFINED_GRAPH_SCHEMA['nodes'][label]['primary_key']}: "
+        f"element_name}}) RETURN '{label}' AS element_label, resonance"
+        for label in PREDEFINED_GRAPH_SCHEMA["relationships"]["TRIGGERED_BY"][
+            "target_vertex_labels"
+        ]
+    )
+    + " } "
+    "RETURN element_name AS element, element_label, "
+    f"{_projection('resonance', 'AffectiveResonance')} "
+    "ORDER BY element, resonance.timestamp "
+    "LIMIT $limit"
+)
+LINKED_ASSETS_QUERY = _assets_query()
+ANCHORS_CONTRIBUTED_TO_QUERY = _linked_elements_query("CONTRIBUTES_TO", "anchor", "NarrativeAnchor")
+
+
+class _MemoryLookup(CypherExecutor):
+    """Base class of the tools that run one prepared, parameterized read query.
+
+    The queries are written against the schema's unique primary keys and indexes and are
+    known to be cheap, so unlike CypherExecutor they skip literal normalization and the
+    plan-cost guard; they still run in a timed read transaction, share the read result
+    cache and are recorded in the query log.
+    """
+
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        id: Optional[str] = None,
+        max_rows: int = MAX_RESULT_ROWS,
+        max_bytes: int = MAX_RESULT_BYTES,
+        timeout_seconds: float = QUERY_TIMEOUT_SECONDS,
+        result_cache: Optional[LRUCache] = None,
+    ):
+        Tool.__init__(
+            self,
+            id=id or str(uuid4()),
+            name=function.__name__,
+            description=function.__doc__ or "",
+            function=function,
+        )
+        self._configure(max_rows, max_bytes, timeout_seconds, None, result_cache)
+
+    def _lookup(self, cypher_query: str, parameters: Dict[str, Any], limit: int) -> str:
+        """Run a prepared query and render its records."""
+        started_at = time.perf_counter()
+        try:
+            limit = max(1, min(int(limit), self._max_rows))
+            query_parameters = {**parameters, "limit": limit}
+            cache_key = None
+            graph_version = get_graph_version()
+            if self._result_cache is not None:
+                cache_key = (
+                    cypher_query,
+                    json.dumps(query_parameters, sort_keys=True, ensure_ascii=False, default=str),
+                    0,
+                    self._max_rows,
+                    self._max_bytes,
+                )
+                cached_output = self._result_cache.get(cache_key, version=graph_version)
+                if cached_output is not None:
+                    return cached_output
+
+            graph_db = self._graph_db_service.get_default_graph_db()
+            with graph_db.conn.session() as session:
+                read_work = unit_of_work(timeout=self._timeout_seconds)(self._read_records)
+                records, truncation_reason, summary = session.execute_read(
+                    read_work, cypher_query, query_parameters
+                )
+            log_query(
+                type(self).__name__, cypher_query, started_at, rows=len(records), summary=summary
+            )
+
+            if not records:
+                output = f"No matching records found for {dumps(parameters)}."
+            elif truncation_reason:
+                output = dumps(
+                    {
+                        "records": records,
+                        "truncated": True,
+                        "reason": truncation_reason,
+                        "hint": "Ask for fewer names at once or lower the limit.",
+                    }
+                )
+            else:
+                output = dumps(records)
+            if cache_key is not None:
+                self._result_cache.put(cache_key, output, version=graph_version)
+            return output
+        except Exception as e:
+            log_query(type(self).__name__, cypher_query, started_at, error=str(e))
+            tb_str = traceback.format_exc()
+            error_message = (
+                f"Error running {type(self).__name__} lookup: {str(e)}\n"
+                f"Parameters: {parameters}\n"
+                f"Traceback:\n{tb_str}"
+            )
+            print(error_message)  # Log for server-side debugging
+            return error_message
+
+    def _read_records(
+        self, tx: Any, cypher_query: str, parameters: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], str, Any]:
+        result = tx.run(cypher_query, parameters)
+        records, truncation_reason = self._collect_records(result, 0, self._max_bytes)
+        return records, truncation_reason, result.consume()
+
+
+def _names(names: Any) -> List[str]:
+    """Accept a single name as well as a list of names."""
+    if isinstance(names, str):
+        return [names]
+    return [str(name) for name in names or []]
+
+
+class SceneLookup(_MemoryLookup):
+    """Tool for finding ExperientialScenes by city and time range."""
+
+    def __init__(self, id: Optional[str] = None, **kwargs: Any):
+        super().__init__(self.find_scenes, id, **kwargs)
+
+    async def find_scenes(
+        self,
+        city: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: int = DEFAULT_LOOKUP_LIMIT,
+    ) -> str:
+        """Finds the ExperientialScenes located in a city and/or within a time range.
+
+        Prefer it over a hand-written Cypher query for "what happened in <city>" or
+        "what happened in <month>" questions; it is prepared and index-backed.
+
+        Args:
+            city (Optional[str]): City by its city_name (e.g. 'hangzhou') or Chinese name
+                (e.g. '杭州'). Default: None
+            start_time (Optional[str]): Inclusive lower bound of the scene timestamp, an ISO
+                8601 prefix such as '2023-11' or '2023-11-05'. Default: None
+            end_time (Optional[str]): Inclusive upper bound of the scene timestamp, an ISO
+                8601 prefix. Default: None
+            limit (int): Maximum number of scenes to return. Default: 50
+
+        Returns:
+            str: JSON list of scenes (properties and city), ordered by time, or a message.
+        """
+        if not (city or start_time or end_time):
+            return "Give a city, a start_time or an end_time to find scenes."
+        lower, upper = timestamp_bounds(start_time, end_time)
+        parameters = {"start_time": lower, "end_time": upper}
+        if city:
+            parameters.update(city=city.strip(), city_name=city.strip().lower())
+            return self._lookup(SCENES_IN_CITY_QUERY, parameters, limit)
+        parameters.update(start_time=lower or "", end_time=upper or TIMESTAMP_MAX)
+        return self._lookup(SCENES_IN_TIME_RANGE_QUERY, parameters, limit)
+
+
+class ObservationLookup(_MemoryLookup):
+    """Tool for finding the FocalObservations made in given scenes."""
+
+    def __init__(self, id: Optional[str] = None, **kwargs: Any):
+        super().__init__(self.find_observations_of_scenes, id, **kwargs)
+
+    async def find_observations_of_scenes(
+        self, scene_names: List[str], limit: int = DEFAULT_LOOKUP_LIMIT
+    ) -> str:
+        """Finds the FocalObservations OBSERVED_IN the given ExperientialScenes.
+
+        Args:
+            scene_names (List[str]): scene_name values of the scenes.
+            limit (int): Maximum number of observations to return. Default: 50
+
+        Returns:
+            str: JSON list of observations, each with the scene_name it belongs to.
+        """
+        names = _names(scene_names)
+        if not names:
+            return "Give at least one scene_name."
+        return self._lookup(OBSERVATIONS_OF_SCENES_QUERY, {"scene_names": names}, limit)
+
+
+class EmotionLookup(_MemoryLookup):
+    """Tool for finding the AffectiveResonances triggered by given elements."""
+
+    def __init__(self, id: Optional[str] = None, **kwargs: Any):
+        super().__init__(self.find_emotions_triggered_by, id, **kwargs)
+
+    async def find_emotions_triggered_by(
+        self, element_names: List[str], limit: int = DEFAULT_LOOKUP_LIMIT
+    ) -> str:
+        """Finds the AffectiveResonances TRIGGERED_BY the given scenes, observations or
+        interactions.
+
+        Args:
+            element_names (List[str]): Primary keys of the triggering elements: scene_name,
+                observation_name or interaction_name values, which may be mixed.
+            limit (int): Maximum number of emotions to return. Default: 50
+
+        Returns:
+            str: JSON list of emotions, each with the element that triggered it.
+        """
+        names = _names(element_names)
+        if not names:
+            return "Give at least one element name."
+        return self._lookup(EMOTIONS_TRIGGERED_BY_QUERY, {"element_names": names}, limit)
+
+
+class AssetLookup(_MemoryLookup):
+    """Tool for finding the DigitalAssets linked to given elements."""
+
+    def __init__(self, id: Optional[str] = None, **kwargs: Any):
+        super().__init__(self.find_linked_assets, id, **kwargs)
+
+    async def find_linked_assets(
+        self, element_names: List[str], limit: int = DEFAULT_LOOKUP_LIMIT
+    ) -> str:
+        """Finds the DigitalAssets (photos, notes, recordings) the given elements come from.
+
+        Follows CONSTRUCTED_FROM_ASSET from scenes, IDENTIFIED_IN_ASSET from observations,
+        EXTRACTED_FROM_ASSET from emotions and DOCUMENTED_BY_ASSET from interactions.
+
+        Args:
+            element_names (List[str]): Primary keys of the elements (scene_name,
+                observation_name, resonance_name or interaction_name), which may be mixed.
+            limit (int): Maximum number of assets to return. Default: 50
+
+        Returns:
+            str: JSON list of assets, each with the element and the relationship linking it.
+        """
+        names = _names(element_names)
+        if not names:
+            return "Give at least one element name."
+        return self._lookup(LINKED_ASSETS_QUERY, {"element_names": names}, limit)
+
+
+class AnchorLookup(_MemoryLookup):
+    """Tool for finding the NarrativeAnchors given elements contribute to."""
+
+    def __init__(self, id: Optional[str] = None, **kwargs: Any):
+        super().__init__(self.find_anchors_contributed_to, id, **kwargs)
+
+    async def find_anchors_contributed_to(
+        self, element_names: List[str], limit: int = DEFAULT_LOOKUP_LIMIT
+    ) -> str:
+        """Finds the NarrativeAnchors the given elements CONTRIBUTES_TO.
+
+        Args:
+            element_names (List[str]): Primary keys of the elements (scene_name,
+                observation_name, resonance_name or interaction_name), which may be mixed.
+            limit (int): Maximum number of anchors to return. Default: 50
+
+        Returns:
+            str: JSON list of anchors, each with the element contributing to it.
+        """
+        names = _names(element_names)
+        if not names:
+            return "Give at least one element name."
+        return self._lookup(ANCHORS_CONTRIBUTED_TO_QUERY, {"element_names": names}, limit)
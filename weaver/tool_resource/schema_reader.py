@@ -1,10 +1,70 @@
 import json
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
 from chat2graph.core.service.graph_db_service import GraphDbService  # Added import
 from chat2graph.core.toolkit.tool import Tool
 
+from weaver.util.cache import LRUCache
+from weaver.util.schema import get_schema_version
+
+# Renderings are keyed on the schema version of this process; the TTL picks up schema
+# changes made by other processes
+SCHEMA_CACHE_TTL_SECONDS = 300.0
+_schema_cache = LRUCache(max_size=4, ttl_seconds=SCHEMA_CACHE_TTL_SECONDS)
+
+
+def _property_list(definition: Dict[str, Any], verbose: bool) -> List[str]:
+    primary_key = definition.get("primary_key")
+    rendered = []
+    for prop in definition.get("properties", []):
+        name = prop.get("name", "")
+        # Embeddings are computed by the importer, never written or read by the agent
+        if name == "embed" and not verbose:
+            continue
+        text = f"{name}{'*' if name == primary_key else ''}: {prop.get('type', '')}"
+        if verbose and prop.get("desc"):
+            text += f" -- {prop['desc']}"
+        rendered.append(text)
+    return rendered
+
+
+def render_schema_summary(schema_metadata: Dict[str, Any], verbose: bool = False) -> str:
+    """Render schema metadata as compact text: one line per label and per relationship type.
+
+    Args:
+        schema_metadata (Dict[str, Any]): Schema with "nodes" and "relationships" definitions.
+        verbose (bool): Add the descriptions of labels, relationships and properties, one
+            property per line.
+    """
+    separator = "\n    " if verbose else ", "
+    lines = [
+        "Nodes (* marks the primary key; primary keys are lowercase English words joined by "
+        "underscores, without numbers):"
+    ]
+    for label, node_def in (schema_metadata.get("nodes") or {}).items():
+        properties = _property_list(node_def, verbose)
+        if verbose:
+            lines.append(f"  {label}:{separator}{separator.join(properties)}")
+        else:
+            lines.append(f"  {label}({separator.join(properties)})")
+    lines.append("Relationships:")
+    for rel_type, rel_def in (schema_metadata.get("relationships") or {}).items():
+        sources = "|".join(rel_def.get("source_vertex_labels", []))
+        targets = "|".join(rel_def.get("target_vertex_labels", []))
+        properties = _property_list(rel_def, verbose)
+        if verbose:
+            desc = f" -- {rel_def['desc']}" if rel_def.get("desc") else ""
+            lines.append(
+                f"  ({sources})-[:{rel_type}]->({targets}){desc}{separator}"
+                f"{separator.join(properties)}"
+            )
+        else:
+            lines.append(
+                f"  ({sources})-[:{rel_type} {{{separator.join(properties)}}}]->({targets})"
+            )
+    return "\n".join(lines)
+
 
 class GraphSchemaReader(Tool):
     """Tool for reading the schema of the graph database."""
@@ -17,17 +77,28 @@ class GraphSchemaReader(Tool):
             function=self.read_graph_schema,
         )
 
-    async def read_graph_schema(self) -> str:
+    async def read_graph_schema(self, verbose: bool = False) -> str:
         """Reads and returns the schema of the currently configured graph database.
 
-        The schema typically includes information about node labels, relationship types,
-        and their properties.
+        The compact form lists every node label with its properties and types (the primary
+        key marked with *) and every relationship type with its properties and the labels
+        it may connect. Ask for the verbose form only when the meaning of a property is
+        unclear.
+
+        Args:
+            verbose (bool): Include the description of every label, relationship and
+                property. Default: False
 
         Returns:
-            str: A string representation (e.g., JSON) of the graph database schema,
+            str: A text rendering of the graph database schema,
                  or an error message if reading fails.
         """
         try:
+            schema_version = get_schema_version()
+            cached = _schema_cache.get(verbose, version=schema_version)
+            if cached is not None:
+                return cached
+
             graph_db_service: GraphDbService = GraphDbService.instance
             default_db_config = graph_db_service.get_default_graph_db_config()
             # schema_to_graph_dict returns a specific format for GraphMessage.
@@ -37,6 +108,11 @@ class GraphSchemaReader(Tool):
             schema_metadata = graph_db_service.get_schema_metadata(default_db_config)
             if not schema_metadata:  # handle case where it might be None or empty
                 schema_metadata = {"nodes": {}, "relationships": {}}  # Default empty schema
-            return json.dumps(schema_metadata, indent=2, ensure_ascii=False)
+            if isinstance(schema_metadata, str):
+                schema_metadata = json.loads(schema_metadata)
+
+            rendered = render_schema_summary(schema_metadata, verbose)
+            _schema_cache.put(verbose, rendered, version=schema_version)
+            return rendered
         except Exception as e:
             return f"Error reading graph schema: {str(e)}"
@@ -0,0 +1,77 @@
+import math
+import re
+from statistics import median
+from typing import Dict, List, Sequence, Tuple
+
+# Estimated tokens of the files attached to one extraction job; the rest of the model's
+# context is left to the expert prompts, tool calls and the extracted graph
+DEFAULT_TOKEN_BUDGET = 24000
+# Upper bound on files per job, however short they are
+DEFAULT_MAX_FILES_PER_BATCH = 40
+
+# Han, kana, hangul and full-width forms: about one token per character with BPE tokenizers
+_CJK = re.compile(
+    "[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]"
+)
+# Other text: about four characters per token
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the tokens of a text, counting CJK characters one token each."""
+    cjk = len(_CJK.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / _CHARS_PER_TOKEN)
+
+
+def plan_token_batches(
+    sizes: Sequence[Tuple[str, int]],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    max_files: int = DEFAULT_MAX_FILES_PER_BATCH,
+) -> List[List[str]]:
+    """Group items into batches of at most `token_budget` estimated tokens.
+
+    Items are packed first-fit in decreasing size, so each batch is close to full. An item
+    larger than the budget gets a batch of its own.
+
+    Args:
+        sizes (Sequence[Tuple[str, int]]): (item id, estimated tokens) pairs.
+        token_budget (int): Token limit of a batch.
+        max_files (int): Item limit of a batch.
+
+    Returns:
+        List[List[str]]: Batches of item ids, the largest batches first.
+    """
+    batches: List[List[str]] = []
+    totals: List[int] = []
+    for item_id, tokens in sorted(sizes, key=lambda item: item[1], reverse=True):
+        for i, total in enumerate(totals):
+            if total + tokens <= token_budget and len(batches[i]) < max_files:
+                batches[i].append(item_id)
+                totals[i] += tokens
+                break
+        else:
+            batches.append([item_id])
+            totals.append(tokens)
+    return batches
+
+
+def batch_size_report(
+    batches: List[List[str]], tokens: Dict[str, int], token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> str:
+    """Summarize the files and estimated tokens per batch, and the batches over budget."""
+    if not batches:
+        return "No batches."
+    file_counts = [len(batch) for batch in batches]
+    token_counts = [sum(tokens[item_id] for item_id in batch) for batch in batches]
+    over_budget = sum(1 for total in token_counts if total > token_budget)
+    lines = [
+        f"{len(batches)} batches, {sum(file_counts)} files, budget {token_budget} tokens",
+        f"  files per batch:  min {min(file_counts)}, median {median(file_counts):g}, "
+        f"max {max(file_counts)}",
+        f"  tokens per batch: min {min(token_counts)}, median {median(token_counts):g}, "
+        f"max {max(token_counts)}",
+        f"  mean fill: {sum(token_counts) / (len(batches) * token_budget):.0%}",
+    ]
+    if over_budget:
+        lines.append(f"  {over_budget} single-file batches exceed the budget")
+    return "\n".join(lines)
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    version: Optional[int]
+    expires_at: Optional[float]
+    size: int = 0
+
+
+def _default_size_of(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional TTL and graph-version invalidation.
+
+    Each entry remembers the graph version it was computed at. A lookup with a
+    different version is treated as a miss and drops the stale entry.
+
+    Args:
+        max_size (int): Maximum number of entries kept before evicting the least recently used.
+        ttl_seconds (Optional[float]): Lifetime of an entry in seconds. None disables expiry.
+        max_bytes (Optional[int]): Maximum total size of the values. None disables the bound.
+        size_of (Optional[Callable[[Any], int]]): Size of a value in bytes. Defaults to the
+            UTF-8 length for strings and sys.getsizeof otherwise.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+        self._size_of = size_of or _default_size_of
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes = 0
+
+    def get(self, key: Hashable, version: Optional[int] = None) -> Optional[Any]:
+        """Returns the cached value for the key, or None if missing, expired or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expired = entry.expires_at is not None and entry.expires_at <= time.monotonic()
+            if expired or entry.version != version:
+                self._remove(key)
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        """Stores a value computed at the given graph version.
+
+        A value larger than max_bytes on its own is not stored.
+        """
+        expires_at = (
+            time.monotonic() + self._ttl_seconds if self._ttl_seconds is not None else None
+        )
+        size = self._size_of(value) if self._max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self._max_bytes is not None and size > self._max_bytes:
+                return
+            self._entries[key] = _CacheEntry(
+                value=value, version=version, expires_at=expires_at, size=size
+            )
+            self._bytes += size
+            while len(self._entries) > self._max_size or (
+                self._max_bytes is not None and self._bytes > self._max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def _remove(self, key: Hashable) -> None:
+        """Drops an entry; the caller holds the lock."""
+        self._bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        """Drops all entries and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the entry count, size, hits, misses and hit rate of the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+import re
+from typing import List, Optional, Tuple
+
+from weaver.util.batching import estimate_tokens
+
+# Estimated tokens of one chunk: a few paragraphs, small enough for one focused agent pass
+DEFAULT_CHUNK_TOKENS = 1500
+
+# The marker add_datetime_to_texts appends to every note
+_DATETIME_MARKER = re.compile(r"\s*datetime\((?P<timestamp>[^)]*)\)\s*$")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# Split after sentence-ending punctuation, Chinese or Western
+_SENTENCE_END = re.compile(r"(?<=[。！？!?.…])")
+
+
+@dataclass(frozen=True)
+class NoteChunk:
+    """A run of consecutive paragraphs of a note, with the note's timestamp."""
+
+    index: int
+    text: str
+    timestamp: Optional[str] = None
+
+    def with_marker(self) -> str:
+        """Return the chunk text with the note's datetime marker, as extraction expects."""
+        return f"{self.text}\n\ndatetime({self.timestamp})" if self.timestamp else self.text
+
+
+def split_datetime_marker(text: str) -> Tuple[str, Optional[str]]:
+    """Split the trailing `datetime(...)` marker off a note, returning (body, timestamp)."""
+    match = _DATETIME_MARKER.search(text)
+    if match is None:
+        return text.strip(), None
+    return text[: match.start()].strip(), match.group("timestamp").strip()
+
+
+def _split_long_paragraph(paragraph: str, max_tokens: int) -> List[str]:
+    pieces: List[str] = []
+    current = ""
+    for sentence in filter(None, _SENTENCE_END.split(paragraph)):
+        if current and estimate_tokens(current + sentence) > max_tokens:
+            pieces.append(current.strip())
+            current = ""
+        current += sentence
+    if current.strip():
+        pieces.append(current.strip())
+    return pieces
+
+
+def split_note(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[NoteChunk]:
+    """Split a note into chunks of whole paragraphs of at most `max_tokens` estimated tokens.
+
+    Paragraphs are separated by blank lines; a paragraph longer than the budget is split at
+    sentence ends. Every chunk carries the timestamp of the note's `datetime(...)` marker.
+
+    Args:
+        text (str): The note.
+        max_tokens (int): Token budget of a chunk.
+
+    Returns:
+        List[NoteChunk]: The chunks in reading order.
+    """
+    body, timestamp = split_datetime_marker(text)
+    paragraphs: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(body):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) > max_tokens:
+            paragraphs.extend(_split_long_paragraph(paragraph, max_tokens))
+        else:
+            paragraphs.append(paragraph)
+
+    chunks: List[NoteChunk] = []
+    current: List[str] = []
+    current_tokens = 0
+    for paragraph in paragraphs:
+        tokens = estimate_tokens(paragraph)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(NoteChunk(len(chunks), "\n\n".join(current), timestamp))
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append(NoteChunk(len(chunks), "\n\n".join(current), timestamp))
+    return chunks
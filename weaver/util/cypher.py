@@ -0,0 +1,406 @@
+from dataclasses import dataclass
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from weaver.util.cache import LRUCache
+
+# Clauses and commands that modify data or schema, or cannot run in a read transaction
+_WRITE_KEYWORDS = re.compile(
+    r"(?<![.\w$])(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV"
+    r"|GRANT|DENY|REVOKE|ALTER|RENAME|START|STOP|TERMINATE|SHOW)(?![\w$])",
+    re.IGNORECASE,
+)
+
+# Procedure calls, excluding CALL { ... } subqueries
+_PROCEDURE_CALL = re.compile(r"(?<![.\w$])CALL\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+
+# Procedures known not to write, so they may run inside a read transaction
+READ_ONLY_PROCEDURE_PREFIXES = (
+    "db.index.vector.queryNodes",
+    "db.index.vector.queryRelationships",
+    "db.index.fulltext.queryNodes",
+    "db.index.fulltext.queryRelationships",
+    "db.labels",
+    "db.relationshipTypes",
+    "db.propertyKeys",
+    "db.schema.",
+    "apoc.meta.",
+)
+
+_EXPLAIN_OR_PROFILE = re.compile(r"^\s*(EXPLAIN|PROFILE)\b", re.IGNORECASE)
+
+# Variable-length relationship patterns such as [*], [r:KNOWS*2..] or [*1..3]
+_VAR_LENGTH = re.compile(
+    r"\[(?P<head>[^\[\]]*?)\*\s*(?P<min>\d*)\s*(?P<dots>\.\.)?\s*(?P<max>\d*)\s*\]"
+)
+
+# Quantifiers of quantified path patterns such as ((a)-->(b)){1,3}, {2,} or {3}; a map
+# literal always has a key, so it never matches
+_QUANTIFIER = re.compile(r"\{\s*\d*\s*(?:,\s*\d*\s*)?\}")
+
+# String literals, backtick identifiers and comments, which must not be parsed as Cypher
+_LITERAL = re.compile(
+    r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`|//[^\n]*|/\*.*?\*/",
+    re.DOTALL,
+)
+
+# Schema and admin commands, whose literals cannot be replaced by parameters and which
+# have no query plan to check
+_SCHEMA_OR_ADMIN_COMMAND = re.compile(
+    r"^\s*(?:(?:CREATE|DROP|ALTER)(?:\s+OR\s+REPLACE)?\s+(?:\w+\s+){0,3}?"
+    r"(?:INDEX|CONSTRAINT|DATABASE|USER|ROLE|ALIAS)\b|SHOW\b|GRANT\b|DENY\b|REVOKE\b"
+    r"|START\b|STOP\b|TERMINATE\b)",
+    re.IGNORECASE,
+)
+
+# Batched writes, whose literals cannot be replaced by parameters either
+_IN_TRANSACTIONS = re.compile(r"\bIN\s+TRANSACTIONS\b", re.IGNORECASE)
+
+# A masked fragment placeholder, or a number literal that is not part of a name or a range
+_PLACEHOLDER_OR_NUMBER = re.compile(
+    r"\x00(?P<fragment>\d+)\x00"
+    r"|(?<![\w$.\x00])(?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?![\w.\x00])"
+)
+
+# Brackets, to track nesting, and RETURN clauses, to find the last top-level one
+_BRACKET_OR_RETURN = re.compile(r"[(\[{)\]}]|(?<![.\w$])RETURN(?![\w$])", re.IGNORECASE)
+
+# Clauses after a RETURN that already window its rows, and UNION, which joins two RETURNs
+_ROW_WINDOW = re.compile(r"(?<![.\w$])(SKIP|OFFSET|LIMIT)(?![\w$])", re.IGNORECASE)
+_UNION = re.compile(r"(?<![.\w$])UNION(?![\w$])", re.IGNORECASE)
+
+_STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+# Prefix of the parameters that replace literals
+LITERAL_PARAMETER_PREFIX = "lit_"
+
+
+@dataclass(frozen=True)
+class PlanBudget:
+    """Limits an estimated query plan must stay within before the query is run."""
+
+    max_estimated_rows: float = 1_000_000
+    max_all_nodes_scan_rows: float = 10_000
+    # Products of a few index seeks are cheap; only large ones are rejected
+    max_cartesian_product_rows: float = 10_000
+    allow_cartesian_product: bool = False
+
+
+def mask_literals(cypher_query: str) -> Tuple[str, List[str]]:
+    """Replace literals, backtick identifiers and comments with numbered placeholders.
+
+    Returns:
+        Tuple[str, List[str]]: The masked query and the masked fragments, in order.
+    """
+    fragments: List[str] = []
+
+    def _mask(match: re.Match) -> str:
+        fragments.append(match.group(0))
+        return f"\x00{len(fragments) - 1}\x00"
+
+    return _LITERAL.sub(_mask, cypher_query), fragments
+
+
+def unmask_literals(masked_query: str, fragments: List[str]) -> str:
+    """Reverse mask_literals."""
+    return re.sub(r"\x00(\d+)\x00", lambda m: fragments[int(m.group(1))], masked_query)
+
+
+def _decode_string_literal(literal: str) -> str:
+    """Turn a quoted Cypher string literal into its value."""
+
+    def _unescape(match: re.Match) -> str:
+        escaped = match.group(1)
+        if escaped.startswith("u"):
+            return chr(int(escaped[1:], 16))
+        return _STRING_ESCAPES.get(escaped, escaped)
+
+    return re.sub(r"\\(u[0-9a-fA-F]{4}|.)", _unescape, literal[1:-1], flags=re.DOTALL)
+
+
+def parameterize_literals(cypher_query: str) -> Tuple[str, Dict[str, Any]]:
+    """Lift string and number literals out of a query into parameters.
+
+    Queries that differ only in literal values then share one text, so Neo4j plans the
+    shape once and reuses the plan from its cache. Range bounds of variable-length
+    patterns and path quantifiers, backtick identifiers, comments and schema/admin commands
+    are left alone.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: The parameterized query and the parameter values.
+    """
+    masked, fragments = mask_literals(cypher_query)
+    if _SCHEMA_OR_ADMIN_COMMAND.search(masked) or _IN_TRANSACTIONS.search(masked):
+        return cypher_query, {}
+
+    # Keep range bounds such as [*1..3] and {1,3} literal: they must be constants
+    def _keep_range(match: re.Match) -> str:
+        fragments.append(match.group(0))
+        return f"\x00{len(fragments) - 1}\x00"
+
+    masked = _QUANTIFIER.sub(_keep_range, _VAR_LENGTH.sub(_keep_range, masked))
+
+    prefix = LITERAL_PARAMETER_PREFIX
+    while f"${prefix}" in cypher_query:
+        prefix = f"_{prefix}"
+    parameters: Dict[str, Any] = {}
+
+    def _lift(match: re.Match) -> str:
+        if match.group("fragment") is not None:
+            fragment = fragments[int(match.group("fragment"))]
+            if fragment[0] not in "'\"":
+                return fragment
+            value: Any = _decode_string_literal(fragment)
+        else:
+            number = match.group("number")
+            value = float(number) if any(c in number for c in ".eE") else int(number)
+        name = f"{prefix}{len(parameters)}"
+        parameters[name] = value
+        return f"${name}"
+
+    return _PLACEHOLDER_OR_NUMBER.sub(_lift, masked), parameters
+
+
+class QueryNormalizer:
+    """Parameterize queries and track how often each parameterized shape repeats.
+
+    The parameterization of a query text is cached, and every normalized shape seen
+    before counts as a shape hit: the server can answer it from its plan cache.
+
+    Args:
+        max_size (int): Maximum number of query texts and of shapes remembered.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._normalized = LRUCache(max_size=max_size)
+        self._shapes = LRUCache(max_size=max_size)
+
+    def normalize(self, cypher_query: str) -> Tuple[str, Dict[str, Any]]:
+        """Return the parameterized query and a fresh copy of its parameters."""
+        normalized = self._normalized.get(cypher_query)
+        if normalized is None:
+            normalized = parameterize_literals(cypher_query)
+            self._normalized.put(cypher_query, normalized)
+        query_text, parameters = normalized
+        if self._shapes.get(query_text) is None:
+            self._shapes.put(query_text, True)
+        return query_text, dict(parameters)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return normalization cache and query shape hit rates."""
+        normalized_stats = self._normalized.stats()
+        shape_stats = self._shapes.stats()
+        return {
+            "queries": shape_stats["hits"] + shape_stats["misses"],
+            "distinct_shapes": shape_stats["entries"],
+            "shape_hit_rate": shape_stats["hit_rate"],
+            "normalization_cache_hit_rate": normalized_stats["hit_rate"],
+        }
+
+
+def is_read_only_query(cypher_query: str) -> bool:
+    """Tell whether a query can safely run in a read transaction.
+
+    The check is conservative: anything that looks like a write clause, an admin
+    command or a call to a procedure not known to be read-only counts as a write.
+    """
+    masked, _ = mask_literals(cypher_query)
+    if _WRITE_KEYWORDS.search(masked):
+        return False
+    for match in _PROCEDURE_CALL.finditer(masked):
+        if not match.group(1).startswith(READ_ONLY_PROCEDURE_PREFIXES):
+            return False
+    return True
+
+
+def is_schema_or_admin_command(cypher_query: str) -> bool:
+    """Tell whether a query is a schema or admin command rather than a data query."""
+    masked, _ = mask_literals(cypher_query)
+    return bool(_SCHEMA_OR_ADMIN_COMMAND.search(masked))
+
+
+def strip_explain_or_profile(cypher_query: str) -> Tuple[str, str]:
+    """Split a leading EXPLAIN or PROFILE off a query.
+
+    Returns:
+        Tuple[str, str]: The upper-cased prefix ("" if none) and the remaining query.
+    """
+    match = _EXPLAIN_OR_PROFILE.match(cypher_query)
+    if not match:
+        return "", cypher_query
+    return match.group(1).upper(), cypher_query[match.end() :]
+
+
+def bound_variable_length_patterns(cypher_query: str, max_hops: int) -> Tuple[str, List[str]]:
+    """Give every unbounded variable-length relationship pattern an upper bound.
+
+    `[*]` becomes `[*..max_hops]` and `[r*2..]` becomes `[r*2..max_hops]`; bounded
+    patterns are left alone.
+
+    Returns:
+        Tuple[str, List[str]]: The rewritten query and a note per rewritten pattern.
+    """
+    masked, fragments = mask_literals(cypher_query)
+    notes: List[str] = []
+
+    def _bound(match: re.Match) -> str:
+        min_hops, dots, max_value = match.group("min"), match.group("dots"), match.group("max")
+        if max_value or (min_hops and not dots):
+            return match.group(0)
+        bounded = f"[{match.group('head')}*{min_hops}..{max_hops}]"
+        notes.append(
+            f"Unbounded pattern {unmask_literals(match.group(0), fragments)} was limited to "
+            f"{unmask_literals(bounded, fragments)}."
+        )
+        return bounded
+
+    rewritten = _VAR_LENGTH.sub(_bound, masked)
+    return unmask_literals(rewritten, fragments), notes
+
+
+def skip_rows_on_server(cypher_query: str, parameter: str) -> Optional[str]:
+    """Make a query skip its first rows itself, with a SKIP $parameter after its RETURN.
+
+    Only a single query ending in a top-level RETURN without SKIP or LIMIT is rewritten;
+    any other query (UNION, RETURN ... LIMIT, a bare procedure call) must skip the rows
+    client side.
+
+    Returns:
+        Optional[str]: The rewritten query, or None if it cannot be rewritten.
+    """
+    masked, fragments = mask_literals(cypher_query)
+    body = masked.rstrip()
+    if body.endswith(";"):
+        body = body[:-1].rstrip()
+    if ";" in body or _UNION.search(body):
+        return None
+    depth = 0
+    last_return = -1
+    for match in _BRACKET_OR_RETURN.finditer(body):
+        token = match.group(0)
+        if token in ("(", "[", "{"):
+            depth += 1
+        elif token in (")", "]", "}"):
+            depth -= 1
+        elif depth == 0:
+            last_return = match.end()
+    if last_return < 0 or _ROW_WINDOW.search(body, last_return):
+        return None
+    # On its own line, so that a trailing // comment cannot swallow it
+    return unmask_literals(f"{body}\nSKIP ${parameter}", fragments)
+
+
+def iter_plan_operators(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Walk an EXPLAIN/PROFILE plan (as returned by the driver) depth-first."""
+    stack = [plan]
+    while stack:
+        operator = stack.pop()
+        yield operator
+        stack.extend(operator.get("children") or [])
+
+
+def operator_name(operator: Dict[str, Any]) -> str:
+    """Return a plan operator's type without the runtime suffix (e.g. "AllNodesScan")."""
+    return str(operator.get("operatorType", "")).split("@")[0]
+
+
+def estimated_rows(operator: Dict[str, Any]) -> float:
+    """Return the planner's row estimate for an operator, 0 if it has none."""
+    # The driver returns plans as raw Bolt dicts, with the operator arguments under "args"
+    arguments = operator.get("args") or {}
+    try:
+        return float(arguments.get("EstimatedRows", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def find_plan_problems(plan: Dict[str, Any], budget: PlanBudget) -> List[str]:
+    """Check an estimated query plan against a budget.
+
+    Returns:
+        List[str]: One actionable message per violation; empty if the plan is acceptable.
+    """
+    problems: List[str] = []
+    largest_estimate = 0.0
+    for operator in iter_plan_operators(plan):
+        name = operator_name(operator)
+        rows = estimated_rows(operator)
+        largest_estimate = max(largest_estimate, rows)
+        if (
+            name == "CartesianProduct"
+            and not budget.allow_cartesian_product
+            and rows > budget.max_cartesian_product_rows
+        ):
+            problems.append(
+                f"The plan contains a CartesianProduct of about {int(rows)} rows: two or more "
+                "patterns are not connected. "
+                "Connect them through a relationship or a shared variable, or filter each side "
+                "with WHERE before combining them."
+            )
+        elif name == "AllNodesScan" and rows > budget.max_all_nodes_scan_rows:
+            problems.append(
+                f"The plan scans all nodes (about {int(rows)}). Add a label to the start node, "
+                "e.g. MATCH (s:ExperientialScene) instead of MATCH (s), and filter on an "
+                "indexed property."
+            )
+    if largest_estimate > budget.max_estimated_rows:
+        problems.append(
+            f"The planner estimates about {int(largest_estimate)} intermediate rows, over the "
+            f"budget of {int(budget.max_estimated_rows)}. Narrow the MATCH with labels and WHERE "
+            "conditions, shorten variable-length patterns, or add LIMIT early with WITH ... LIMIT."
+        )
+    return problems
+
+
+# Sorts after every ISO 8601 timestamp, the upper bound of a range open at the end
+TIMESTAMP_MAX = "\uffff"
+
+
+def _iso_prefix(bound: Optional[str]) -> Optional[str]:
+    bound = (bound or "").strip().replace(" ", "T")
+    return bound or None
+
+
+def timestamp_bounds(
+    start_time: Optional[str], end_time: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """Turn inclusive ISO 8601 prefix bounds into a half-open string range.
+
+    Timestamps are written as ISO 8601 strings, so '2023-11' as start_time is already the
+    smallest timestamp of that month, and every timestamp of the month sorts before
+    '2023-12' ('2023-11' with its last character incremented). The query can then compare
+    the timestamp property itself, which its range index serves.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The inclusive lower and exclusive upper bound,
+            None where no bound was given.
+    """
+    start, end = _iso_prefix(start_time), _iso_prefix(end_time)
+    return start, (end[:-1] + chr(ord(end[-1]) + 1) if end else None)
+
+
+def timestamp_range_predicate(
+    variable: str,
+    start_param: Optional[str],
+    end_param: Optional[str],
+    optional: bool = False,
+) -> str:
+    """Build the predicate on `variable.timestamp` for bounds from `timestamp_bounds`.
+
+    Args:
+        variable (str): The node variable.
+        start_param (Optional[str]): Parameter of the lower bound, None to leave it out.
+        end_param (Optional[str]): Parameter of the upper bound, None to leave it out.
+        optional (bool): Pass a bound whose parameter is null, so that one prepared text
+            serves every combination of bounds. Default: False
+
+    Returns:
+        str: The predicate, "true" if both parameters are left out.
+    """
+    conditions = []
+    for param, operator in ((start_param, ">="), (end_param, "<")):
+        if param is None:
+            continue
+        condition = f"{variable}.timestamp {operator} ${param}"
+        conditions.append(f"(${param} IS NULL OR {condition})" if optional else condition)
+    return " AND ".join(conditions) if conditions else "true"
@@ -1,22 +1,107 @@
+import hashlib
+import json
 from pathlib import Path
-from typing import List, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional
 
 from weaver.util.file import upload_file
 
+# Kept inside the data folder: file name -> content hash, uploaded file id, extraction status
+MANIFEST_FILE_NAME = ".weaver_manifest.json"
 
-def load_data_v1(folder_path_str: Optional[str] = None) -> List[str]:
-    """Load data for the first version of the data loader."""
+_manifest_lock = threading.Lock()
+
+
+def content_hash(file_path: Path) -> str:
+    """Return the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the ingestion manifest, empty if there is none or it is unreadable."""
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        print(f"Warning: ignoring unreadable manifest {manifest_path}")
+        return {}
+
+
+def save_manifest(manifest_path: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(manifest_path)
+
+
+def mark_extracted(file_ids: Iterable[str], folder_path_str: Optional[str] = None) -> None:
+    """Record that the files were extracted into the graph, so later runs skip them."""
+    manifest_path = Path(folder_path_str or "asset/text_data_v1") / MANIFEST_FILE_NAME
+    file_ids = set(file_ids)
+    with _manifest_lock:
+        manifest = load_manifest(manifest_path)
+        for entry in manifest.values():
+            if entry.get("file_id") in file_ids:
+                entry["extracted"] = True
+        save_manifest(manifest_path, manifest)
+
+
+def load_data_v1(folder_path_str: Optional[str] = None, incremental: bool = True) -> List[str]:
+    """Load data for the first version of the data loader.
+
+    With `incremental`, files whose content hash is in the folder's manifest are not
+    uploaded again, and only new, changed or not yet extracted files are returned. Call
+    `mark_extracted` once their extraction has finished.
+
+    Args:
+        folder_path_str (Optional[str]): Folder of *.txt files. Default: asset/text_data_v1
+        incremental (bool): Skip files the manifest records as extracted. Default: True
+
+    Returns:
+        List[str]: The file IDs to extract.
+    """
 
     folder_path = Path(folder_path_str or "asset/text_data_v1")
-    file_paths = []
+    manifest_path = folder_path / MANIFEST_FILE_NAME
 
     # Check if directory exists
     if not folder_path.exists():
         print(f"Warning: Directory {folder_path} does not exist")
         return []
 
-    # get all text file paths from the specified folder
-    for file_path in folder_path.glob("*.txt"):
-        file_paths.append(str(file_path))
+    with _manifest_lock:
+        manifest = load_manifest(manifest_path) if incremental else {}
+        file_ids: List[str] = []
+        to_upload: List[Path] = []
+        skipped = 0
+
+        # get all text file paths from the specified folder
+        for file_path in sorted(folder_path.glob("*.txt")):
+            digest = content_hash(file_path)
+            entry = manifest.get(file_path.name)
+            if entry is None or entry.get("sha256") != digest:
+                manifest[file_path.name] = {"sha256": digest, "extracted": False}
+                to_upload.append(file_path)
+            elif entry.get("extracted"):
+                skipped += 1
+            else:
+                # Uploaded by an earlier run whose extraction did not finish
+                file_ids.append(entry["file_id"])
+
+        for file_path, file_id in zip(
+            to_upload, upload_file([str(p) for p in to_upload]), strict=True
+        ):
+            manifest[file_path.name]["file_id"] = file_id
+            file_ids.append(file_id)
+
+        save_manifest(manifest_path, manifest)
 
-    return upload_file(file_paths)
+    print(
+        f"{len(to_upload)} new or changed files uploaded, {len(file_ids)} to extract, "
+        f"{skipped} unchanged files skipped"
+    )
+    return file_ids
@@ -0,0 +1,189 @@
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from chat2graph.core.common.system_env import SystemEnv
+
+from weaver.tool_resource.schema_reader import render_schema_summary
+from weaver.util.gazetteer import PlaceHints, canonicalize_places, link_scenes_to_season
+from weaver.util.graph_merge import merge_graph_fragments, parse_graph_fragment
+from weaver.util.schema import PREDEFINED_GRAPH_SCHEMA
+
+# One request, one answer: the whole note and the compact schema go into a single call
+EXTRACTION_SYSTEM_PROMPT = """你是一位资深的记忆考古学家和知识图谱构建师。
+请从用户给出的旅行日记中提取记忆元素，转化为符合下面Schema的节点与关系。
+
+{schema}
+
+要求：
+1. 提取日记中出现的每一个 ExperientialScene、FocalObservation、AffectiveResonance、
+   InteractionPoint、City、Season、Province，不要遗漏靠后的段落。
+2. 主键是描述性的、由小写英文单词和下划线组成的短语，不含数字；
+   timestamp 使用日记末尾 datetime(...) 中的时间或文中更准确的时间。
+3. 每个节点都要与其他节点相连：场景通过 CONSTRUCTED_FROM_ASSET 连接到给定的 DigitalAsset，
+   城市通过 BELONGS_TO_PROVINCE 连接到省份，场景通过 LOCATED_IN_CITY、OCCURRED_IN_SEASON
+   连接到城市和季节，其余节点按Schema连接到场景或其触发源。
+4. 不要生成 embed 属性，不要输出 DigitalAsset 节点本身。
+
+只输出一个 JSON 对象，格式为：
+{{"nodes": {{"NodeLabel": [{{"<primary_key>": "...", "...": "..."}}]}},
+ "relationships": {{"REL_TYPE": [{{"source_node": {{"label": "...", "key": "..."}},
+   "target_node": {{"label": "...", "key": "..."}}, "properties": {{}}}}]}}}}"""
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _llm_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+
+            _client = OpenAI(base_url=SystemEnv.LLM_ENDPOINT, api_key=SystemEnv.LLM_APIKEY)
+        return _client
+
+
+@dataclass
+class DirectExtraction:
+    """The validated graph of one note and what the call cost."""
+
+    graph: Dict[str, Any]
+    seconds: float  # the LLM call
+    import_seconds: float = 0.0  # set by the caller that writes the graph
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    problems: List[str] = field(default_factory=list)
+
+
+def validate_graph_data(
+    data: Dict[str, Any],
+    schema: Dict[str, Any] = PREDEFINED_GRAPH_SCHEMA,
+    known_nodes: Optional[Dict[str, set]] = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Keep the parts of extracted graph data that fit the schema.
+
+    Drops nodes of unknown labels or without a primary key value, properties the schema
+    does not define (and embed), relationships of unknown types, with labels the type does
+    not connect, or with an end that is neither extracted nor in `known_nodes`.
+
+    Args:
+        data (Dict[str, Any]): Graph data in the GraphImporter input format.
+        schema (Dict[str, Any]): The schema to validate against.
+        known_nodes (Optional[Dict[str, set]]): Primary key values per label of nodes that
+            are imported alongside, e.g. the note's DigitalAsset.
+
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: The valid graph data and the problems found.
+    """
+    problems: List[str] = []
+    present: Dict[str, set] = {label: set(keys) for label, keys in (known_nodes or {}).items()}
+    nodes: Dict[str, List[Dict[str, Any]]] = {}
+    for label, node_list in (data.get("nodes") or {}).items():
+        node_def = schema["nodes"].get(label)
+        if node_def is None:
+            problems.append(f"unknown label {label}")
+            continue
+        primary_key = node_def["primary_key"]
+        allowed = {prop["name"] for prop in node_def["properties"]} - {"embed"}
+        for node in node_list or []:
+            if not isinstance(node, dict) or not node.get(primary_key):
+                problems.append(f"{label} node without {primary_key}")
+                continue
+            dropped = sorted(set(node) - allowed)
+            if dropped:
+                problems.append(f"{label}({node[primary_key]}): dropped {', '.join(dropped)}")
+            nodes.setdefault(label, []).append({k: v for k, v in node.items() if k in allowed})
+            present.setdefault(label, set()).add(node[primary_key])
+
+    relationships: Dict[str, List[Dict[str, Any]]] = {}
+    for rel_type, rel_list in (data.get("relationships") or {}).items():
+        rel_def = schema["relationships"].get(rel_type)
+        if rel_def is None:
+            problems.append(f"unknown relationship type {rel_type}")
+            continue
+        for relationship in rel_list or []:
+            if not isinstance(relationship, dict):
+                problems.append(f"{rel_type} relationship that is not an object")
+                continue
+            source = relationship.get("source_node")
+            target = relationship.get("target_node")
+            if not isinstance(source, dict) or not isinstance(target, dict):
+                problems.append(f"{rel_type} relationship without source_node or target_node")
+                continue
+            if (
+                source.get("label") not in rel_def.get("source_vertex_labels", [])
+                or target.get("label") not in rel_def.get("target_vertex_labels", [])
+                or source.get("key") not in present.get(source.get("label"), set())
+                or target.get("key") not in present.get(target.get("label"), set())
+            ):
+                problems.append(
+                    f"{rel_type} {source.get('label')}({source.get('key')})->"
+                    f"{target.get('label')}({target.get('key')}) dropped"
+                )
+                continue
+            relationships.setdefault(rel_type, []).append(relationship)
+    return {"nodes": nodes, "relationships": relationships}, problems
+
+
+def extract_note(
+    text: str,
+    asset: Dict[str, Any],
+    client: Any = None,
+    model: Optional[str] = None,
+    places: Optional[PlaceHints] = None,
+) -> DirectExtraction:
+    """Extract the graph of one note with a single LLM call, without the agent tool loop.
+
+    Args:
+        text (str): The note, with its datetime(...) marker.
+        asset (Dict[str, Any]): The note's DigitalAsset node, imported with the result.
+        client (Any): OpenAI-compatible client. Default: one built from SystemEnv.LLM_*
+        model (Optional[str]): Model name. Default: SystemEnv.LLM_NAME
+        places (Optional[PlaceHints]): The note's gazetteer matches. The model is given
+            their keys, and their nodes and BELONGS_TO_PROVINCE edges join the result.
+
+    Returns:
+        DirectExtraction: The validated graph, including the DigitalAsset node.
+    """
+    client = client or _llm_client()
+    places = places or PlaceHints()
+    user_content = f"DigitalAsset 的 asset_name 是 `{asset['asset_name']}`。\n\n{text}"
+    if places.prompt():
+        user_content += "\n\n" + places.prompt()
+    started_at = time.perf_counter()
+    response = client.chat.completions.create(
+        model=model or SystemEnv.LLM_NAME,
+        messages=[
+            {
+                "role": "system",
+                "content": EXTRACTION_SYSTEM_PROMPT.format(
+                    schema=render_schema_summary(PREDEFINED_GRAPH_SCHEMA)
+                ),
+            },
+            {
+                "role": "user",
+                "content": user_content,
+            },
+        ],
+    )
+    seconds = time.perf_counter() - started_at
+    usage = getattr(response, "usage", None)
+
+    data = parse_graph_fragment(response.choices[0].message.content or "")
+    if data is None:
+        graph, problems = {"nodes": {}, "relationships": {}}, ["no JSON graph in the reply"]
+    else:
+        known_nodes = {"DigitalAsset": {asset["asset_name"]}, **places.known_nodes()}
+        graph, problems = validate_graph_data(canonicalize_places(data), known_nodes=known_nodes)
+        link_scenes_to_season(graph, places.season)
+    # Extracted place nodes renamed to a gazetteer key collapse into the gazetteer's node
+    graph = merge_graph_fragments([{"nodes": {"DigitalAsset": [asset]}}, places.graph(), graph])
+    return DirectExtraction(
+        graph=graph,
+        seconds=seconds,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        problems=problems,
+    )
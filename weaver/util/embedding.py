@@ -1,8 +1,115 @@
-from typing import List, Optional
+from dataclasses import dataclass
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 from chat2graph.core.common.system_env import SystemEnv
 import requests
 
+# 向量索引配置的环境变量，未设置时使用 EmbeddingSettings 的默认值
+EMBEDDING_DIMENSIONS_ENV = "WEAVER_EMBEDDING_DIMENSIONS"
+VECTOR_SIMILARITY_ENV = "WEAVER_VECTOR_SIMILARITY"
+VECTOR_HNSW_M_ENV = "WEAVER_VECTOR_HNSW_M"
+VECTOR_HNSW_EF_CONSTRUCTION_ENV = "WEAVER_VECTOR_HNSW_EF_CONSTRUCTION"
+VECTOR_QUANTIZATION_ENV = "WEAVER_VECTOR_QUANTIZATION"
+
+# HNSW 参数和量化从 Neo4j 5.18 起才能在 indexConfig 中设置
+HNSW_OPTIONS_MIN_NEO4J_VERSION = (5, 18)
+
+
+# 节点上记录生成 embed 所用模型的属性，模型切换后可据此找出过期的向量
+EMBED_MODEL_PROPERTY = "embed_model"
+
+
+def current_embedding_model() -> str:
+    """当前配置的 embedding 模型名称"""
+    return SystemEnv.EMBEDDING_MODEL_NAME
+
+
+def embedding_text(properties: Dict[str, Any], primary_value: Any) -> str:
+    """生成节点 embedding 所用的文本：优先使用 description，否则使用主键值
+
+    Args:
+        properties (Dict[str, Any]): 节点属性
+        primary_value (Any): 节点主键值
+
+    Returns:
+        str: 用于 embedding 的文本
+    """
+    return properties.get("description") or str(primary_value)
+
+
+@dataclass(frozen=True)
+class EmbeddingSettings:
+    """Embedding 向量和向量索引的配置
+
+    Attributes:
+        dimensions (int): 向量维度，必须与 embedding 模型的输出一致
+        similarity_function (str): 相似度函数，'cosine' 或 'euclidean'
+        hnsw_m (int): HNSW 图中每个节点的连接数，越大召回越高、索引越大
+        hnsw_ef_construction (int): 建索引时的候选数，越大召回越高、构建越慢
+        quantization_enabled (bool): 是否量化存储向量，节省内存但略降召回
+    """
+
+    dimensions: int = 1024
+    similarity_function: str = "cosine"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 100
+    quantization_enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingSettings":
+        """从环境变量读取配置"""
+        defaults = cls()
+        quantization = os.environ.get(VECTOR_QUANTIZATION_ENV)
+        return cls(
+            dimensions=int(os.environ.get(EMBEDDING_DIMENSIONS_ENV) or defaults.dimensions),
+            similarity_function=(
+                os.environ.get(VECTOR_SIMILARITY_ENV) or defaults.similarity_function
+            ).lower(),
+            hnsw_m=int(os.environ.get(VECTOR_HNSW_M_ENV) or defaults.hnsw_m),
+            hnsw_ef_construction=int(
+                os.environ.get(VECTOR_HNSW_EF_CONSTRUCTION_ENV) or defaults.hnsw_ef_construction
+            ),
+            quantization_enabled=(
+                defaults.quantization_enabled
+                if not quantization
+                else quantization.lower() in ("1", "true", "yes", "on")
+            ),
+        )
+
+    def index_config(self, neo4j_version: Optional[Tuple[int, ...]] = None) -> Dict[str, Any]:
+        """生成向量索引的 indexConfig
+
+        Args:
+            neo4j_version (Optional[Tuple[int, ...]]): 服务器版本，如 (5, 20)；
+                未知或低于 5.18 时只包含维度和相似度函数
+
+        Returns:
+            Dict[str, Any]: indexConfig 选项
+        """
+        config: Dict[str, Any] = {
+            "vector.dimensions": self.dimensions,
+            "vector.similarity_function": self.similarity_function,
+        }
+        if neo4j_version is not None and neo4j_version >= HNSW_OPTIONS_MIN_NEO4J_VERSION:
+            config["vector.hnsw.m"] = self.hnsw_m
+            config["vector.hnsw.ef_construction"] = self.hnsw_ef_construction
+            config["vector.quantization.enabled"] = self.quantization_enabled
+        return config
+
+    def index_options(self, neo4j_version: Optional[Tuple[int, ...]] = None) -> str:
+        """生成 CREATE VECTOR INDEX 的 OPTIONS 子句"""
+        entries = []
+        for key, value in self.index_config(neo4j_version).items():
+            if isinstance(value, bool):
+                literal = "true" if value else "false"
+            elif isinstance(value, str):
+                literal = f"'{value}'"
+            else:
+                literal = str(value)
+            entries.append(f"`{key}`: {literal}")
+        return "OPTIONS { indexConfig: {" + ", ".join(entries) + "} }"
+
 
 def get_embed_vec(text: str) -> Optional[List[float]]:
     """获取文本的 embedding 向量
@@ -13,12 +120,26 @@ def get_embed_vec(text: str) -> Optional[List[float]]:
     Returns:
         Optional[List[float]]: embedding 向量，如果失败返回 None
     """
-    # 从环境变量获取配置
+    vectors = get_embed_vecs([text])
+    return vectors[0] if vectors else None
+
+
+def get_embed_vecs(texts: List[str]) -> Optional[List[List[float]]]:
+    """在一次请求中批量获取多条文本的 embedding 向量
+
+    Args:
+        texts (List[str]): 输入文本列表
+
+    Returns:
+        Optional[List[List[float]]]: 与输入顺序一致的 embedding 向量列表，如果失败返回 None
+    """
+    if not texts:
+        return []
+
     model_name: str = SystemEnv.EMBEDDING_MODEL_NAME
     endpoint: str = SystemEnv.EMBEDDING_MODEL_ENDPOINT
     api_key: str = SystemEnv.EMBEDDING_MODEL_APIKEY
 
-    # 构建请求
     headers = {
         'Authorization': f'Bearer {api_key}',
         'Content-Type': 'application/json'
@@ -26,28 +147,28 @@ def get_embed_vec(text: str) -> Optional[List[float]]:
 
     data = {
         'model': model_name,
-        'input': text,
+        'input': texts,
         'encoding_format': 'float'
     }
 
     try:
-        response = requests.post(endpoint, headers=headers, json=data, timeout=30)
+        response = requests.post(endpoint, headers=headers, json=data, timeout=60)
         response.raise_for_status()
 
         result = response.json()
 
-        # 提取 embedding 向量
-        if 'data' in result and len(result['data']) > 0:
-            return result['data'][0]['embedding']
-        else:
-            print(f"API 响应格式异常: {result}")
+        # 按 index 排序，保证与输入顺序一致
+        items = sorted(result.get('data', []), key=lambda item: item.get('index', 0))
+        if len(items) != len(texts):
+            print(f"API 响应数量与输入不一致: 期望 {len(texts)}，实际 {len(items)}")
             return None
+        return [item['embedding'] for item in items]
 
     except requests.exceptions.RequestException as e:
-        print(f"请求失败: {e}")
+        print(f"批量请求失败: {e}")
         return None
     except Exception as e:
-        print(f"处理响应时出错: {e}")
+        print(f"处理批量响应时出错: {e}")
         return None
 
 
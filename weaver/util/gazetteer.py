@@ -0,0 +1,432 @@
+from collections import deque
+from dataclasses import dataclass, field
+import re
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+# Canonical keys of the place and season nodes, so that every note and every extraction job
+# uses the same City, Province and Season nodes
+
+# province_name -> chinese_name, short names it is written as
+PROVINCES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "beijing": ("北京市", ()),
+    "tianjin": ("天津市", ()),
+    "shanghai": ("上海市", ()),
+    "chongqing": ("重庆市", ()),
+    "hebei": ("河北省", ("河北",)),
+    "shanxi": ("山西省", ("山西",)),
+    "liaoning": ("辽宁省", ("辽宁",)),
+    "jilin": ("吉林省", ()),
+    "heilongjiang": ("黑龙江省", ("黑龙江",)),
+    "jiangsu": ("江苏省", ("江苏",)),
+    "zhejiang": ("浙江省", ("浙江",)),
+    "anhui": ("安徽省", ("安徽",)),
+    "fujian": ("福建省", ("福建",)),
+    "jiangxi": ("江西省", ("江西",)),
+    "shandong": ("山东省", ("山东",)),
+    "henan": ("河南省", ("河南",)),
+    "hubei": ("湖北省", ("湖北",)),
+    "hunan": ("湖南省", ("湖南",)),
+    "guangdong": ("广东省", ("广东",)),
+    "hainan": ("海南省", ("海南",)),
+    "sichuan": ("四川省", ("四川",)),
+    "guizhou": ("贵州省", ("贵州",)),
+    "yunnan": ("云南省", ("云南",)),
+    "shaanxi": ("陕西省", ("陕西",)),
+    "gansu": ("甘肃省", ("甘肃",)),
+    "qinghai": ("青海省", ("青海",)),
+    "taiwan": ("台湾省", ("台湾",)),
+    "inner_mongolia": ("内蒙古自治区", ("内蒙古",)),
+    "guangxi": ("广西壮族自治区", ("广西",)),
+    "tibet": ("西藏自治区", ("西藏",)),
+    "ningxia": ("宁夏回族自治区", ("宁夏",)),
+    "xinjiang": ("新疆维吾尔自治区", ("新疆",)),
+    "hong_kong": ("香港特别行政区", ()),
+    "macau": ("澳门特别行政区", ()),
+}
+
+# city_name -> chinese_name, province_name. Names that are common words or other places
+# (开封 "to unseal", 北海 in 北海公园) are left out rather than risk false matches.
+CITIES: Dict[str, Tuple[str, str]] = {
+    "beijing": ("北京", "beijing"),
+    "tianjin": ("天津", "tianjin"),
+    "shanghai": ("上海", "shanghai"),
+    "chongqing": ("重庆", "chongqing"),
+    "shijiazhuang": ("石家庄", "hebei"),
+    "qinhuangdao": ("秦皇岛", "hebei"),
+    "chengde": ("承德", "hebei"),
+    "taiyuan": ("太原", "shanxi"),
+    "shenyang": ("沈阳", "liaoning"),
+    "dalian": ("大连", "liaoning"),
+    "changchun": ("长春", "jilin"),
+    "jilin": ("吉林", "jilin"),
+    "harbin": ("哈尔滨", "heilongjiang"),
+    "nanjing": ("南京", "jiangsu"),
+    "suzhou": ("苏州", "jiangsu"),
+    "wuxi": ("无锡", "jiangsu"),
+    "yangzhou": ("扬州", "jiangsu"),
+    "changzhou": ("常州", "jiangsu"),
+    "zhenjiang": ("镇江", "jiangsu"),
+    "hangzhou": ("杭州", "zhejiang"),
+    "ningbo": ("宁波", "zhejiang"),
+    "wenzhou": ("温州", "zhejiang"),
+    "shaoxing": ("绍兴", "zhejiang"),
+    "jiaxing": ("嘉兴", "zhejiang"),
+    "huzhou": ("湖州", "zhejiang"),
+    "zhoushan": ("舟山", "zhejiang"),
+    "hefei": ("合肥", "anhui"),
+    "huangshan": ("黄山", "anhui"),
+    "fuzhou": ("福州", "fujian"),
+    "xiamen": ("厦门", "fujian"),
+    "quanzhou": ("泉州", "fujian"),
+    "nanchang": ("南昌", "jiangxi"),
+    "jingdezhen": ("景德镇", "jiangxi"),
+    "jiujiang": ("九江", "jiangxi"),
+    "jinan": ("济南", "shandong"),
+    "qingdao": ("青岛", "shandong"),
+    "yantai": ("烟台", "shandong"),
+    "weihai": ("威海", "shandong"),
+    "taian": ("泰安", "shandong"),
+    "zhengzhou": ("郑州", "henan"),
+    "luoyang": ("洛阳", "henan"),
+    "wuhan": ("武汉", "hubei"),
+    "yichang": ("宜昌", "hubei"),
+    "changsha": ("长沙", "hunan"),
+    "zhangjiajie": ("张家界", "hunan"),
+    "guangzhou": ("广州", "guangdong"),
+    "shenzhen": ("深圳", "guangdong"),
+    "zhuhai": ("珠海", "guangdong"),
+    "foshan": ("佛山", "guangdong"),
+    "shantou": ("汕头", "guangdong"),
+    "haikou": ("海口", "hainan"),
+    "sanya": ("三亚", "hainan"),
+    "chengdu": ("成都", "sichuan"),
+    "leshan": ("乐山", "sichuan"),
+    "guiyang": ("贵阳", "guizhou"),
+    "kunming": ("昆明", "yunnan"),
+    "dali": ("大理", "yunnan"),
+    "lijiang": ("丽江", "yunnan"),
+    "xishuangbanna": ("西双版纳", "yunnan"),
+    "xian": ("西安", "shaanxi"),
+    "lanzhou": ("兰州", "gansu"),
+    "dunhuang": ("敦煌", "gansu"),
+    "xining": ("西宁", "qinghai"),
+    "taipei": ("台北", "taiwan"),
+    "hohhot": ("呼和浩特", "inner_mongolia"),
+    "nanning": ("南宁", "guangxi"),
+    "guilin": ("桂林", "guangxi"),
+    "lhasa": ("拉萨", "tibet"),
+    "yinchuan": ("银川", "ningxia"),
+    "urumqi": ("乌鲁木齐", "xinjiang"),
+    "kashgar": ("喀什", "xinjiang"),
+    "hong_kong": ("香港", "hong_kong"),
+    "macau": ("澳门", "macau"),
+}
+
+# Common words that contain a place name (大理石 is marble, 长春藤 ivy). As patterns of
+# their own they win the leftmost-longest match over the name inside them, and are dropped.
+NOT_PLACES: Tuple[str, ...] = ("大理石", "长春藤", "出海口", "入海口", "香港脚")
+
+# season_name -> chinese_name, words that name it in a note
+SEASONS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "spring": ("春天", ("春天", "春季", "春日")),
+    "summer": ("夏天", ("夏天", "夏季", "夏日", "盛夏")),
+    "autumn": ("秋天", ("秋天", "秋季", "秋日", "深秋")),
+    "winter": ("冬天", ("冬天", "冬季", "冬日", "隆冬")),
+}
+
+# Meteorological seasons of the northern hemisphere
+_MONTH_SEASONS = {
+    **dict.fromkeys((3, 4, 5), "spring"),
+    **dict.fromkeys((6, 7, 8), "summer"),
+    **dict.fromkeys((9, 10, 11), "autumn"),
+    **dict.fromkeys((12, 1, 2), "winter"),
+}
+_MONTH_IN_TEXT = re.compile(
+    r"(?<![0-9一二三四五六七八九十])(1[0-2]|0?[1-9]|十[一二]?|[一二三四五六七八九])月"
+)
+_CHINESE_MONTHS = {
+    name: number
+    for number, name in enumerate("一 二 三 四 五 六 七 八 九 十 十一 十二".split(), start=1)
+}
+_MONTH_IN_TIMESTAMP = re.compile(r"^\d{4}-(\d{2})")
+
+T = TypeVar("T")
+
+
+class MultiPatternMatcher(Generic[T]):
+    """Aho-Corasick automaton: finds all of many patterns in one pass over a text."""
+
+    def __init__(self, patterns: Dict[str, T]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, T]]] = [[]]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._outputs[state].append((len(pattern), value))
+
+        # Breadth-first, so that the failure state of a node is complete before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0) if state else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+    def find(self, text: str) -> List[Tuple[int, int, T]]:
+        """Return the leftmost-longest, non-overlapping matches as (start, end, value)."""
+        matches: List[Tuple[int, int, T]] = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._outputs[state]:
+                matches.append((i + 1 - length, i + 1, value))
+
+        selected: List[Tuple[int, int, T]] = []
+        covered_until = 0
+        for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+            if start >= covered_until:
+                selected.append((start, end, value))
+                covered_until = end
+        return selected
+
+
+_matcher: Optional[MultiPatternMatcher[Optional[Tuple[str, str]]]] = None
+
+
+def _place_matcher() -> MultiPatternMatcher[Optional[Tuple[str, str]]]:
+    global _matcher
+    if _matcher is None:
+        patterns: Dict[str, Optional[Tuple[str, str]]] = dict.fromkeys(NOT_PLACES)
+        for province, (chinese_name, short_names) in PROVINCES.items():
+            for name in (chinese_name, *short_names):
+                patterns[name] = ("Province", province)
+        # A city wins over a province of the same short name (北京, 吉林)
+        for city, (chinese_name, _) in CITIES.items():
+            patterns[chinese_name] = ("City", city)
+            patterns[f"{chinese_name}市"] = ("City", city)
+        for season, (_, words) in SEASONS.items():
+            for word in words:
+                patterns[word] = ("Season", season)
+        _matcher = MultiPatternMatcher(patterns)
+    return _matcher
+
+
+def _place_matches(text: str) -> List[Tuple[str, str]]:
+    """Return the (label, key) of every place and season word in the text, in order."""
+    return [value for _, _, value in _place_matcher().find(text) if value is not None]
+
+
+def season_of(text: str, timestamp: Optional[str] = None) -> Optional[str]:
+    """Return the season a note names, else that of the first month it mentions or its date."""
+    for label, key in _place_matches(text):
+        if label == "Season":
+            return key
+    months = _MONTH_IN_TEXT.findall(text)
+    if months:
+        month = _CHINESE_MONTHS.get(months[0]) or int(months[0])
+        return _MONTH_SEASONS[month]
+    match = _MONTH_IN_TIMESTAMP.match(timestamp or "")
+    return _MONTH_SEASONS.get(int(match.group(1))) if match else None
+
+
+def _city_node(city: str) -> Dict[str, Any]:
+    return {"city_name": city, "chinese_name": CITIES[city][0]}
+
+
+def _province_node(province: str) -> Dict[str, Any]:
+    return {"province_name": province, "chinese_name": PROVINCES[province][0]}
+
+
+def _relationship(source: Tuple[str, str], target: Tuple[str, str]) -> Dict[str, Any]:
+    return {
+        "source_node": {"label": source[0], "key": source[1]},
+        "target_node": {"label": target[0], "key": target[1]},
+        "properties": {},
+    }
+
+
+@dataclass
+class PlaceHints:
+    """The canonical City, Province and Season nodes of one or more notes."""
+
+    cities: List[str] = field(default_factory=list)
+    provinces: List[str] = field(default_factory=list)
+    seasons: List[str] = field(default_factory=list)
+
+    @classmethod
+    def combine(cls, hints: Iterable["PlaceHints"]) -> "PlaceHints":
+        """Merge the hints of several notes, e.g. the files of one extraction batch."""
+        combined = cls()
+        for hint in hints:
+            for mine, theirs in (
+                (combined.cities, hint.cities),
+                (combined.provinces, hint.provinces),
+                (combined.seasons, hint.seasons),
+            ):
+                mine.extend(key for key in theirs if key not in mine)
+        return combined
+
+    @property
+    def season(self) -> Optional[str]:
+        """The season of a single note, None if there is none or several."""
+        return self.seasons[0] if len(self.seasons) == 1 else None
+
+    def graph(self) -> Dict[str, Any]:
+        """Return the place and season nodes with their BELONGS_TO_PROVINCE edges."""
+        nodes: Dict[str, List[Dict[str, Any]]] = {}
+        if self.cities:
+            nodes["City"] = [_city_node(city) for city in self.cities]
+        if self.provinces:
+            nodes["Province"] = [_province_node(province) for province in self.provinces]
+        if self.seasons:
+            nodes["Season"] = [
+                {"season_name": season, "chinese_name": SEASONS[season][0]}
+                for season in self.seasons
+            ]
+        edges = [
+            _relationship(("City", city), ("Province", CITIES[city][1])) for city in self.cities
+        ]
+        return {"nodes": nodes, "relationships": {"BELONGS_TO_PROVINCE": edges} if edges else {}}
+
+    def known_nodes(self) -> Dict[str, set]:
+        """Return the primary keys per label of the nodes in `graph()`."""
+        return {
+            "City": set(self.cities),
+            "Province": set(self.provinces),
+            "Season": set(self.seasons),
+        }
+
+    def prompt(self) -> str:
+        """Tell the extraction model which keys to use; empty if the notes name no place."""
+        lines = []
+        if self.cities:
+            lines.append(
+                "City: " + ", ".join(f"{CITIES[city][0]} -> `{city}`" for city in self.cities)
+            )
+        if self.provinces:
+            lines.append(
+                "Province: " + ", ".join(f"{PROVINCES[p][0]} -> `{p}`" for p in self.provinces)
+            )
+        if self.seasons:
+            lines.append("Season: " + ", ".join(f"{SEASONS[s][0]} -> `{s}`" for s in self.seasons))
+        if not lines:
+            return ""
+        return (
+            "以下城市、省份和季节节点及 BELONGS_TO_PROVINCE 关系已由系统创建，"
+            "建立 LOCATED_IN_CITY、OCCURRED_IN_SEASON 关系时请直接使用这些主键，"
+            "不要为它们另起主键：\n" + "\n".join(lines)
+        )
+
+
+def pre_extract(text: str, timestamp: Optional[str] = None) -> PlaceHints:
+    """Find the cities, provinces and season of a note with the gazetteer.
+
+    A matched city brings its province along, so that every city can be linked.
+
+    Args:
+        text (str): The note.
+        timestamp (Optional[str]): The note's datetime(...) marker, the last resort for
+            the season.
+
+    Returns:
+        PlaceHints: The canonical keys, in order of first mention.
+    """
+    season = season_of(text, timestamp)
+    hints = PlaceHints(seasons=[season] if season else [])
+    for label, key in _place_matches(text):
+        if label == "City" and key not in hints.cities:
+            hints.cities.append(key)
+        elif label == "Province" and key not in hints.provinces:
+            hints.provinces.append(key)
+    for city in hints.cities:
+        if CITIES[city][1] not in hints.provinces:
+            hints.provinces.append(CITIES[city][1])
+    return hints
+
+
+def _canonical_key(label: str, node: Dict[str, Any], primary_key: str) -> Optional[str]:
+    chinese_name = str(node.get("chinese_name") or "")
+    key = str(node.get(primary_key) or "")
+    if label == "City":
+        stripped = re.sub(r"_city$", "", key)
+        if stripped in CITIES:
+            return stripped
+        for city, (name, _) in CITIES.items():
+            if chinese_name in (name, f"{name}市"):
+                return city
+    elif label == "Province":
+        stripped = re.sub(r"_province$", "", key)
+        if stripped in PROVINCES:
+            return stripped
+        for province, (name, short_names) in PROVINCES.items():
+            if chinese_name == name or chinese_name in short_names:
+                return province
+    elif label == "Season":
+        for season, (name, words) in SEASONS.items():
+            if key == season or chinese_name == name or chinese_name in words:
+                return season
+    return None
+
+
+_PLACE_PRIMARY_KEYS = {"City": "city_name", "Province": "province_name", "Season": "season_name"}
+
+
+def canonicalize_places(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename City, Province and Season nodes the model extracted to their gazetteer keys.
+
+    E.g. City `hangzhou_city` or any City with chinese_name 杭州 becomes `hangzhou`. The
+    relationships that reference a renamed node are updated. Duplicates this creates are
+    left for merge_graph_fragments to collapse.
+    """
+    renamed: Dict[Tuple[str, str], str] = {}
+    for label, primary_key in _PLACE_PRIMARY_KEYS.items():
+        for node in graph.get("nodes", {}).get(label, []) or []:
+            # Malformed entries are left for validate_graph_data to report
+            if not isinstance(node, dict):
+                continue
+            canonical = _canonical_key(label, node, primary_key)
+            if canonical and canonical != node.get(primary_key):
+                renamed[(label, node.get(primary_key))] = canonical
+                node[primary_key] = canonical
+    for rel_list in (graph.get("relationships") or {}).values():
+        for relationship in rel_list or []:
+            if not isinstance(relationship, dict):
+                continue
+            for end in ("source_node", "target_node"):
+                ref = relationship.get(end)
+                if not isinstance(ref, dict):
+                    continue
+                canonical = renamed.get((ref.get("label"), ref.get("key")))
+                if canonical:
+                    ref["key"] = canonical
+    return graph
+
+
+def link_scenes_to_season(graph: Dict[str, Any], season: Optional[str]) -> Dict[str, Any]:
+    """Add OCCURRED_IN_SEASON from every scene of a note that has none to the note's season."""
+    if not season:
+        return graph
+    relationships = graph.setdefault("relationships", {})
+    edges = relationships.setdefault("OCCURRED_IN_SEASON", [])
+    linked = {edge.get("source_node", {}).get("key") for edge in edges}
+    for scene in graph.get("nodes", {}).get("ExperientialScene", []) or []:
+        if scene.get("scene_name") and scene["scene_name"] not in linked:
+            edges.append(
+                _relationship(("ExperientialScene", scene["scene_name"]), ("Season", season))
+            )
+    if not edges:
+        del relationships["OCCURRED_IN_SEASON"]
+    return graph
@@ -0,0 +1,99 @@
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from weaver.util.schema import get_primary_key
+
+_JSON_BLOCK = re.compile(r"```(?:json)?\s*(?P<body>\{.*?\})\s*```", re.DOTALL)
+
+
+def parse_graph_fragment(reply: str) -> Optional[Dict[str, Any]]:
+    """Extract the graph data of an extraction reply, in the GraphImporter input format.
+
+    The reply is expected to hold a JSON object with "nodes" and "relationships", either in
+    a ```json block or as the whole reply. Returns None if there is no such object.
+    """
+    candidates = [match.group("body") for match in _JSON_BLOCK.finditer(reply)]
+    start, end = reply.find("{"), reply.rfind("}")
+    if start != -1 and end > start:
+        candidates.append(reply[start : end + 1])
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and ("nodes" in data or "relationships" in data):
+            return {
+                "nodes": data.get("nodes") or {},
+                "relationships": data.get("relationships") or {},
+            }
+    return None
+
+
+def _merge_properties(merged: Dict[str, Any], incoming: Dict[str, Any]) -> None:
+    # Values fill gaps; of two different texts the longer, usually more specific, one wins
+    for key, value in incoming.items():
+        if value in (None, "", []):
+            continue
+        current = merged.get(key)
+        if current in (None, "", []):
+            merged[key] = value
+        elif isinstance(current, str) and isinstance(value, str) and len(value) > len(current):
+            merged[key] = value
+
+
+def merge_graph_fragments(
+    fragments: Iterable[Dict[str, Any]],
+    primary_key_for: Callable[[str], str] = get_primary_key,
+) -> Dict[str, Any]:
+    """Merge graph fragments into one import, deduplicating nodes and relationships.
+
+    Nodes are identified by label and primary key and their properties merged; nodes
+    without a primary key value are dropped. Relationships are identified by type and the
+    keys of both ends, so that chunks mentioning the same connection import it once.
+
+    Args:
+        fragments (Iterable[Dict[str, Any]]): Graph data in the GraphImporter input format.
+        primary_key_for (Callable[[str], str]): Returns the primary key of a node label.
+
+    Returns:
+        Dict[str, Any]: The merged graph data, in the same format.
+    """
+    nodes: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    relationships: Dict[Tuple[str, str, Any, str, Any], Dict[str, Any]] = {}
+
+    for fragment in fragments:
+        for label, node_list in (fragment.get("nodes") or {}).items():
+            primary_key = primary_key_for(label)
+            for node in node_list or []:
+                key = node.get(primary_key)
+                if not key:
+                    continue
+                _merge_properties(nodes.setdefault((label, key), {}), node)
+
+        for rel_type, rel_list in (fragment.get("relationships") or {}).items():
+            for relationship in rel_list or []:
+                source = relationship.get("source_node") or {}
+                target = relationship.get("target_node") or {}
+                rel_key = (
+                    rel_type,
+                    source.get("label"),
+                    source.get("key"),
+                    target.get("label"),
+                    target.get("key"),
+                )
+                if not all(rel_key):
+                    continue
+                merged = relationships.setdefault(
+                    rel_key,
+                    {"source_node": dict(source), "target_node": dict(target), "properties": {}},
+                )
+                _merge_properties(merged["properties"], relationship.get("properties") or {})
+
+    merged_nodes: Dict[str, List[Dict[str, Any]]] = {}
+    for (label, _), node in nodes.items():
+        merged_nodes.setdefault(label, []).append(node)
+    merged_relationships: Dict[str, List[Dict[str, Any]]] = {}
+    for rel_key, relationship in relationships.items():
+        merged_relationships.setdefault(rel_key[0], []).append(relationship)
+    return {"nodes": merged_nodes, "relationships": merged_relationships}
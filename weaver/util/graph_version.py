@@ -0,0 +1,25 @@
+import threading
+
+_lock = threading.Lock()
+_graph_version: int = 0
+
+
+def get_graph_version() -> int:
+    """Returns the current graph write-version of this process.
+
+    Caches of graph reads store the version they were computed at and treat any
+    entry with an older version as stale.
+    """
+    return _graph_version
+
+
+def bump_graph_version() -> int:
+    """Marks the graph as modified and returns the new write-version.
+
+    Every tool that writes to the graph database must call this after the write,
+    so that cached retrieval results computed before the write are invalidated.
+    """
+    global _graph_version
+    with _lock:
+        _graph_version += 1
+        return _graph_version
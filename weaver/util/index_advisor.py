@@ -0,0 +1,222 @@
+import argparse
+from collections import Counter
+from pathlib import Path
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from weaver.util.cypher import mask_literals
+from weaver.util.query_log import load_query_log, query_log_path
+
+# A property must be looked up in at least this many logged statements to earn an index
+MIN_LOGGED_LOOKUPS = 5
+
+# (node label, property) of a range index
+IndexedProperty = Tuple[str, str]
+
+# A node pattern binding a variable to a label, with an optional inline property map
+_NODE_PATTERN = re.compile(
+    r"\(\s*(?P<var>\w+)\s*:\s*(?P<label>\w+)[^(){}]*(?:\{(?P<map>[^{}]*)\})?"
+)
+_MAP_KEY = re.compile(r"(\w+)\s*:")
+_PROPERTY_ACCESS = re.compile(r"\b(\w+)\.(\w+)\b")
+# A WHERE clause, up to the next clause or the end of the enclosing subquery
+_WHERE_CLAUSE = re.compile(
+    r"\bWHERE\b(?P<predicate>.*?)(?=\b(?:RETURN|WITH|MATCH|OPTIONAL|ORDER|UNWIND|CALL|MERGE"
+    r"|CREATE|SET|DELETE|LIMIT|SKIP|UNION)\b|[}]|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def annotated_index_properties(schema: Dict[str, Any]) -> Set[IndexedProperty]:
+    """Return the properties the schema marks with "indexed": True."""
+    return {
+        (node_label, prop["name"])
+        for node_label, node_def in schema.get("nodes", {}).items()
+        for prop in node_def.get("properties", [])
+        if prop.get("indexed")
+    }
+
+
+def lookup_properties(cypher_query: str, schema: Dict[str, Any]) -> Set[IndexedProperty]:
+    """Find the node properties a query looks nodes up by.
+
+    Counts inline property maps of labelled node patterns, e.g. (c:City {chinese_name: $x}),
+    and properties of labelled variables compared in WHERE clauses. Primary keys (backed by
+    their uniqueness constraint), embeddings and properties not in the schema are left out.
+    """
+    masked, _ = mask_literals(cypher_query)
+    schema_nodes = schema.get("nodes", {})
+
+    def _known(node_label: str, prop_name: str) -> bool:
+        node_def = schema_nodes.get(node_label)
+        if node_def is None or prop_name in ("embed", node_def.get("primary_key", "id")):
+            return False
+        return any(prop.get("name") == prop_name for prop in node_def.get("properties", []))
+
+    bindings: Dict[str, str] = {}
+    found: Set[IndexedProperty] = set()
+    for match in _NODE_PATTERN.finditer(masked):
+        bindings[match.group("var")] = match.group("label")
+        for key in _MAP_KEY.findall(match.group("map") or ""):
+            if _known(match.group("label"), key):
+                found.add((match.group("label"), key))
+    for clause in _WHERE_CLAUSE.finditer(masked):
+        for variable, prop_name in _PROPERTY_ACCESS.findall(clause.group("predicate")):
+            node_label = bindings.get(variable)
+            if node_label and _known(node_label, prop_name):
+                found.add((node_label, prop_name))
+    return found
+
+
+def logged_lookup_counts(
+    entries: Iterable[Dict[str, Any]], schema: Dict[str, Any]
+) -> "Counter[IndexedProperty]":
+    """Count in how many logged statements each property is looked up."""
+    counts: Counter[IndexedProperty] = Counter()
+    parsed: Dict[str, Set[IndexedProperty]] = {}
+    for entry in entries:
+        query = entry.get("query", "")
+        if query not in parsed:
+            parsed[query] = lookup_properties(query, schema)
+        counts.update(parsed[query])
+    return counts
+
+
+def plan_range_indexes(
+    schema: Dict[str, Any],
+    entries: Optional[Iterable[Dict[str, Any]]] = None,
+    min_lookups: int = MIN_LOGGED_LOOKUPS,
+) -> Set[IndexedProperty]:
+    """Choose the range indexes to create: annotated properties plus frequent logged lookups."""
+    planned = annotated_index_properties(schema)
+    if entries is not None:
+        counts = logged_lookup_counts(entries, schema)
+        planned |= {key for key, count in counts.items() if count >= min_lookups}
+    return planned
+
+
+def load_logged_lookups(path: Optional[Path] = None) -> Optional[List[Dict[str, Any]]]:
+    """Read the query log if there is one, None otherwise."""
+    path = path or query_log_path()
+    if path is None or not path.exists():
+        return None
+    return load_query_log(path)
+
+
+def index_report(
+    schema: Dict[str, Any],
+    entries: Optional[List[Dict[str, Any]]],
+    existing_indexes: Optional[List[Dict[str, Any]]] = None,
+    min_lookups: int = MIN_LOGGED_LOOKUPS,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Compare the planned range indexes with the logged lookups and the database.
+
+    Args:
+        schema: The schema definition dictionary.
+        entries: Query log entries, or None if there is no log.
+        existing_indexes: Rows of SHOW INDEXES (name, type, entityType, labelsOrTypes,
+            properties, owningConstraint, readCount), or None to skip the comparison.
+        min_lookups: Logged lookups a property needs to be planned without annotation.
+
+    Returns:
+        "planned", "missing" and "unused" lists of indexes with their evidence.
+    """
+    annotated = annotated_index_properties(schema)
+    counts = logged_lookup_counts(entries or [], schema)
+    planned = plan_range_indexes(schema, entries, min_lookups)
+
+    def _evidence(key: IndexedProperty) -> Dict[str, Any]:
+        return {
+            "label": key[0],
+            "property": key[1],
+            "annotated": key in annotated,
+            "logged_lookups": counts.get(key, 0),
+        }
+
+    report: Dict[str, List[Dict[str, Any]]] = {
+        "planned": [_evidence(key) for key in sorted(planned)],
+        "missing": [],
+        "unused": [],
+    }
+    if existing_indexes is None:
+        return report
+
+    existing: Dict[IndexedProperty, Dict[str, Any]] = {}
+    for index in existing_indexes:
+        labels, properties = index.get("labelsOrTypes") or [], index.get("properties") or []
+        if (
+            index.get("type") != "RANGE"
+            or index.get("entityType") != "NODE"
+            or index.get("owningConstraint")
+            or len(labels) != 1
+            or len(properties) != 1
+        ):
+            continue
+        existing[(labels[0], properties[0])] = index
+
+    report["missing"] = [_evidence(key) for key in sorted(planned - existing.keys())]
+    for key in sorted(existing.keys() - planned):
+        index = existing[key]
+        report["unused"].append(
+            {
+                **_evidence(key),
+                "name": index.get("name"),
+                "read_count": index.get("readCount"),
+                "drop": f"DROP INDEX {index.get('name')} IF EXISTS",
+            }
+        )
+    return report
+
+
+def format_index_report(report: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Render an index report as plain text."""
+
+    def _line(item: Dict[str, Any]) -> str:
+        evidence = "annotated" if item["annotated"] else f"{item['logged_lookups']} lookups"
+        if item["annotated"] and item["logged_lookups"]:
+            evidence += f", {item['logged_lookups']} lookups"
+        return f"  :{item['label']}({item['property']})  [{evidence}]"
+
+    lines = [f"Planned range indexes ({len(report['planned'])}):"]
+    lines += [_line(item) for item in report["planned"]]
+    if report["missing"]:
+        lines.append(f"Missing from the database ({len(report['missing'])}):")
+        lines += [_line(item) for item in report["missing"]]
+    if report["unused"]:
+        lines.append(f"Not in the plan ({len(report['unused'])}), candidates to drop:")
+        for item in report["unused"]:
+            reads = "" if item["read_count"] is None else f", {item['read_count']} reads"
+            lines.append(f"{_line(item)[:-1]}{reads}]  {item['drop']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Report planned, missing and unused indexes, e.g. `python -m weaver.util.index_advisor`."""
+    from weaver.util.schema import PREDEFINED_GRAPH_SCHEMA
+
+    parser = argparse.ArgumentParser(description="Plan the range indexes of the memory graph.")
+    parser.add_argument("--path", type=Path, default=None, help="query log to read")
+    parser.add_argument("--min-lookups", type=int, default=MIN_LOGGED_LOOKUPS)
+    parser.add_argument(
+        "--live", action="store_true", help="compare with the indexes of the configured database"
+    )
+    args = parser.parse_args(argv)
+
+    existing_indexes = None
+    if args.live:
+        from chat2graph.core.service.graph_db_service import GraphDbService
+
+        from weaver.util.init_chat2graph import init_chat2graph
+
+        init_chat2graph()
+        graph_db = GraphDbService.instance.get_default_graph_db()
+        with graph_db.conn.session() as session:
+            existing_indexes = [record.data() for record in session.run("SHOW INDEXES")]
+
+    entries = load_logged_lookups(args.path)
+    report = index_report(PREDEFINED_GRAPH_SCHEMA, entries, existing_indexes, args.min_lookups)
+    print(format_index_report(report))
+
+
+if __name__ == "__main__":
+    main()
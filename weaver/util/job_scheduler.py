@@ -0,0 +1,158 @@
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+# Agent jobs running at once; each one holds a model connection for its whole run
+DEFAULT_MAX_CONCURRENCY = 4
+# An extraction job that runs longer than this is reported as stalled
+DEFAULT_JOB_TIMEOUT_SECONDS = 1800.0
+# How often progress is printed while no job completes
+PROGRESS_INTERVAL_SECONDS = 30.0
+
+
+@dataclass
+class ScheduledJob:
+    """A unit of work for the scheduler: `run` submits an agent job and waits for its result."""
+
+    name: str
+    run: Callable[[], Any]
+    weight: int = 1  # files in the job, for the files/s rate
+
+
+@dataclass
+class JobOutcome:
+    """How a scheduled job ended: "done", "failed" or "timeout"."""
+
+    job: ScheduledJob
+    status: str
+    seconds: float
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Progress:
+    total_weight: int
+    node_counter: Optional[Callable[[], int]]
+    started_at: float = field(default_factory=time.perf_counter)
+    done_weight: int = 0
+    nodes_at_start: int = 0
+
+    def __post_init__(self):
+        self.nodes_at_start = self.node_counter() if self.node_counter else 0
+
+    def line(self, outcomes: List[JobOutcome], running: Dict[str, float], orphaned: int = 0) -> str:
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        statuses = [outcome.status for outcome in outcomes]
+        text = (
+            f"[progress] {self.done_weight}/{self.total_weight} files, "
+            f"{statuses.count('done')} jobs done, {statuses.count('failed')} failed, "
+            f"{statuses.count('timeout')} timed out | {self.done_weight / elapsed:.2f} files/s"
+        )
+        if self.node_counter:
+            nodes = self.node_counter() - self.nodes_at_start
+            text += f", {nodes / elapsed:.2f} nodes/s"
+        if running:
+            now = time.perf_counter()
+            oldest = max(running, key=lambda name: now - running[name])
+            text += f" | running {len(running)}, longest {oldest} ({now - running[oldest]:.0f}s)"
+        if orphaned:
+            text += f" | {orphaned} timed out jobs still holding a slot"
+        return text
+
+
+def run_bounded(
+    jobs: Sequence[ScheduledJob],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    job_timeout_seconds: Optional[float] = DEFAULT_JOB_TIMEOUT_SECONDS,
+    node_counter: Optional[Callable[[], int]] = None,
+    on_complete: Optional[Callable[[JobOutcome], None]] = None,
+    progress_interval_seconds: float = PROGRESS_INTERVAL_SECONDS,
+) -> List[JobOutcome]:
+    """Run jobs with at most `max_concurrency` in flight, handling them in completion order.
+
+    Each job runs in its own daemon thread. A job still running after `job_timeout_seconds`
+    is reported as "timeout" right away, but an agent job cannot be cancelled: its thread
+    keeps its slot until it exits, so no more than `max_concurrency` jobs ever run at once,
+    and its late result is dropped. Timed out threads still running once every job has an
+    outcome are left to finish in the background.
+
+    Args:
+        jobs (Sequence[ScheduledJob]): Jobs in submission order.
+        max_concurrency (int): Jobs running at once.
+        job_timeout_seconds (Optional[float]): Time limit per job, None for no limit.
+        node_counter (Optional[Callable[[], int]]): Returns the nodes written so far, for
+            the nodes/s rate.
+        on_complete (Optional[Callable[[JobOutcome], None]]): Called with every outcome as
+            soon as it is known.
+        progress_interval_seconds (float): Print progress at least this often.
+
+    Returns:
+        List[JobOutcome]: Outcomes in completion order.
+    """
+    max_concurrency = max(1, max_concurrency)
+    completed: queue.Queue[JobOutcome] = queue.Queue()
+    pending = list(reversed(jobs))
+    running: Dict[str, float] = {}
+    # Timed out jobs whose thread has not exited yet
+    orphaned: Set[str] = set()
+    by_name: Dict[str, ScheduledJob] = {}
+    outcomes: List[JobOutcome] = []
+    progress = _Progress(sum(job.weight for job in jobs), node_counter)
+
+    def _worker(job: ScheduledJob, started_at: float) -> None:
+        try:
+            result = job.run()
+            completed.put(JobOutcome(job, "done", time.perf_counter() - started_at, result))
+        except Exception as e:
+            completed.put(JobOutcome(job, "failed", time.perf_counter() - started_at, error=e))
+
+    def _finish(outcome: JobOutcome) -> None:
+        running.pop(outcome.job.name, None)
+        progress.done_weight += outcome.job.weight
+        outcomes.append(outcome)
+        if on_complete:
+            on_complete(outcome)
+        print(progress.line(outcomes, running, len(orphaned)))
+
+    last_report = time.perf_counter()
+    while pending or running:
+        while pending and len(running) + len(orphaned) < max_concurrency:
+            job = pending.pop()
+            started_at = time.perf_counter()
+            running[job.name] = started_at
+            by_name[job.name] = job
+            threading.Thread(
+                target=_worker, args=(job, started_at), name=f"job-{job.name}", daemon=True
+            ).start()
+
+        now = time.perf_counter()
+        wait_for = progress_interval_seconds - (now - last_report)
+        if job_timeout_seconds is not None and running:
+            earliest_deadline = min(running.values()) + job_timeout_seconds
+            wait_for = min(wait_for, earliest_deadline - now)
+        try:
+            outcome = completed.get(timeout=max(wait_for, 0.0))
+            if outcome.job.name in running:
+                _finish(outcome)
+                last_report = time.perf_counter()
+            else:
+                # A timed out job exited: its result is dropped and its slot is free again
+                orphaned.discard(outcome.job.name)
+        except queue.Empty:
+            pass
+
+        now = time.perf_counter()
+        if job_timeout_seconds is not None:
+            for name, started_at in list(running.items()):
+                if now - started_at >= job_timeout_seconds:
+                    orphaned.add(name)
+                    _finish(JobOutcome(by_name[name], "timeout", now - started_at))
+                    last_report = now
+        if now - last_report >= progress_interval_seconds:
+            print(progress.line(outcomes, running, len(orphaned)))
+            last_report = now
+
+    return outcomes
@@ -0,0 +1,261 @@
+import argparse
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# The JSONL query log, one line per statement, is off unless this is set: to a path, or to
+# "on" for DEFAULT_QUERY_LOG_PATH
+QUERY_LOG_PATH_ENV = "WEAVER_QUERY_LOG_PATH"
+DEFAULT_QUERY_LOG_PATH = Path.home() / ".weaver" / "query_log.jsonl"
+
+# Past this size the log is moved to <name>.1, replacing the previous one, and restarted
+QUERY_LOG_MAX_BYTES = 16 * 1024 * 1024
+
+# Fraction of read queries run with PROFILE to capture db hits, 0 (the default) disables it
+PROFILE_SAMPLE_RATE_ENV = "WEAVER_QUERY_PROFILE_SAMPLE_RATE"
+
+# Counters of the result summary worth keeping when not zero
+_SUMMARY_COUNTERS = (
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+    "labels_added",
+    "labels_removed",
+    "indexes_added",
+    "indexes_removed",
+    "constraints_added",
+    "constraints_removed",
+)
+
+REPORT_SORT_KEYS = ("total_ms", "max_ms", "mean_ms", "count", "rows", "db_hits", "errors")
+
+_write_lock = threading.Lock()
+# The open log file, kept across statements; replaced when the configured path changes
+_log_file: Optional[Any] = None
+
+
+def query_log_path() -> Optional[Path]:
+    """Return the query log path, or None if logging is disabled (the default)."""
+    configured = (os.environ.get(QUERY_LOG_PATH_ENV) or "").strip()
+    if configured.lower() in ("", "off"):
+        return None
+    if configured.lower() == "on":
+        return DEFAULT_QUERY_LOG_PATH
+    return Path(configured).expanduser()
+
+
+def _write_line(path: Path, line: str) -> None:
+    """Append a line through the shared handle, rotating the file past QUERY_LOG_MAX_BYTES."""
+    global _log_file
+    if _log_file is not None and _log_file.name != str(path):
+        _log_file.close()
+        _log_file = None
+    if _log_file is not None and _log_file.tell() >= QUERY_LOG_MAX_BYTES:
+        _log_file.close()
+        _log_file = None
+        path.replace(path.with_name(path.name + ".1"))
+    if _log_file is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Line buffered, so that a crash loses no complete entry
+        _log_file = open(path, "a", encoding="utf-8", buffering=1)
+    _log_file.write(line + "\n")
+
+
+def should_profile() -> bool:
+    """Decide whether the next query is one of the sampled PROFILE runs."""
+    try:
+        sample_rate = float(os.environ.get(PROFILE_SAMPLE_RATE_ENV) or 0)
+    except ValueError:
+        return False
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def query_shape_id(query: str) -> str:
+    """Return a short stable id for a query text, ignoring whitespace differences."""
+    return hashlib.sha1(" ".join(query.split()).encode("utf-8")).hexdigest()[:12]
+
+
+def summary_counters(summary: Any) -> Dict[str, int]:
+    """Return the non-zero update counters of a driver result summary."""
+    counters = getattr(summary, "counters", None)
+    values = {}
+    for name in _SUMMARY_COUNTERS:
+        value = getattr(counters, name, 0)
+        if isinstance(value, int) and value:
+            values[name] = value
+    return values
+
+
+def profile_db_hits(profile: Any) -> Optional[int]:
+    """Sum the db hits over all operators of a PROFILE plan, None if there is no profile."""
+    if not isinstance(profile, dict):
+        return None
+    total = 0
+    stack = [profile]
+    while stack:
+        operator = stack.pop()
+        hits = operator.get("dbHits", 0)
+        if isinstance(hits, (int, float)):
+            total += int(hits)
+        stack.extend(operator.get("children") or [])
+    return total
+
+
+def log_query(
+    source: str,
+    query: str,
+    started_at: float,
+    rows: int = 0,
+    summary: Any = None,
+    error: Optional[str] = None,
+) -> None:
+    """Append one statement to the query log, if it is enabled.
+
+    Args:
+        source (str): Name of the tool that ran the statement.
+        query (str): Normalized statement text, with parameters instead of literals.
+        started_at (float): time.perf_counter() when the statement was sent.
+        rows (int): Number of records read from the result.
+        summary (Any): The driver's result summary, if the result was consumed.
+        error (Optional[str]): Error or rejection message if the statement did not complete.
+    """
+    path = query_log_path()
+    if path is None:
+        return
+
+    entry: Dict[str, Any] = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "shape": query_shape_id(query),
+        "query": " ".join(query.split()),
+        "wall_ms": round((time.perf_counter() - started_at) * 1000, 3),
+        "rows": rows,
+    }
+    if summary is not None:
+        counters = summary_counters(summary)
+        if counters:
+            entry["counters"] = counters
+        server_ms = [
+            getattr(summary, name, None)
+            for name in ("result_available_after", "result_consumed_after")
+        ]
+        if all(isinstance(value, int) for value in server_ms):
+            entry["server_ms"] = sum(server_ms)
+        db_hits = profile_db_hits(getattr(summary, "profile", None))
+        if db_hits is not None:
+            entry["db_hits"] = db_hits
+    if error:
+        entry["error"] = error
+
+    line = json.dumps(entry, ensure_ascii=False, default=str)
+    try:
+        with _write_lock:
+            _write_line(path, line)
+    except OSError as e:
+        # Logging must never break a query
+        print(f"Failed to write query log {path}: {e}")
+
+
+def load_query_log(path: Path) -> List[Dict[str, Any]]:
+    """Read the entries of a query log, skipping lines that are not valid JSON."""
+    entries = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def summarize_query_log(
+    entries: List[Dict[str, Any]], sort_by: str = "total_ms"
+) -> List[Dict[str, Any]]:
+    """Aggregate log entries per query shape, worst offenders first."""
+    if sort_by not in REPORT_SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(REPORT_SORT_KEYS)}")
+
+    shapes: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        shape = shapes.setdefault(
+            entry.get("shape") or query_shape_id(entry.get("query", "")),
+            {
+                "shape": entry.get("shape"),
+                "query": entry.get("query", ""),
+                "sources": set(),
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "rows": 0,
+                "db_hits": 0,
+                "profiled": 0,
+                "errors": 0,
+            },
+        )
+        wall_ms = float(entry.get("wall_ms", 0.0))
+        shape["sources"].add(entry.get("source", "unknown"))
+        shape["count"] += 1
+        shape["total_ms"] += wall_ms
+        shape["max_ms"] = max(shape["max_ms"], wall_ms)
+        shape["rows"] += int(entry.get("rows", 0))
+        if "db_hits" in entry:
+            shape["db_hits"] += int(entry["db_hits"])
+            shape["profiled"] += 1
+        if entry.get("error"):
+            shape["errors"] += 1
+
+    summary = []
+    for shape in shapes.values():
+        shape["mean_ms"] = shape["total_ms"] / shape["count"]
+        shape["sources"] = sorted(shape["sources"])
+        summary.append(shape)
+    summary.sort(key=lambda shape: shape[sort_by], reverse=True)
+    return summary
+
+
+def format_report(summary: List[Dict[str, Any]], top: int = 10) -> str:
+    """Render the top query shapes as a plain-text table."""
+    if not summary:
+        return "The query log is empty."
+    lines = [
+        f"{'count':>6} {'total_ms':>10} {'mean_ms':>9} {'max_ms':>9} {'rows':>8} "
+        f"{'db_hits':>9} {'errors':>6}  source / query"
+    ]
+    for shape in summary[:top]:
+        db_hits = str(shape["db_hits"]) if shape["profiled"] else "-"
+        query = shape["query"] if len(shape["query"]) <= 120 else shape["query"][:117] + "..."
+        lines.append(
+            f"{shape['count']:>6} {shape['total_ms']:>10.1f} {shape['mean_ms']:>9.1f} "
+            f"{shape['max_ms']:>9.1f} {shape['rows']:>8} {db_hits:>9} {shape['errors']:>6}  "
+            f"{','.join(shape['sources'])}: {query}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Rank the logged query shapes, e.g. `python -m weaver.util.query_log report --top 20`."""
+    parser = argparse.ArgumentParser(description="Inspect the weaver Cypher query log.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report = subparsers.add_parser("report", help="rank query shapes by cost")
+    report.add_argument("--path", type=Path, default=None, help="query log to read")
+    report.add_argument("--top", type=int, default=10, help="number of shapes to show")
+    report.add_argument("--sort", choices=REPORT_SORT_KEYS, default="total_ms")
+    args = parser.parse_args(argv)
+
+    path = args.path or query_log_path() or DEFAULT_QUERY_LOG_PATH
+    if not path.exists():
+        print(f"No query log at {path}")
+        return
+    print(format_report(summarize_query_log(load_query_log(path), args.sort), args.top))
+
+
+if __name__ == "__main__":
+    main()
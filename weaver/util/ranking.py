@@ -0,0 +1,76 @@
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+# Damping constant from the original reciprocal rank fusion paper
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]], k: int = RRF_K
+) -> List[Tuple[Hashable, float]]:
+    """Merge several ranked lists of item keys with reciprocal rank fusion.
+
+    Every item scores sum(1 / (k + rank)) over the lists it appears in, with ranks
+    starting at 1. Items found by several retrievers therefore rise to the top even
+    when their raw scores are not comparable.
+
+    Args:
+        rankings (Sequence[Sequence[Hashable]]): Item keys per retriever, best first.
+        k (int): Damping constant; larger values flatten the rank differences.
+
+    Returns:
+        List[Tuple[Hashable, float]]: (key, fused score) pairs sorted by score, best first.
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    # sorted() is stable, so ties keep the order in which items were first seen
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def maximal_marginal_relevance(
+    query_vector: Sequence[float],
+    candidate_vectors: Sequence[Sequence[float]],
+    k: int,
+    lambda_mult: float = 0.5,
+) -> List[int]:
+    """Select k diverse candidates with maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    lambda_mult * sim(query, c) - (1 - lambda_mult) * max(sim(c, s) for s already selected),
+    using cosine similarity, so near-duplicates of an already selected candidate lose out.
+
+    Args:
+        query_vector (Sequence[float]): Embedding of the query.
+        candidate_vectors (Sequence[Sequence[float]]): Embeddings of the candidates.
+        k (int): Number of candidates to select.
+        lambda_mult (float): Trade-off between relevance (1.0) and diversity (0.0).
+
+    Returns:
+        List[int]: Indexes into candidate_vectors in selection order.
+    """
+    if not 0.0 <= lambda_mult <= 1.0:
+        raise ValueError("lambda_mult must be between 0 and 1")
+    if k <= 0 or len(candidate_vectors) == 0:
+        return []
+
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    query = np.asarray(query_vector, dtype=np.float32)
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every candidate to any selected candidate so far
+    max_similarity = similarity[selected[0]].copy()
+    while len(selected) < min(k, len(candidates)):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        max_similarity = np.maximum(max_similarity, similarity[best])
+    return selected
@@ -0,0 +1,63 @@
+import threading
+from typing import Any, Optional
+
+AGENTIC_SERVICE_CONFIG = "weaver.yml"
+
+# Process-wide runtime, built on first use: the chat2graph databases and services are
+# initialized once and weaver.yml is parsed once, whichever thread gets there first
+_lock = threading.Lock()
+_initialized = False
+_agentic_service: Optional[Any] = None
+
+
+def _initialize_chat2graph() -> None:
+    from weaver.util.init_chat2graph import init_chat2graph
+
+    init_chat2graph()
+
+
+def _load_agentic_service() -> Any:
+    from chat2graph.core.sdk.agentic_service import AgenticService
+
+    return AgenticService.load(AGENTIC_SERVICE_CONFIG)
+
+
+def ensure_chat2graph() -> None:
+    """Initialize the chat2graph databases and services unless this process already did."""
+    global _initialized
+    if _initialized:
+        return
+    with _lock:
+        if not _initialized:
+            _initialize_chat2graph()
+            _initialized = True
+
+
+def get_agentic_service() -> Any:
+    """Return the process-wide AgenticService loaded from weaver.yml, building it on first use.
+
+    Returns:
+        AgenticService: The shared multi-agent service; open a session per job with
+            `get_agentic_service().session()` or `new_session()`.
+    """
+    global _agentic_service
+    if _agentic_service is not None:
+        return _agentic_service
+    ensure_chat2graph()
+    with _lock:
+        if _agentic_service is None:
+            _agentic_service = _load_agentic_service()
+    return _agentic_service
+
+
+def new_session(session_id: Optional[str] = None) -> Any:
+    """Open a session on the shared AgenticService."""
+    return get_agentic_service().session(session_id)
+
+
+def reset_runtime() -> None:
+    """Forget the shared runtime; the next call builds it again, e.g. after a config change."""
+    global _initialized, _agentic_service
+    with _lock:
+        _initialized = False
+        _agentic_service = None
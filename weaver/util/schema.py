@@ -1,19 +1,100 @@
-from typing import Any, Dict, List
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from chat2graph.core.service.graph_db_service import GraphDbService
 
+from weaver.util.embedding import HNSW_OPTIONS_MIN_NEO4J_VERSION, EmbeddingSettings
+from weaver.util.index_advisor import (
+    IndexedProperty,
+    annotated_index_properties,
+    load_logged_lookups,
+    plan_range_indexes,
+)
 
-def generate_schema_cypher_commands(schema: Dict[str, Any]) -> List[str]:
+# One full-text index spans the text properties of all node labels
+FULLTEXT_INDEX_NAME = "memory_text_fulltext_index"
+
+# Node that stores the fingerprint of the schema last applied to the database
+SCHEMA_FINGERPRINT_LABEL = "WeaverSchemaFingerprint"
+
+# How long the bootstrap waits for new indexes (vector indexes in particular) to populate
+INDEX_ONLINE_TIMEOUT_SECONDS = 600.0
+INDEX_POLL_INTERVAL_SECONDS = 1.0
+
+_bootstrap_lock = threading.Lock()
+# Fingerprint of the schema this process has already applied, so later calls return at once
+_bootstrapped_fingerprint: Optional[str] = None
+_predefined_plan: Optional[Tuple[str, Set[IndexedProperty], EmbeddingSettings]] = None
+# Bumped whenever this process writes the schema metadata, so readers can cache renderings
+_schema_version: int = 0
+
+
+@dataclass(frozen=True)
+class SchemaStatement:
+    """A constraint or index the graph schema requires, and the command that creates it.
+
+    Attributes:
+        kind: "CONSTRAINT" or "INDEX".
+        index_type: "UNIQUENESS" for constraints, "RANGE", "VECTOR" or "FULLTEXT" for indexes.
+        entity_type: "NODE" or "RELATIONSHIP".
+        labels: Node labels or relationship types the object covers.
+        properties: Properties the object covers.
+        command: The Cypher command creating the object.
+        name: Name given to the object, if the command names it.
+        index_config: indexConfig options of the command, as (key, value) pairs.
     """
-    Generate Cypher commands to create the graph schema in Neo4j.
+
+    kind: str
+    index_type: str
+    entity_type: str
+    labels: Tuple[str, ...]
+    properties: Tuple[str, ...]
+    command: str
+    name: Optional[str] = None
+    index_config: Tuple[Tuple[str, Any], ...] = ()
+
+    def key(self) -> Tuple[Any, ...]:
+        """Identify the object by what it covers, the way SHOW INDEXES/CONSTRAINTS lists it."""
+        return (
+            self.kind,
+            self.index_type,
+            self.entity_type,
+            tuple(sorted(self.labels)),
+            tuple(self.properties),
+        )
+
+
+def generate_schema_statements(
+    schema: Dict[str, Any],
+    indexed_properties: Optional[Set[IndexedProperty]] = None,
+    embedding_settings: Optional[EmbeddingSettings] = None,
+    neo4j_version: Optional[Tuple[int, ...]] = None,
+) -> List[SchemaStatement]:
+    """
+    Generate the constraints and indexes that create the graph schema in Neo4j.
 
     Args:
         schema: The schema definition dictionary
+        indexed_properties: (label, property) pairs that get a range index; defaults to
+            the properties annotated with "indexed": True
+        embedding_settings: Configuration of the vector indexes; defaults to the
+            environment (EmbeddingSettings.from_env)
+        neo4j_version: Server version, which decides the vector index options supported
 
     Returns:
-        List of Cypher commands to execute
+        List of schema statements, every command idempotent (IF NOT EXISTS)
     """
-    commands = []
+    if indexed_properties is None:
+        indexed_properties = annotated_index_properties(schema)
+    if embedding_settings is None:
+        embedding_settings = EmbeddingSettings.from_env()
+    statements: List[SchemaStatement] = []
+    fulltext_labels: List[str] = []
+    fulltext_properties: List[str] = []
 
     # 1. Generate commands for nodes
     for node_label, node_def in schema.get("nodes", {}).items():
@@ -21,27 +102,81 @@ def generate_schema_cypher_commands(schema: Dict[str, Any]) -> List[str]:
 
         # Create constraint on primary key (ensure uniqueness)
         # Updated syntax for Neo4j 5.x
-        commands.append(
-            f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{node_label}) REQUIRE n.{primary_key} IS UNIQUE"
+        statements.append(
+            SchemaStatement(
+                "CONSTRAINT",
+                "UNIQUENESS",
+                "NODE",
+                (node_label,),
+                (primary_key,),
+                f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{node_label}) REQUIRE n.{primary_key} IS UNIQUE",
+            )
         )
 
-        # Create indexes for properties that might be searched frequently
+        # Create range indexes only for properties that nodes are looked up by; every
+        # other index would slow down each MERGE without ever being read
         properties = node_def.get("properties", [])
         for prop in properties:
             prop_name = prop.get("name")
             prop_type = prop.get("type")
 
+            # Collect free-text properties for the shared full-text index
+            if prop.get("fulltext"):
+                if node_label not in fulltext_labels:
+                    fulltext_labels.append(node_label)
+                if prop_name not in fulltext_properties:
+                    fulltext_properties.append(prop_name)
+
             # Create vector index for embed property with proper configuration
             if prop_name == "embed" and prop_type == "LIST OF FLOAT":
-                commands.append(
-                    f"CREATE VECTOR INDEX {node_label.lower()}_embed_vector_index "
-                    f"FOR (n:{node_label}) ON (n.{prop_name}) "
-                    "OPTIONS { indexConfig: {`vector.dimensions`: 1024, `vector.similarity_function`: 'cosine'} }"
+                index_name = f"{node_label.lower()}_embed_vector_index"
+                statements.append(
+                    SchemaStatement(
+                        "INDEX",
+                        "VECTOR",
+                        "NODE",
+                        (node_label,),
+                        (prop_name,),
+                        f"CREATE VECTOR INDEX {index_name} IF NOT EXISTS "
+                        f"FOR (n:{node_label}) ON (n.{prop_name}) "
+                        f"{embedding_settings.index_options(neo4j_version)}",
+                        name=index_name,
+                        index_config=tuple(embedding_settings.index_config(neo4j_version).items()),
+                    )
                 )
                 continue
 
-            # Create regular index for other properties
-            commands.append(f"CREATE INDEX IF NOT EXISTS FOR (n:{node_label}) ON (n.{prop_name})")
+            # Create regular index for looked-up properties
+            if (node_label, prop_name) not in indexed_properties:
+                continue
+            statements.append(
+                SchemaStatement(
+                    "INDEX",
+                    "RANGE",
+                    "NODE",
+                    (node_label,),
+                    (prop_name,),
+                    f"CREATE INDEX IF NOT EXISTS FOR (n:{node_label}) ON (n.{prop_name})",
+                )
+            )
+
+    # Create one full-text index over all annotated text properties; the CJK analyzer
+    # tokenizes Chinese place names such as '雷峰塔' that embeddings tend to blur
+    if fulltext_labels:
+        labels_str = "|".join(fulltext_labels)
+        properties_str = ", ".join(f"n.{prop_name}" for prop_name in fulltext_properties)
+        statements.append(
+            SchemaStatement(
+                "INDEX",
+                "FULLTEXT",
+                "NODE",
+                tuple(fulltext_labels),
+                tuple(fulltext_properties),
+                f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX_NAME} IF NOT EXISTS "
+                f"FOR (n:{labels_str}) ON EACH [{properties_str}] "
+                "OPTIONS { indexConfig: {`fulltext.analyzer`: 'cjk'} }",
+            )
+        )
 
     # 2. Generate commands for relationships
     for rel_type, rel_def in schema.get("relationships", {}).items():
@@ -49,11 +184,34 @@ def generate_schema_cypher_commands(schema: Dict[str, Any]) -> List[str]:
 
         # Create constraint for relationship ID uniqueness
         # Updated syntax for Neo4j 5.x
-        commands.append(
-            f"CREATE CONSTRAINT IF NOT EXISTS FOR ()-[r:{rel_type}]-() REQUIRE r.{primary_key} IS UNIQUE"
+        statements.append(
+            SchemaStatement(
+                "CONSTRAINT",
+                "UNIQUENESS",
+                "RELATIONSHIP",
+                (rel_type,),
+                (primary_key,),
+                f"CREATE CONSTRAINT IF NOT EXISTS FOR ()-[r:{rel_type}]-() REQUIRE r.{primary_key} IS UNIQUE",
+            )
         )
 
-        # Generate commands to ensure relationship connectivity rules
+    return statements
+
+
+def generate_schema_cypher_commands(schema: Dict[str, Any]) -> List[str]:
+    """
+    Generate Cypher commands to create the graph schema in Neo4j.
+
+    Args:
+        schema: The schema definition dictionary
+
+    Returns:
+        List of Cypher commands to execute
+    """
+    commands = [statement.command for statement in generate_schema_statements(schema)]
+
+    # Generate comments describing the allowed relationship connections
+    for rel_type, rel_def in schema.get("relationships", {}).items():
         source_labels = rel_def.get("source_vertex_labels", [])
         target_labels = rel_def.get("target_vertex_labels", [])
 
@@ -65,46 +223,309 @@ def generate_schema_cypher_commands(schema: Dict[str, Any]) -> List[str]:
     return commands
 
 
-def import_graph_schema() -> None:
+def schema_fingerprint(
+    schema: Dict[str, Any],
+    indexed_properties: Optional[Set[IndexedProperty]] = None,
+    embedding_settings: Optional[EmbeddingSettings] = None,
+) -> str:
+    """Return a stable hash of a schema definition, its index plan and vector settings."""
+    canonical = json.dumps(
+        [
+            schema,
+            sorted(indexed_properties or []),
+            asdict(embedding_settings or EmbeddingSettings()),
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _predefined_schema_plan() -> Tuple[str, Set[IndexedProperty], EmbeddingSettings]:
+    """Fingerprint, range index plan and vector settings of PREDEFINED_GRAPH_SCHEMA.
+
+    Computed once per process. The range index plan covers the annotated properties and
+    those the query log shows are looked up often.
+    """
+    global _predefined_plan
+    if _predefined_plan is None:
+        indexed_properties = plan_range_indexes(PREDEFINED_GRAPH_SCHEMA, load_logged_lookups())
+        embedding_settings = EmbeddingSettings.from_env()
+        _predefined_plan = (
+            schema_fingerprint(PREDEFINED_GRAPH_SCHEMA, indexed_properties, embedding_settings),
+            indexed_properties,
+            embedding_settings,
+        )
+    return _predefined_plan
+
+
+def get_schema_version() -> int:
+    """Returns how many times this process has written the schema metadata."""
+    return _schema_version
+
+
+def _neo4j_version(session: Any) -> Optional[Tuple[int, ...]]:
+    """Return the server version, e.g. (5, 20, 0), or None if it cannot be read."""
+    try:
+        record = session.run(
+            "CALL dbms.components() YIELD name, versions "
+            "WHERE name = 'Neo4j Kernel' RETURN versions[0] AS version"
+        ).single()
+    except Exception as e:
+        print(f"Could not read the Neo4j version: {e}")
+        return None
+    if not record or not record["version"]:
+        return None
+    numbers = []
+    for part in str(record["version"]).split("."):
+        digits = "".join(ch for ch in part if ch.isdigit())
+        if not digits:
+            break
+        numbers.append(int(digits))
+    return tuple(numbers) or None
+
+
+def _read_stored_fingerprint(session: Any) -> Optional[str]:
+    record = session.run(
+        f"MATCH (m:{SCHEMA_FINGERPRINT_LABEL} {{key: 'graph_schema'}}) "
+        "RETURN m.fingerprint AS fingerprint"
+    ).single()
+    return record["fingerprint"] if record else None
+
+
+def _store_fingerprint(session: Any, fingerprint: str) -> None:
+    session.run(
+        f"MERGE (m:{SCHEMA_FINGERPRINT_LABEL} {{key: 'graph_schema'}}) "
+        "SET m.fingerprint = $fingerprint, m.applied_at = datetime()",
+        fingerprint=fingerprint,
+    ).consume()
+
+
+def _existing_schema_keys(session: Any) -> Set[Tuple[Any, ...]]:
+    """List the constraints and indexes of the database in SchemaStatement.key() form."""
+    keys: Set[Tuple[Any, ...]] = set()
+    for record in session.run("SHOW CONSTRAINTS YIELD type, entityType, labelsOrTypes, properties"):
+        # The uniqueness type is UNIQUENESS, RELATIONSHIP_UNIQUENESS or
+        # NODE_PROPERTY_UNIQUENESS depending on the Neo4j version
+        constraint_type = "UNIQUENESS" if "UNIQUENESS" in record["type"] else record["type"]
+        keys.add(
+            (
+                "CONSTRAINT",
+                constraint_type,
+                record["entityType"],
+                tuple(sorted(record["labelsOrTypes"] or [])),
+                tuple(record["properties"] or []),
+            )
+        )
+    for record in session.run("SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties"):
+        keys.add(
+            (
+                "INDEX",
+                record["type"],
+                record["entityType"],
+                tuple(sorted(record["labelsOrTypes"] or [])),
+                tuple(record["properties"] or []),
+            )
+        )
+    return keys
+
+
+def _vector_config_matches(current: Dict[str, Any], desired: Tuple[Tuple[str, Any], ...]) -> bool:
+    """Compare an index's indexConfig with the desired one; absent keys have their defaults."""
+    defaults = EmbeddingSettings().index_config(HNSW_OPTIONS_MIN_NEO4J_VERSION)
+    for key, value in desired:
+        current_value = current.get(key, defaults.get(key))
+        if str(current_value).lower() != str(value).lower():
+            return False
+    return True
+
+
+def _stale_vector_indexes(session: Any, statements: List[SchemaStatement]) -> List[SchemaStatement]:
+    """Return the vector index statements whose existing index has another configuration."""
+    wanted = {
+        statement.name: statement for statement in statements if statement.index_type == "VECTOR"
+    }
+    stale = []
+    for record in session.run("SHOW INDEXES YIELD name, type, options WHERE type = 'VECTOR'"):
+        statement = wanted.get(record["name"])
+        if statement is None:
+            continue
+        current_config = (record["options"] or {}).get("indexConfig") or {}
+        if not _vector_config_matches(current_config, statement.index_config):
+            stale.append(statement)
+    return stale
+
+
+def rebuild_vector_index(
+    session: Any, statement: SchemaStatement, timeout_seconds: float = INDEX_ONLINE_TIMEOUT_SECONDS
+) -> float:
+    """Drop a vector index and create it again with the statement's configuration.
+
+    The database stays online while the index populates; vector searches on its label fall
+    back to the property scan of the EmbeddingRetriever until it is ONLINE.
+
+    Returns:
+        Seconds the rebuild took, until the new index was ONLINE.
+    """
+    started_at = time.perf_counter()
+    session.run(f"DROP INDEX {statement.name} IF EXISTS").consume()
+    session.run(statement.command).consume()
+    wait_for_indexes_online(session, [statement.name], timeout_seconds)
+    return time.perf_counter() - started_at
+
+
+def wait_for_indexes_online(
+    session: Any,
+    index_names: Iterable[str],
+    timeout_seconds: float = INDEX_ONLINE_TIMEOUT_SECONDS,
+) -> None:
+    """Block until the named indexes are ONLINE.
+
+    Indexes not named are ignored, so an unrelated index in the FAILED state, or one still
+    populating, does not hold up or fail the caller.
+
+    Args:
+        session: Neo4j session.
+        index_names: Names of the indexes to wait for.
+        timeout_seconds: How long to wait.
+
+    Raises:
+        RuntimeError: If a named index failed to populate.
+        TimeoutError: If a named index is still populating after timeout_seconds.
+    """
+    names = set(index_names)
+    deadline = time.monotonic() + timeout_seconds
+    last_pending: List[str] = []
+    while names:
+        pending: List[str] = []
+        for record in session.run("SHOW INDEXES YIELD name, type, state, populationPercent"):
+            if record["name"] not in names:
+                continue
+            if record["state"] == "FAILED":
+                raise RuntimeError(f"Index {record['name']} ({record['type']}) failed to populate")
+            if record["state"] != "ONLINE":
+                pending.append(
+                    f"{record['name']} ({record['type']}, {record['populationPercent'] or 0:.0f}%)"
+                )
+        if not pending:
+            return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Indexes still not ONLINE after {timeout_seconds} seconds: {', '.join(pending)}"
+            )
+        if pending != last_pending:
+            print(f"Waiting for indexes to come ONLINE: {', '.join(pending)}")
+            last_pending = pending
+        time.sleep(INDEX_POLL_INTERVAL_SECONDS)
+
+
+def import_graph_schema(force: bool = False) -> None:
     """
     Imports the predefined global graph schema (PREDEFINED_GRAPH_SCHEMA)
     into the configured graph database via the graph_db_service.
 
-    This function retrieves the default graph database configuration and then
-    calls the update_schema_metadata method, passing the complete predefined
-    schema. This is intended to set or overwrite the schema in the database.
+    The schema is fingerprinted and the fingerprint stored in the database, so the
+    bootstrap runs at most once per schema version: a process that already applied it
+    returns immediately, and a database that already has it costs one lookup. Otherwise
+    only the constraints and indexes missing from SHOW CONSTRAINTS/SHOW INDEXES are
+    created, and the call returns once the schema's vector indexes are ONLINE. Range
+    indexes follow the plan of weaver.util.index_advisor; indexes outside the plan are
+    reported there, never dropped here. Vector indexes follow EmbeddingSettings.from_env(); one whose
+    configuration differs is dropped and rebuilt, and its build time reported.
+
+    Args:
+        force: Check and apply the schema even if the fingerprint says it is current.
     """
-    try:
-        graph_db_service: GraphDbService = GraphDbService.instance
-        graph_db_config = graph_db_service.get_default_graph_db_config()
-
-        # The update_schema_metadata function is responsible for how the schema is updated.
-        # Passing the complete PREDEFINED_GRAPH_SCHEMA aims to replace the existing schema
-        # with this new definition.
-        graph_db_service.update_schema_metadata(
-            graph_db_config=graph_db_config, schema=PREDEFINED_GRAPH_SCHEMA
-        )
+    global _bootstrapped_fingerprint, _schema_version
+    fingerprint, indexed_properties, embedding_settings = _predefined_schema_plan()
+    if not force and _bootstrapped_fingerprint == fingerprint:
+        return
 
-        # Generate Cypher commands to create schema in Neo4j
-        cypher_commands = generate_schema_cypher_commands(PREDEFINED_GRAPH_SCHEMA)
+    with _bootstrap_lock:
+        if not force and _bootstrapped_fingerprint == fingerprint:
+            return
+        try:
+            graph_db_service: GraphDbService = GraphDbService.instance
+            graph_db_config = graph_db_service.get_default_graph_db_config()
 
-        # Execute each command using Neo4j connection
-        graph_db = graph_db_service.get_default_graph_db()
-        with graph_db.conn.session() as session:
-            for command in cypher_commands:
-                # Skip comments
-                if command.startswith("//"):
-                    print(command)
-                    continue
+            # The update_schema_metadata function is responsible for how the schema is updated.
+            # Passing the complete PREDEFINED_GRAPH_SCHEMA aims to replace the existing schema
+            # with this new definition.
+            graph_db_service.update_schema_metadata(
+                graph_db_config=graph_db_config, schema=PREDEFINED_GRAPH_SCHEMA
+            )
+            _schema_version += 1
 
-                print(f"Executing: {command}")
-                session.run(command)
+            graph_db = graph_db_service.get_default_graph_db()
+            with graph_db.conn.session() as session:
+                if not force and _read_stored_fingerprint(session) == fingerprint:
+                    _bootstrapped_fingerprint = fingerprint
+                    print("Graph schema is up to date.")
+                    return
 
-        print("Graph schema imported/updated successfully using PREDEFINED_GRAPH_SCHEMA.")
-    except ValueError as e:
-        print(f"Error during graph schema import: {e}")
-    except Exception as e:
-        print(f"An unexpected error occurred during graph schema import: {e}")
+                statements = generate_schema_statements(
+                    PREDEFINED_GRAPH_SCHEMA,
+                    indexed_properties,
+                    embedding_settings,
+                    _neo4j_version(session),
+                )
+
+                # Run only the commands whose constraint or index does not exist yet
+                existing_keys = _existing_schema_keys(session)
+                stale = _stale_vector_indexes(session, statements)
+                missing = [
+                    statement for statement in statements if statement.key() not in existing_keys
+                ]
+                for statement in missing:
+                    print(f"Executing: {statement.command}")
+                    session.run(statement.command).consume()
+
+                # Readiness means the vector indexes of this schema are ONLINE; other
+                # indexes, including ones this bootstrap does not own, are not waited for
+                wait_for_indexes_online(
+                    session,
+                    [
+                        statement.name
+                        for statement in statements
+                        if statement.index_type == "VECTOR" and statement.name
+                    ],
+                )
+
+                for statement in stale:
+                    print(f"Rebuilding {statement.name}: {statement.command}")
+                    build_seconds = rebuild_vector_index(session, statement)
+                    print(f"Rebuilt {statement.name} in {build_seconds:.1f} seconds.")
+                _store_fingerprint(session, fingerprint)
+
+            _bootstrapped_fingerprint = fingerprint
+            print(
+                f"Graph schema imported/updated successfully using PREDEFINED_GRAPH_SCHEMA "
+                f"({len(missing)} constraints/indexes created, {len(stale)} vector indexes "
+                "rebuilt)."
+            )
+        except ValueError as e:
+            print(f"Error during graph schema import: {e}")
+        except Exception as e:
+            print(f"An unexpected error occurred during graph schema import: {e}")
+
+
+def get_primary_key(node_label: str) -> str:
+    """Returns the primary key property of a node label in PREDEFINED_GRAPH_SCHEMA.
+
+    Labels the schema does not define fall back to "id".
+    """
+    node_def = PREDEFINED_GRAPH_SCHEMA["nodes"].get(node_label, {})
+    return node_def.get("primary_key", "id")
+
+
+def get_node_labels_with_property(property_name: str) -> List[str]:
+    """Returns the node labels in PREDEFINED_GRAPH_SCHEMA that define the given property."""
+    return [
+        node_label
+        for node_label, node_def in PREDEFINED_GRAPH_SCHEMA["nodes"].items()
+        if any(prop.get("name") == property_name for prop in node_def.get("properties", []))
+    ]
 
 
 # Defines the comprehensive graph schema as a global variable.
@@ -123,16 +544,19 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "description",
                     "type": "STRING",
                     "desc": "LLM-generated or user-inputted core description of the scene (e.g., '清晨薄雾笼罩的京都岚山竹林').",
+                    "fulltext": True,
                 },
                 {
                     "name": "timestamp",
                     "type": "DATETIME",
                     "desc": "Timestamp indicating when the ExperientialScene occurred.",
+                    "indexed": True,
                 },
                 {
                     "name": "location_text",
                     "type": "STRING",
                     "desc": "Textual description of the scene's location (e.g., 'Kyoto, Japan'). Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "embed",
@@ -153,16 +577,19 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "observed_element",
                     "type": "STRING",
                     "desc": "Description of the specific element observed (e.g., 'a uniquely shaped mossy stone').",
+                    "fulltext": True,
                 },
                 {
                     "name": "significance",
                     "type": "STRING",
                     "desc": "User-assigned or LLM-inferred significance of the observation. Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "timestamp",
                     "type": "DATETIME",
                     "desc": "Timestamp indicating when the FocalObservation was made or recorded.",
+                    "indexed": True,
                 },
                 {
                     "name": "embed",
@@ -183,16 +610,20 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "emotion_label",
                     "type": "STRING",
                     "desc": "Core emotion label (e.g., 'Peaceful', 'Excited', 'Awe').",
+                    "indexed": True,
+                    "fulltext": True,
                 },
                 {
                     "name": "trigger_description",
                     "type": "STRING",
                     "desc": "Description of what specifically triggered this emotion or thought. Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "timestamp",
                     "type": "DATETIME",
                     "desc": "Timestamp indicating when the AffectiveResonance was experienced or logged.",
+                    "indexed": True,
                 },
                 {
                     "name": "embed",
@@ -213,16 +644,19 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "theme_summary",
                     "type": "STRING",
                     "desc": "Brief summary of the recurring theme or narrative thread (e.g., 'The Beauty of Solitude').",
+                    "fulltext": True,
                 },
                 {
                     "name": "pattern_description",
                     "type": "STRING",
                     "desc": "Further explanation or context for this narrative pattern. Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "timestamp",
                     "type": "DATETIME",
                     "desc": "Timestamp indicating when the NarrativeAnchor was created or last updated.",
+                    "indexed": True,
                 },
                 {
                     "name": "embed",
@@ -243,16 +677,19 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "action_description",
                     "type": "STRING",
                     "desc": "Description of the interaction (e.g., 'chatted with a local artisan', 'tasted a local delicacy').",
+                    "fulltext": True,
                 },
                 {
                     "name": "outcome_summary",
                     "type": "STRING",
                     "desc": "Brief summary of the interaction's outcome or feeling. Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "timestamp",
                     "type": "DATETIME",
                     "desc": "Timestamp indicating when the InteractionPoint occurred.",
+                    "indexed": True,
                 },
                 {
                     "name": "embed",
@@ -273,11 +710,13 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "description",
                     "type": "STRING",
                     "desc": "Description of the digital asset (e.g., 'Photo of the Eiffel Tower in Paris').",
+                    "fulltext": True,
                 },
                 {
                     "name": "file_id",
                     "type": "STRING",
                     "desc": "id to the original digital file.",
+                    "indexed": True,
                 },
                 {
                     "name": "media_type",
@@ -288,6 +727,7 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "timestamp",
                     "type": "DATETIME",
                     "desc": "Original creation timestamp of the DigitalAsset.",
+                    "indexed": True,
                 },
                 {
                     "name": "embed",
@@ -308,11 +748,14 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "chinese_name",
                     "type": "STRING",
                     "desc": "Chinese name of the city (e.g., '杭州', '上海', '北京').",
+                    "indexed": True,
+                    "fulltext": True,
                 },
                 {
                     "name": "description",
                     "type": "STRING",
                     "desc": "Description of the city (e.g., 'Beautiful city known for West Lake'). Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "embed",
@@ -333,11 +776,14 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "chinese_name",
                     "type": "STRING",
                     "desc": "Chinese name of the province (e.g., '浙江省', '江苏省', '广东省').",
+                    "indexed": True,
+                    "fulltext": True,
                 },
                 {
                     "name": "description",
                     "type": "STRING",
                     "desc": "Description of the province (e.g., 'Eastern coastal province known for scenic beauty'). Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "embed",
@@ -358,11 +804,14 @@ PREDEFINED_GRAPH_SCHEMA: Dict[str, Any] = {
                     "name": "chinese_name",
                     "type": "STRING",
                     "desc": "Chinese name of the season (e.g., '春天', '夏天', '秋天', '冬天').",
+                    "indexed": True,
+                    "fulltext": True,
                 },
                 {
                     "name": "description",
                     "type": "STRING",
                     "desc": "Description of the season characteristics (e.g., 'Warm weather with blooming flowers'). Optional.",
+                    "fulltext": True,
                 },
                 {
                     "name": "embed",
@@ -0,0 +1,137 @@
+import json
+from typing import Any, Callable, Dict
+
+from neo4j.graph import Node, Path, Relationship
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library encoder is the fallback
+    orjson = None
+
+# Float lists at least this long are treated as embedding vectors and omitted
+EMBEDDING_MIN_LENGTH = 256
+
+# Values of these types are already JSON compatible and are passed through untouched
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _serialize_node(node: Any) -> Dict[str, Any]:
+    return {
+        "id": node.element_id,
+        "labels": list(node.labels),
+        "properties": _serialize_properties(node),
+    }
+
+
+def _serialize_relationship(relationship: Any) -> Dict[str, Any]:
+    return {
+        "id": relationship.element_id,
+        "type": relationship.type,
+        "start_node_id": relationship.start_node.element_id if relationship.start_node else None,
+        "end_node_id": relationship.end_node.element_id if relationship.end_node else None,
+        "properties": _serialize_properties(relationship),
+    }
+
+
+def _serialize_path(path: Any) -> Dict[str, Any]:
+    return {
+        "nodes": [_serialize_node(node) for node in path.nodes],
+        "relationships": [_serialize_relationship(rel) for rel in path.relationships],
+    }
+
+
+def _serialize_properties(entity: Any) -> Dict[str, Any]:
+    """Serialize the properties of a node or relationship, without its embedding."""
+    return {
+        key: value if type(value) in _PRIMITIVE_TYPES else serialize_value(value)
+        for key, value in entity.items()
+        if key != "embed"
+    }
+
+
+def _serialize_list(values: Any) -> Any:
+    if len(values) >= EMBEDDING_MIN_LENGTH and all(type(v) is float for v in values):
+        return f"<embedding of {len(values)} floats omitted>"
+    if all(type(v) in _PRIMITIVE_TYPES for v in values):
+        return values if type(values) is list else list(values)
+    return [serialize_value(v) for v in values]
+
+
+def _serialize_dict(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value if type(value) in _PRIMITIVE_TYPES else serialize_value(value)
+        for key, value in values.items()
+        if key != "embed" and not key.endswith(".embed")
+    }
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# Handlers by exact type; subclasses and unknown types are resolved once and then cached here
+_HANDLERS: Dict[type, Callable[[Any], Any]] = {
+    **dict.fromkeys(_PRIMITIVE_TYPES, _identity),
+    Node: _serialize_node,
+    Relationship: _serialize_relationship,
+    Path: _serialize_path,
+    list: _serialize_list,
+    tuple: _serialize_list,
+    dict: _serialize_dict,
+}
+
+
+def _resolve_handler(value_type: type) -> Callable[[Any], Any]:
+    for base, handler in (
+        (Node, _serialize_node),
+        (Relationship, _serialize_relationship),
+        (Path, _serialize_path),
+        ((list, tuple), _serialize_list),
+        (dict, _serialize_dict),
+    ):
+        if issubclass(value_type, base):
+            return handler
+    # Temporal and spatial values are left to the encoder's default=str
+    return _identity
+
+
+def serialize_value(value: Any) -> Any:
+    """Convert a Neo4j result value into JSON-compatible data, dropping embeddings.
+
+    Nodes, relationships and paths take the shape serialize_neo4j_value of the
+    CypherExecutor gives them, without their embed property; float lists of embedding
+    size are replaced by a placeholder. Dispatches on the exact type through a lookup
+    table and returns primitive values, and lists or records made only of primitives,
+    without rebuilding them.
+    """
+    value_type = type(value)
+    handler = _HANDLERS.get(value_type)
+    if handler is None:
+        handler = _resolve_handler(value_type)
+        _HANDLERS[value_type] = handler
+    return handler(value)
+
+
+def serialize_record(record_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize one record (as returned by record.data()), dropping embeddings."""
+    if all(type(value) in _PRIMITIVE_TYPES for value in record_data.values()):
+        if not any(key == "embed" or key.endswith(".embed") for key in record_data):
+            return record_data
+    return _serialize_dict(record_data)
+
+
+def dumps(value: Any, compact: bool = True) -> str:
+    """Encode serialized data as JSON text, with orjson when it is installed.
+
+    Args:
+        value (Any): JSON-compatible data; other values are encoded with str().
+        compact (bool): Leave out all insignificant whitespace instead of indenting by 2.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=str, option=option).decode("utf-8")
+    if compact:
+        return json.dumps(value, ensure_ascii=False, default=str, separators=(",", ":"))
+    return json.dumps(value, ensure_ascii=False, default=str, indent=2)
@@ -4,14 +4,13 @@ from chat2graph.core.model.message import HybridMessage, TextMessage
 from chat2graph.core.sdk.agentic_service import AgenticService
 from chat2graph.core.sdk.wrapper.job_wrapper import JobWrapper
 
-from weaver.util.init_chat2graph import init_chat2graph
+from weaver.tool_resource.cypher_executor import query_shape_stats, result_cache_stats
+from weaver.util.runtime import get_agentic_service
 
 
 def main():
     """Main function."""
-    init_chat2graph()
-
-    mas = AgenticService.load("weaver.yml")
+    mas = get_agentic_service()
     jobs: List[JobWrapper] = []
 
     jobs = run_scene_and_activity_expert(mas, jobs)
@@ -45,6 +44,8 @@ def main():
     service_message = mas.session().submit(user_message).wait()
     # print the result
     print(f"Story Context:\n{sotry_context}")
+    print(f"Cypher Query Shapes:\n{query_shape_stats()}")
+    print(f"Cypher Result Cache:\n{result_cache_stats()}")
     if isinstance(service_message, TextMessage):
         print(f"Service Result:\n{service_message.get_payload()}")
     # print the result
@@ -54,9 +55,7 @@ def main():
 
 def meave_memory(user_instruction: str) -> JobWrapper:
     """Meave memory."""
-    init_chat2graph()
-
-    mas = AgenticService.load("weaver.yml")
+    mas = get_agentic_service()
     jobs: List[JobWrapper] = []
 
     jobs = run_scene_and_activity_expert(mas, jobs)
@@ -91,6 +90,8 @@ def meave_memory(user_instruction: str) -> JobWrapper:
     service_message = final_job.wait()
     # print the result
     print(f"Story Context:\n{sotry_context}")
+    print(f"Cypher Query Shapes:\n{query_shape_stats()}")
+    print(f"Cypher Result Cache:\n{result_cache_stats()}")
     if isinstance(service_message, TextMessage):
         print(f"Service Result:\n{service_message.get_payload()}")
     # print the result